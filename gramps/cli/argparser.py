@@ -59,6 +59,7 @@ Usage: gramps.py [OPTION...]
 Help options
   -?, --help                             Show this help message
   --usage                                Display brief usage message
+  --timing                               Show the time taken to start
 
 Application options
   -O, --open=FAMILY_TREE                 Open family tree
@@ -179,6 +180,7 @@ class ArgParser(object):
         self.force_unlock = False
         self.create = None
         self.runqml = False
+        self.timing = False
 
         self.errors = []
         self.parse_args()
@@ -336,6 +338,9 @@ class ArgParser(object):
                 self.usage = True
             elif option in ('--qml'):
                 self.runqml = True
+            elif option in ('--timing', ):
+                self.timing = True
+                cleandbg += [opt_ix]
         
         #clean options list
         cleandbg.reverse()
@@ -284,6 +284,24 @@ class CLIManager(object):
         self._pmgr.reg_plugins(PLUGINS_DIR, dbstate, uistate)
         self._pmgr.reg_plugins(USER_PLUGINS, dbstate, uistate, load_on_reg=True)
 
+def print_startup_times():
+    """
+    Print the time taken to register the plugins of each plugin directory,
+    and the processor time used since Gramps was started.
+    """
+    print >> sys.stderr, _("Startup times:")
+    pmgr = BasePluginManager.get_instance()
+    for (direct, seconds, read, cached) in pmgr.get_scan_times():
+        print >> sys.stderr, (_("  plugins in %(dir)s: %(seconds).2f s, "
+                                "%(read)d registration files run, "
+                                "%(cached)d cached") %
+                              {'dir': direct, 'seconds': seconds,
+                               'read': read, 'cached': cached}
+                             ).encode(sys.getfilesystemencoding())
+    times = os.times()
+    print >> sys.stderr, _("  processor time since start: %.2f s") % (
+                                                    times[0] + times[1])
+
 def startcli(errors, argparser):
     """
     Starts a cli session of GRAMPS. 
@@ -318,6 +336,8 @@ def startcli(errors, argparser):
     climanager = CLIManager(dbstate, True)
     #load the plugins
     climanager.do_reg_plugins(dbstate, uistate=None)
+    if argparser.timing:
+        print_startup_times()
     # handle the arguments
     from arghandler import ArgHandler
     handler = ArgHandler(dbstate, argparser, climanager)
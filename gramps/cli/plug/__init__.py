@@ -557,7 +557,7 @@ class CommandLineReport(object):
 #
 #------------------------------------------------------------------------
 def cl_report(database, name, category, report_class, options_class, 
-              options_str_dict):
+              options_str_dict, user=None):
     
     err_msg = _("Failed to write report. ")
     clr = CommandLineReport(database, name, category, options_class, 
@@ -582,7 +582,9 @@ def cl_report(database, name, category, report_class, options_class,
         if clr.css_filename is not None and \
            hasattr(clr.option_class.handler.doc, 'set_css_filename'):
             clr.option_class.handler.doc.set_css_filename(clr.css_filename)
-        MyReport = report_class(database, clr.option_class, User())
+        if user is None:
+            user = User()
+        MyReport = report_class(database, clr.option_class, user)
         MyReport.doc.init()
         MyReport.begin_report()
         MyReport.write_report()
@@ -606,7 +608,7 @@ def cl_report(database, name, category, report_class, options_class,
             except:
                 traceback.print_exc()
 
-def run_report(db, name, **options_str_dict):
+def run_report(db, name, user=None, **options_str_dict):
     """
     Given a database, run a given report.
 
@@ -614,6 +616,9 @@ def run_report(db, name, **options_str_dict):
 
     name is the name of a report
 
+    user is the User that is told the progress of the report; a
+    command line User by default
+
     options_str_dict is the same kind of options
     given at the command line. For example:
     
@@ -627,10 +632,12 @@ def run_report(db, name, **options_str_dict):
        options and values used in  clr.option_class.options_dict
        filename in clr.option_class.get_output()
     """
-    dbstate = DbState()
-    climanager = CLIManager(dbstate, False) # don't load db
-    climanager.do_reg_plugins(dbstate, None)
     pmgr = BasePluginManager.get_instance()
+    if not pmgr.get_reg_reports():
+        # the plugins were not registered yet
+        dbstate = DbState()
+        climanager = CLIManager(dbstate, False) # don't load db
+        climanager.do_reg_plugins(dbstate, None)
     cl_list = pmgr.get_reg_reports()
     clr = None
     for pdata in cl_list:
@@ -648,7 +655,7 @@ def run_report(db, name, **options_str_dict):
             else:
                 clr = cl_report(db, name, category, 
                                 report_class, options_class,
-                                options_str_dict)
+                                options_str_dict, user)
                 return clr
     return clr
 
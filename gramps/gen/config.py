@@ -138,6 +138,7 @@ register('behavior.database-path', os.path.join( HOME_DIR, 'grampsdb'))
 register('behavior.date-about-range', 50)
 register('behavior.date-after-range', 50)
 register('behavior.date-before-range', 50)
+register('behavior.filter-processes', 0)
 register('behavior.generation-depth', 15)
 register('behavior.max-age-prob-alive', 110)
 register('behavior.max-sib-age-diff', 20)
@@ -145,6 +146,8 @@ register('behavior.min-generation-years', 13)
 register('behavior.owner-warn', False)
 register('behavior.pop-plugin-status', False)
 register('behavior.recent-export-type', 1)
+register('behavior.reindex-processes', 0)
+register('behavior.report-processes', 0)
 register('behavior.spellcheck', False)
 register('behavior.startup', 0)
 register('behavior.surname-guessing', 0)
@@ -152,6 +155,7 @@ register('behavior.use-tips', False)
 register('behavior.welcome', 100)
 register('behavior.web-search-url', 'http://google.com/#&q=%(text)s')
 
+register('export.compress-level', 6)
 register('export.proxy-order', [
         ["privacy", 0], 
         ["living", 0], 
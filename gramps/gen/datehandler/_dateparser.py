@@ -56,6 +56,9 @@ import _grampslocale
 # Top-level module functions
 #
 #-------------------------------------------------------------------------
+# number of parsed date strings remembered by a parser
+_MAX_PARSED = 10000
+
 _max_days  = [ 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 _leap_days = [ 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 
@@ -262,6 +265,8 @@ class DateParser(object):
     
     def __init__(self):
         self.init_strings()
+        # the serialized dates parsed from the date strings
+        self._parsed = {}
         self.parser = {
             Date.CAL_GREGORIAN : self._parse_gregorian,
             Date.CAL_JULIAN    : self._parse_julian,
@@ -742,19 +747,44 @@ class DateParser(object):
             return True
         return False
 
+    def _remember(self, text, date):
+        """
+        Remember the date parsed from text.
+        """
+        if len(self._parsed) >= _MAX_PARSED:
+            self._parsed.clear()
+        self._parsed[text] = date.serialize()
+
     def set_date(self, date, text):
         """
         Parses the text and sets the date according to the parsing.
         """
+        parsed = self._parsed.get(text)
+        if parsed is not None and parsed[1] != Date.MOD_TEXTONLY:
+            date.unserialize(parsed)
+            return
+        self._set_date(date, text)
+        # a text only date keeps parts of what date was before
+        if date.get_modifier() != Date.MOD_TEXTONLY:
+            self._remember(text, date)
+
+    def _set_date(self, date, text):
+        """
+        Parses the text and sets the date according to the parsing, without
+        looking for the text in the dates already parsed.
+        """
         text = text.strip() # otherwise spaces can make it a bad date
         date.set_text_value(text)
         qual = Date.QUAL_NONE
         cal  = Date.CAL_GREGORIAN
         newyear = Date.NEWYEAR_JAN1
         
-        (text, cal, newyear) = self.match_calendar_newyear(text, cal, newyear)
-        (text, newyear) = self.match_newyear(text, newyear)
-        (text, cal) = self.match_calendar(text, cal)
+        # calendars and new years are given in parentheses
+        if '(' in text:
+            (text, cal, newyear) = self.match_calendar_newyear(text, cal,
+                                                               newyear)
+            (text, newyear) = self.match_newyear(text, newyear)
+            (text, cal) = self.match_calendar(text, cal)
         (text, qual) = self.match_quality(text, qual)
 
         if self.match_span(text, cal, newyear, qual, date):
@@ -790,8 +820,13 @@ class DateParser(object):
         Parses the text, returning a Date object.
         """
         new_date = Date()
+        parsed = self._parsed.get(text)
+        if parsed is not None:
+            new_date.unserialize(parsed)
+            return new_date
         try:
-            self.set_date(new_date, text)
+            self._set_date(new_date, text)
         except DateError:
             new_date.set_as_text(text)
+        self._remember(text, new_date)
         return new_date
@@ -75,10 +75,13 @@
 from base import *
 from dbconst import *
 from cursor import *
+from cache import *
+from pedigree import *
 from read import *
 from bsddbtxn import *
 from txn import *
 from undoredo import *
 from exceptions import *
 from write import *
+from snapshot import *
 from backup import backup, restore
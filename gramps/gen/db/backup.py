@@ -47,6 +47,21 @@ Restoring the data is just as simple. The backup file is parsed an
 entry at a time, and inserted into the associated database table. The
 derived tables are built automatically as the items are entered into
 db.
+
+Incremental backups
+===================
+
+A full backup is only made every FULL_BACKUP_INTERVAL backups. In between,
+when the database knows which objects changed since the last backup, only
+the raw data of these objects, None for deleted ones, and the metadata
+table are written to a numbered delta file. The chain file holds the number
+of delta files that follow the full backup. A restore loads the full backup
+and replays the delta files in order.
+
+A new full backup is written to temporary files, which replace the old
+ones only once all are written; the chain file is replaced last. A chain
+file older than the files of the full backup belongs to the previous full
+backup, and is ignored.
 """
 
 #-------------------------------------------------------------------------
@@ -54,6 +69,7 @@ db.
 # load standard python libraries
 #
 #-------------------------------------------------------------------------
+from __future__ import with_statement
 import os
 import cPickle as pickle
 
@@ -74,19 +90,46 @@ from write import FAMILY_TBL, PLACES_TBL, SOURCES_TBL, MEDIA_TBL, \
 import logging
 LOG = logging.getLogger(".Backup")
 
+# size of the write buffer of the backup files
+BUFFER_SIZE = 1 << 20
+
+# number of incremental backups made after a full backup
+FULL_BACKUP_INTERVAL = 10
+
+# base names of the chain file and the delta files
+CHAIN = "chain"
+DELTA = "delta%04d"
+
+# tables of the objects in the database changes
+OBJ_TABLES = {
+    'person'     : PERSON_TBL,
+    'family'     : FAMILY_TBL,
+    'event'      : EVENTS_TBL,
+    'source'     : SOURCES_TBL,
+    'citation'   : CITATIONS_TBL,
+    'place'      : PLACES_TBL,
+    'media'      : MEDIA_TBL,
+    'repository' : REPO_TBL,
+    'note'       : NOTE_TBL,
+    'tag'        : TAG_TBL,
+    }
+
 def backup(database):
     """
     Exports the database to a set of backup files. These files consist
-    of the pickled database tables, one file for each table.
+    of the pickled database tables, one file for each table, or of the
+    objects changed since the last backup.
 
-    The heavy lifting is done by the private __do__export function. The 
-    purpose of this function is to catch any exceptions that occur.
+    The heavy lifting is done by the private __do_incremental_export and
+    __do__export functions. The purpose of this function is to catch any
+    exceptions that occur.
 
     @param database: database instance to backup
     @type database: DbDir
     """
     try:
-        __do_export(database)
+        if not __do_incremental_export(database):
+            __do_export(database)
     except (OSError, IOError), msg:
         raise DbException(str(msg))
 
@@ -112,6 +155,100 @@ def __mk_tmp_name(database, base):
     """
     return os.path.join(database.get_save_path(), base + ".gbkp.new")
 
+def __rename_tmp(database, base):
+    """
+    Replace the backup file of base by its temporary backup file
+
+    @param database: database instance 
+    @type database: DbDir
+    @param base: base name of the file
+    @type base: str
+    """
+    new_name = __mk_backup_name(database, base)
+    old_name = __mk_tmp_name(database, base)
+    if os.path.isfile(new_name):
+        os.unlink(new_name)
+    os.rename(old_name, new_name)
+
+def __read_chain(database):
+    """
+    Return the number of delta files that follow the full backup, or None
+    if there is no chain file, or if it was written before the full backup
+
+    @param database: database instance 
+    @type database: DbDir
+    """
+    chain_name = __mk_backup_name(database, CHAIN)
+    try:
+        chain_time = os.path.getmtime(chain_name)
+        for (base, tbl) in __build_tbl_map(database):
+            backup_name = __mk_backup_name(database, base)
+            if (os.path.isfile(backup_name) and
+                    os.path.getmtime(backup_name) > chain_time):
+                return None
+        with open(chain_name, 'rb') as chain_file:
+            count = pickle.load(chain_file)
+    except (OSError, IOError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(count, int):
+        return None
+    return count
+
+def __write_chain(database, count):
+    """
+    Write the number of delta files that follow the full backup
+
+    @param database: database instance 
+    @type database: DbDir
+    @param count: number of delta files
+    @type count: int
+    """
+    with open(__mk_tmp_name(database, CHAIN), 'wb') as chain_file:
+        pickle.dump(count, chain_file, 2)
+    __rename_tmp(database, CHAIN)
+
+def __do_incremental_export(database):
+    """
+    Save the objects changed since the last backup to the next delta file.
+    Return False if a full backup has to be made instead, because the
+    changes are not known, there is no full backup to add to, or enough
+    delta files follow it.
+
+    @param database: database instance to backup
+    @type database: DbDir
+    """
+    changes = database.backup_changes.get_changes()
+    count = __read_chain(database)
+    if (changes is None or count is None or count >= FULL_BACKUP_INTERVAL or
+            not os.path.isfile(__mk_backup_name(database, PERSON_TBL))):
+        return False
+
+    tbl_map = dict(__build_tbl_map(database))
+    base = DELTA % (count + 1)
+    with open(__mk_tmp_name(database, base), 'wb', BUFFER_SIZE) as delta:
+        pickler = pickle.Pickler(delta, 2)
+        for (obj_name, handles) in changes.iteritems():
+            tbl_name = OBJ_TABLES[obj_name]
+            tbl = tbl_map[tbl_name]
+            for handle in sorted(handles):
+                pickler.dump((tbl_name, handle, tbl.get(handle)))
+                pickler.clear_memo()
+
+        # the metadata table is small, and written in full
+        cursor = tbl_map[META].cursor()
+        data = cursor.first()
+        while data:
+            pickler.dump((META, data[0], data[1]))
+            pickler.clear_memo()
+            data = cursor.next()
+        cursor.close()
+
+    # the delta file only counts once the chain file includes it
+    __rename_tmp(database, base)
+    __write_chain(database, count + 1)
+    database.backup_changes.clear(True)
+    return True
+
 def __do_export(database):
     """
     Loop through each table of the database, saving the pickled data
@@ -123,12 +260,16 @@ def __do_export(database):
     try:
         for (base, tbl) in __build_tbl_map(database):
             backup_name = __mk_tmp_name(database, base)
-            backup_table = open(backup_name, 'wb')
+            backup_table = open(backup_name, 'wb', BUFFER_SIZE)
+            # each record is restored by a separate load, so the memo of
+            # the pickler is cleared after each record
+            pickler = pickle.Pickler(backup_table, 2)
     
             cursor = tbl.cursor()
             data = cursor.first()
             while data:
-                pickle.dump(data, backup_table, 2)
+                pickler.dump(data)
+                pickler.clear_memo()
                 data = cursor.next()
             cursor.close()
             backup_table.close()
@@ -136,11 +277,15 @@ def __do_export(database):
         return
 
     for (base, tbl) in __build_tbl_map(database):
-        new_name = __mk_backup_name(database, base)
-        old_name = __mk_tmp_name(database, base)
-        if os.path.isfile(new_name):
-            os.unlink(new_name)
-        os.rename(old_name, new_name)
+        __rename_tmp(database, base)
+
+    # the delta files do not apply to the new full backup
+    __write_chain(database, 0)
+    index = 1
+    while os.path.isfile(__mk_backup_name(database, DELTA % index)):
+        os.unlink(__mk_backup_name(database, DELTA % index))
+        index += 1
+    database.backup_changes.clear(True)
 
 def restore(database):
     """
@@ -166,11 +311,17 @@ def __do_restore(database):
     @param database: database instance to backup
     @type database: DbDir
     """
-    for (base, tbl) in __build_tbl_map(database):
+    tbl_map = __build_tbl_map(database)
+    for (base, tbl) in tbl_map:
         backup_name = __mk_backup_name(database, base)
         backup_table = open(backup_name, 'rb')
         __load_tbl_txn(database, backup_table, tbl)
 
+    for index in xrange(1, (__read_chain(database) or 0) + 1):
+        delta_name = __mk_backup_name(database, DELTA % index)
+        delta = open(delta_name, 'rb')
+        __load_delta_txn(database, delta, dict(tbl_map))
+
     database.rebuild_secondary()
 
 def __load_tbl_txn(database, backup_table, tbl):
@@ -193,6 +344,30 @@ def __load_tbl_txn(database, backup_table, tbl):
     except EOFError:
         backup_table.close()
 
+def __load_delta_txn(database, delta, tbl_map):
+    """
+    Replay the changes of a delta file on the database tables
+
+    @param database: database instance 
+    @type database: DbDir
+    @param delta: delta file of an incremental backup
+    @type delta: file
+    @param tbl_map: map of the table names to the database tables
+    @type tbl_map: dict
+    """
+    try:
+        while True:
+            (base, key, data) = pickle.load(delta)
+            tbl = tbl_map[base]
+            txn = database.env.txn_begin()
+            if data is not None:
+                tbl.put(key, data, txn=txn)
+            elif tbl.get(key, txn=txn) is not None:
+                tbl.delete(key, txn=txn)
+            txn.commit()
+    except EOFError:
+        delta.close()
+
 def __build_tbl_map(database):
     """
     Builds a table map of names to database tables.
@@ -0,0 +1,121 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+The record of the objects of a family tree changed since its last backup,
+from which the incremental backups are written.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from __future__ import with_statement
+import cPickle as pickle
+
+__all__ = ('BackupChanges', )
+
+_VERSION = 1    # Version of the saved changes
+
+#-------------------------------------------------------------------------
+#
+# BackupChanges
+#
+#-------------------------------------------------------------------------
+class BackupChanges(object):
+    """
+    The handles of the objects added, changed or deleted since the last
+    backup, by object name ('person', 'family', ...).
+
+    The changes are only known from the transactions and the undo/redo of
+    a session. They are unknown for a new tree, after batch transactions,
+    and when the tree was not closed properly, in which case the next backup
+    has to be a full one.
+    """
+
+    def __init__(self):
+        self.__changes = {}
+        self.__known = False
+
+    def clear(self, known=False):
+        """
+        Forget the changes. If known is True, the tree has just been backed
+        up and the changes are recorded from now on.
+        """
+        self.__changes = {}
+        self.__known = known
+
+    def invalidate(self):
+        """
+        Mark the changes as unknown, until the next full backup.
+        """
+        self.clear(False)
+
+    def is_known(self):
+        """
+        Return True if all the changes since the last backup are known.
+        """
+        return self.__known
+
+    def objects_changed(self, obj_name, handles):
+        """
+        Record the handles of the objects of obj_name that changed.
+        """
+        if self.__known and handles:
+            self.__changes.setdefault(obj_name, set()).update(handles)
+
+    def get_changes(self):
+        """
+        Return a dictionary of object names to the sets of handles changed
+        since the last backup, or None if the changes are unknown.
+        """
+        if not self.__known:
+            return None
+        return self.__changes
+
+    def save(self, filename, signature):
+        """
+        Save the changes to filename, if they are known. The signature
+        identifies the state of the tables the changes belong to.
+        """
+        if not self.__known:
+            return
+        with open(filename, 'wb') as changes_file:
+            pickle.dump((_VERSION, signature, self.__changes), changes_file,
+                        pickle.HIGHEST_PROTOCOL)
+
+    def load(self, filename, signature):
+        """
+        Load the changes saved in filename, if they were saved with the same
+        signature. Return True if the changes were loaded.
+        """
+        self.clear()
+        try:
+            with open(filename, 'rb') as changes_file:
+                data = pickle.load(changes_file)
+        except (IOError, EOFError, pickle.UnpicklingError):
+            return False
+        if (not isinstance(data, tuple) or len(data) != 3 or
+                data[0] != _VERSION or data[1] != signature):
+            return False
+        self.__changes = data[2]
+        self.__known = True
+        return True
@@ -122,6 +122,24 @@ class DbReadBase(object):
         """
         raise NotImplementedError
 
+    def get_backlink_count(self, handle, include_classes=None):
+        """
+        Return the number of objects that hold a reference to the object
+        handle.
+
+        :param handle: handle of the object to search for.
+        :type handle: database handle
+        :param include_classes: list of class names to count.
+            Default is None which counts all classes.
+        :type include_classes: list of class names
+
+        This default implementation counts the results of
+        find_backlink_handles. Backends can override this method to look
+        the count up instead.
+        """
+        return sum(1 for dummy in
+                   self.find_backlink_handles(handle, include_classes))
+
     def find_initial_person(self):
         """
         Returns first person in the database
@@ -639,6 +657,108 @@ class DbReadBase(object):
         """
         raise NotImplementedError
 
+    def get_raw_data_many(self, table_name, handles):
+        """
+        Return an iterator over the raw (serialized) data of the objects in
+        the table table_name (as returned by get_table_names) with the given
+        handles. The data is yielded in the order of handles, with None for
+        handles that are not in the table.
+        """
+        raise NotImplementedError
+
+    def get_people_from_handles(self, handles):
+        """
+        Return an iterator over the Person objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_families_from_handles(self, handles):
+        """
+        Return an iterator over the Family objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_events_from_handles(self, handles):
+        """
+        Return an iterator over the Event objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_places_from_handles(self, handles):
+        """
+        Return an iterator over the Place objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_sources_from_handles(self, handles):
+        """
+        Return an iterator over the Source objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_citations_from_handles(self, handles):
+        """
+        Return an iterator over the Citation objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_media_objects_from_handles(self, handles):
+        """
+        Return an iterator over the MediaObject objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Return an iterator over the Repository objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_notes_from_handles(self, handles):
+        """
+        Return an iterator over the Note objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_tags_from_handles(self, handles):
+        """
+        Return an iterator over the Tag objects with the given handles, in
+        the order of handles. None is yielded for missing handles.
+        """
+        raise NotImplementedError
+
+    def get_pedigree_index(self):
+        """
+        Return the PedigreeIndex of the database, an in-memory index of the
+        parents and children of all people, kept up to date with the changes
+        to the database.
+        """
+        raise NotImplementedError
+
+    def get_sort_key_index(self, name, obj_type):
+        """
+        Return the SortKeyIndex with the given name, a sorted list of the
+        sort keys and handles of the objects of class name obj_type, kept
+        with the database between the views that use it.
+        """
+        raise NotImplementedError
+
+    def get_change_stamp(self):
+        """
+        Return a number that changes whenever the database is changed, so
+        that results computed from the database can be cached until then.
+        """
+        raise NotImplementedError
+
     def get_reference_map_cursor(self):
         """
         Returns a reference to a cursor over the reference map
@@ -1426,9 +1546,11 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
-    def reindex_reference_map(self, callback):
+    def reindex_reference_map(self, callback, processes=None):
         """
         Reindex all primary records in the database.
+
+        If processes is larger than one, helper processes may be used.
         """
         raise NotImplementedError
 
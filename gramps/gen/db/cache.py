@@ -0,0 +1,131 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Bounded cache of unserialized primary objects for the database layer.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from collections import OrderedDict
+
+__all__ = ('ObjectCache',)
+
+#-------------------------------------------------------------------------
+#
+# ObjectCache
+#
+#-------------------------------------------------------------------------
+class ObjectCache(object):
+    """
+    Length-limited least recently used cache of primary objects, keyed by
+    handle.
+
+    The cache is disabled when its size is 0. Objects handed out by the cache
+    are shared between callers, so it is meant for read-only passes such as
+    reports, filters and exports. The database evicts a handle whenever the
+    object is committed, removed, or touched by undo/redo.
+    """
+
+    __slots__ = ('size', 'hits', 'misses', '__data')
+
+    def __init__(self, size=0):
+        self.size = max(size, 0)
+        self.hits = 0
+        self.misses = 0
+        self.__data = OrderedDict()
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __contains__(self, handle):
+        return handle in self.__data
+
+    def get(self, handle, class_type):
+        """
+        Return the cached object of class_type for handle, or None.
+        """
+        if not self.size:
+            return None
+        try:
+            cls, obj = self.__data.pop(handle)
+        except KeyError:
+            self.misses += 1
+            return None
+        if cls is not class_type:
+            self.misses += 1
+            return None
+        # re-insert to mark as most recently used
+        self.__data[handle] = (cls, obj)
+        self.hits += 1
+        return obj
+
+    def put(self, handle, class_type, obj):
+        """
+        Store obj for handle, dropping the least recently used entry if the
+        cache is full.
+        """
+        if not self.size:
+            return
+        self.__data.pop(handle, None)
+        self.__data[handle] = (class_type, obj)
+        while len(self.__data) > self.size:
+            self.__data.popitem(last=False)
+
+    def evict(self, handle):
+        """
+        Remove handle from the cache, if present.
+        """
+        self.__data.pop(handle, None)
+
+    def clear(self):
+        """
+        Empty the cache. The hit and miss counters are kept.
+        """
+        self.__data.clear()
+
+    def set_size(self, size):
+        """
+        Set the maximum number of cached objects. A size of 0 disables the
+        cache.
+        """
+        self.size = max(size, 0)
+        while len(self.__data) > self.size:
+            self.__data.popitem(last=False)
+
+    def reset_stats(self):
+        """
+        Reset the hit and miss counters.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """
+        Return a dictionary with the cache size, number of cached objects,
+        and the hit and miss counters.
+        """
+        return {'size': self.size,
+                'count': len(self.__data),
+                'hits': self.hits,
+                'misses': self.misses}
@@ -40,7 +40,8 @@ __all__ = (
             ('DBPAGE', 'DBMODE', 'DBCACHE', 'DBLOCKS', 'DBOBJECTS', 'DBUNDO',
              'DBEXT', 'DBMODE_R', 'DBMODE_W', 'DBUNDOFN', 'DBLOCKFN',
              'DBRECOVFN','BDBVERSFN', 'DBLOGNAME', 'DBFLAGS_O',  'DBFLAGS_R',
-             'DBFLAGS_D',
+             'DBFLAGS_D', 'PEDIGREEFN', 'SORTKEYSFN', 'BACKUPCHANGESFN',
+             'REFCOUNTFN',
             ) +
             
             ('PERSON_KEY', 'FAMILY_KEY', 'SOURCE_KEY', 'CITATION_KEY',
@@ -56,6 +57,12 @@ DBUNDOFN  = "undo.db"       # File name of 'undo' database
 DBLOCKFN  = "lock"          # File name of lock file
 DBRECOVFN = "need_recover"  # File name of recovery file
 BDBVERSFN = "bdbversion.txt"# File name of Berkeley DB version file
+PEDIGREEFN = "pedigree.idx" # File name of the saved pedigree index
+SORTKEYSFN = "sortkeys.idx" # File name of the saved sort key indexes
+BACKUPCHANGESFN = "backupchanges.idx" # File name of the saved changes since
+                                      # the last backup
+REFCOUNTFN = "refcount.idx" # File name of the signature of the reference
+                            # count table
 DBLOGNAME = ".Db"           # Name of logger
 DBMODE_R  = "r"             # Read-only access
 DBMODE_W  = "w"             # Full Read/Write access
@@ -0,0 +1,529 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Ancestor and descendant searches over the parent/child graph of a family
+tree, and an in-memory index of that graph.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from __future__ import with_statement
+import cPickle as pickle
+from array import array
+from collections import deque
+
+__all__ = ('Pedigree', 'DbPedigree', 'PedigreeIndex', 'get_pedigree')
+
+_VERSION = 1    # Version of the saved index
+
+#-------------------------------------------------------------------------
+#
+# Pedigree
+#
+#-------------------------------------------------------------------------
+class Pedigree(object):
+    """
+    Iterative searches through the parent/child graph of a family tree.
+
+    People and families are identified by their handles. Subclasses provide
+    the links between them.
+    """
+
+    def get_parent_families(self, handle):
+        """
+        Return the handles of the families in which the person is a child,
+        the main family first.
+        """
+        raise NotImplementedError
+
+    def get_families(self, handle):
+        """
+        Return the handles of the families in which the person is a parent.
+        """
+        raise NotImplementedError
+
+    def get_family_parents(self, handle):
+        """
+        Return the father and mother handles of the family, either of which
+        may be None.
+        """
+        raise NotImplementedError
+
+    def get_family_children(self, handle):
+        """
+        Return the handles of the children of the family.
+        """
+        raise NotImplementedError
+
+    def get_parents(self, handle, main_only=False):
+        """
+        Return the handles of the parents of the person. If main_only is
+        True, only the main parent family of the person is used.
+        """
+        fam_handles = self.get_parent_families(handle)
+        if main_only:
+            fam_handles = fam_handles[:1]
+        parents = []
+        for fam_handle in fam_handles:
+            parents.extend(parent for parent in
+                           self.get_family_parents(fam_handle) if parent)
+        return parents
+
+    def get_children(self, handle):
+        """
+        Return the handles of the children of the person, in all families.
+        """
+        children = []
+        for fam_handle in self.get_families(handle):
+            children.extend(self.get_family_children(fam_handle))
+        return children
+
+    def __search(self, handles, neighbours, min_gen, max_gen):
+        """
+        Return the people reached from handles in at least min_gen and at
+        most max_gen steps, following neighbours.
+
+        The search is breadth first, so a person is first reached through
+        the shortest path. Generations beyond min_gen are counted as
+        min_gen, so that every person is visited at most min_gen + 1 times,
+        even if the tree contains loops.
+        """
+        found = set()
+        seen = set()
+        todo = deque()
+        for handle in handles:
+            if handle and (handle, 0) not in seen:
+                seen.add((handle, 0))
+                todo.append((handle, 0))
+        while todo:
+            handle, gen = todo.popleft()
+            if gen >= min_gen:
+                found.add(handle)
+            if max_gen is not None and gen >= max_gen:
+                continue
+            level = min(gen + 1, min_gen)
+            for other in neighbours(handle):
+                if (other, level) not in seen:
+                    seen.add((other, level))
+                    todo.append((other, gen + 1))
+        return found
+
+    def find_ancestors(self, handles, min_gen=1, max_gen=None,
+                       main_only=True):
+        """
+        Return the set of ancestors of the people in handles that are at
+        least min_gen and at most max_gen (None for no limit) generations
+        away. The people themselves are generation 0.
+
+        If main_only is True, only the main parent family of each person is
+        followed.
+        """
+        return self.__search(handles,
+                             lambda handle: self.get_parents(handle,
+                                                             main_only),
+                             min_gen, max_gen)
+
+    def find_descendants(self, handles, min_gen=1, max_gen=None):
+        """
+        Return the set of descendants of the people in handles that are at
+        least min_gen and at most max_gen (None for no limit) generations
+        away. The people themselves are generation 0.
+        """
+        return self.__search(handles, self.get_children, min_gen, max_gen)
+
+    def find_duplicated_ancestors(self, handle, main_only=True):
+        """
+        Return the set of ancestors of the person that are reached through
+        more than one line of descent.
+        """
+        ancestors = self.find_ancestors([handle], main_only=main_only)
+        ancestors.add(handle)
+        reached = set()
+        duplicated = set()
+        for child in ancestors:
+            for parent in self.get_parents(child, main_only):
+                if parent in reached:
+                    duplicated.add(parent)
+                reached.add(parent)
+        # the ancestors of a duplicated ancestor are duplicated as well
+        return duplicated | self.find_ancestors(duplicated,
+                                                main_only=main_only)
+
+    def have_common_ancestor(self, handle1, handle2, main_only=False):
+        """
+        Return True if the two people have a common ancestor, counting the
+        people themselves, or are descended from children of one family
+        without parents.
+
+        The ancestors of both people are searched one generation at a time,
+        always extending the smaller of the two searches, until they meet.
+        Related people are found without visiting all their ancestors.
+        """
+        def neighbours(handle):
+            # a family without parents stands in for the parents of its
+            # children, so that its children meet there
+            fam_handles = self.get_parent_families(handle)
+            if main_only:
+                fam_handles = fam_handles[:1]
+            for fam_handle in fam_handles:
+                parents = [parent for parent in
+                           self.get_family_parents(fam_handle) if parent]
+                if parents:
+                    for parent in parents:
+                        yield parent
+                else:
+                    yield fam_handle
+
+        if not handle1 or not handle2:
+            return False
+        if handle1 == handle2:
+            return True
+        seen = [set([handle1]), set([handle2])]
+        frontier = [[handle1], [handle2]]
+        while frontier[0] or frontier[1]:
+            # a finished search still has to be met by the other one
+            if not frontier[1] or (frontier[0] and
+                                   len(frontier[0]) <= len(frontier[1])):
+                side = 0
+            else:
+                side = 1
+            own, other = seen[side], seen[1 - side]
+            next_frontier = []
+            for handle in frontier[side]:
+                for parent in neighbours(handle):
+                    if parent in other:
+                        return True
+                    if parent not in own:
+                        own.add(parent)
+                        next_frontier.append(parent)
+            frontier[side] = next_frontier
+        return False
+
+    def iter_ancestors(self, handles, main_only=False):
+        """
+        Iterate breadth first over the people in handles and their ancestors,
+        yielding each handle once.
+        """
+        seen = set()
+        todo = deque()
+        for handle in handles:
+            if handle and handle not in seen:
+                seen.add(handle)
+                todo.append(handle)
+        while todo:
+            handle = todo.popleft()
+            yield handle
+            for parent in self.get_parents(handle, main_only):
+                if parent not in seen:
+                    seen.add(parent)
+                    todo.append(parent)
+
+#-------------------------------------------------------------------------
+#
+# DbPedigree
+#
+#-------------------------------------------------------------------------
+class DbPedigree(Pedigree):
+    """
+    Pedigree that reads the people and families from a database. It is used
+    for databases without a PedigreeIndex, such as proxies.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_parent_families(self, handle):
+        person = self.db.get_person_from_handle(handle)
+        if person is None:
+            return []
+        return person.get_parent_family_handle_list()
+
+    def get_families(self, handle):
+        person = self.db.get_person_from_handle(handle)
+        if person is None:
+            return []
+        return person.get_family_handle_list()
+
+    def get_family_parents(self, handle):
+        family = self.db.get_family_from_handle(handle)
+        if family is None:
+            return (None, None)
+        return (family.get_father_handle(), family.get_mother_handle())
+
+    def get_family_children(self, handle):
+        family = self.db.get_family_from_handle(handle)
+        if family is None:
+            return []
+        return [ref.ref for ref in family.get_child_ref_list()]
+
+#-------------------------------------------------------------------------
+#
+# PedigreeIndex
+#
+#-------------------------------------------------------------------------
+class PedigreeIndex(Pedigree):
+    """
+    In-memory index of the parent/child links between people and families.
+
+    People and families are numbered in the order they are first seen, and
+    the links are stored as arrays and tuples of these numbers. The index is
+    built from the person and family tables on first use, and kept up to
+    date by the database as people and families are committed, removed, or
+    changed by undo/redo. It can be saved beside the tables when the
+    database is closed, and loaded again on the next open.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Drop the index. It will be built again on next use.
+        """
+        self.__built = False
+        self.__person_ids = {}
+        self.__person_handles = []
+        self.__family_ids = {}
+        self.__family_handles = []
+        # person number -> tuple of family numbers
+        self.__parent_families = []
+        self.__families = []
+        # family number -> person number, -1 if none
+        self.__fathers = array('i')
+        self.__mothers = array('i')
+        # family number -> tuple of person numbers
+        self.__children = []
+
+    def is_built(self):
+        """
+        Return True if the index holds the current state of the tables.
+        """
+        return self.__built
+
+    def build(self, db):
+        """
+        Build the index from the person and family tables of db.
+        """
+        self.clear()
+        self.__built = True
+        with db.get_person_cursor() as cursor:
+            for handle, data in cursor:
+                self.update_person_data(handle, data)
+        with db.get_family_cursor() as cursor:
+            for handle, data in cursor:
+                self.update_family_data(handle, data)
+
+    def __person_id(self, handle):
+        pid = self.__person_ids.get(handle)
+        if pid is None:
+            pid = len(self.__person_handles)
+            self.__person_ids[handle] = pid
+            self.__person_handles.append(handle)
+            self.__parent_families.append(())
+            self.__families.append(())
+        return pid
+
+    def __family_id(self, handle):
+        fid = self.__family_ids.get(handle)
+        if fid is None:
+            fid = len(self.__family_handles)
+            self.__family_ids[handle] = fid
+            self.__family_handles.append(handle)
+            self.__fathers.append(-1)
+            self.__mothers.append(-1)
+            self.__children.append(())
+        return fid
+
+    def set_person(self, handle, family_list, parent_family_list):
+        """
+        Record the families in which the person is a parent and a child.
+        """
+        if not self.__built:
+            return
+        pid = self.__person_id(str(handle))
+        self.__families[pid] = tuple(self.__family_id(str(fam_handle))
+                                     for fam_handle in family_list)
+        self.__parent_families[pid] = tuple(self.__family_id(str(fam_handle))
+                                            for fam_handle in
+                                            parent_family_list)
+
+    def remove_person(self, handle):
+        """
+        Forget the links of a removed person.
+        """
+        pid = self.__person_ids.get(str(handle))
+        if pid is not None:
+            self.__families[pid] = ()
+            self.__parent_families[pid] = ()
+
+    def set_family(self, handle, father_handle, mother_handle, child_handles):
+        """
+        Record the parents and children of the family.
+        """
+        if not self.__built:
+            return
+        fid = self.__family_id(str(handle))
+        self.__fathers[fid] = (self.__person_id(str(father_handle))
+                               if father_handle else -1)
+        self.__mothers[fid] = (self.__person_id(str(mother_handle))
+                               if mother_handle else -1)
+        self.__children[fid] = tuple(self.__person_id(str(child_handle))
+                                     for child_handle in child_handles)
+
+    def remove_family(self, handle):
+        """
+        Forget the links of a removed family.
+        """
+        fid = self.__family_ids.get(str(handle))
+        if fid is not None:
+            self.__fathers[fid] = -1
+            self.__mothers[fid] = -1
+            self.__children[fid] = ()
+
+    def update_person_data(self, handle, data):
+        """
+        Record the person from its raw data, or remove it if data is None.
+        """
+        if data is None:
+            self.remove_person(handle)
+        else:
+            self.set_person(handle, data[8], data[9])
+
+    def update_family_data(self, handle, data):
+        """
+        Record the family from its raw data, or remove it if data is None.
+        """
+        if data is None:
+            self.remove_family(handle)
+        else:
+            self.set_family(handle, data[2], data[3],
+                            [child_ref[3] for child_ref in data[4]])
+
+    def get_parent_families(self, handle):
+        pid = self.__person_ids.get(handle)
+        if pid is None:
+            return []
+        handles = self.__family_handles
+        return [handles[fid] for fid in self.__parent_families[pid]]
+
+    def get_families(self, handle):
+        pid = self.__person_ids.get(handle)
+        if pid is None:
+            return []
+        handles = self.__family_handles
+        return [handles[fid] for fid in self.__families[pid]]
+
+    def get_family_parents(self, handle):
+        fid = self.__family_ids.get(handle)
+        if fid is None:
+            return (None, None)
+        father = self.__fathers[fid]
+        mother = self.__mothers[fid]
+        return (self.__person_handles[father] if father >= 0 else None,
+                self.__person_handles[mother] if mother >= 0 else None)
+
+    def get_family_children(self, handle):
+        fid = self.__family_ids.get(handle)
+        if fid is None:
+            return []
+        handles = self.__person_handles
+        return [handles[pid] for pid in self.__children[fid]]
+
+    def get_parents(self, handle, main_only=False):
+        pid = self.__person_ids.get(handle)
+        if pid is None:
+            return []
+        fids = self.__parent_families[pid]
+        if main_only:
+            fids = fids[:1]
+        handles = self.__person_handles
+        parents = []
+        for fid in fids:
+            father = self.__fathers[fid]
+            if father >= 0:
+                parents.append(handles[father])
+            mother = self.__mothers[fid]
+            if mother >= 0:
+                parents.append(handles[mother])
+        return parents
+
+    def get_children(self, handle):
+        pid = self.__person_ids.get(handle)
+        if pid is None:
+            return []
+        handles = self.__person_handles
+        children = []
+        for fid in self.__families[pid]:
+            children.extend(handles[child] for child in self.__children[fid])
+        return children
+
+    def save(self, filename, signature):
+        """
+        Save the index to filename, if it is built. The signature identifies
+        the state of the tables the index belongs to.
+        """
+        if not self.__built:
+            return
+        data = (_VERSION, signature, self.__person_handles,
+                self.__family_handles, self.__parent_families,
+                self.__families, self.__fathers.tostring(),
+                self.__mothers.tostring(), self.__children)
+        with open(filename, 'wb') as index_file:
+            pickle.dump(data, index_file, pickle.HIGHEST_PROTOCOL)
+
+    def load(self, filename, signature):
+        """
+        Load the index saved in filename, if it was saved with the same
+        signature. Return True if the index was loaded.
+        """
+        self.clear()
+        try:
+            with open(filename, 'rb') as index_file:
+                data = pickle.load(index_file)
+        except (IOError, EOFError, pickle.UnpicklingError):
+            return False
+        if (not isinstance(data, tuple) or len(data) != 9 or
+                data[0] != _VERSION or data[1] != signature):
+            return False
+        (dummy, dummy, self.__person_handles, self.__family_handles,
+         self.__parent_families, self.__families, fathers, mothers,
+         self.__children) = data
+        self.__person_ids = dict((handle, pid) for pid, handle in
+                                 enumerate(self.__person_handles))
+        self.__family_ids = dict((handle, fid) for fid, handle in
+                                 enumerate(self.__family_handles))
+        self.__fathers.fromstring(fathers)
+        self.__mothers.fromstring(mothers)
+        self.__built = True
+        return True
+
+def get_pedigree(db):
+    """
+    Return the Pedigree for db: its PedigreeIndex if it has one, otherwise a
+    DbPedigree reading the people and families from db.
+    """
+    try:
+        return db.get_pedigree_index()
+    except NotImplementedError:
+        return DbPedigree(db)
@@ -71,6 +71,9 @@ from dbconst import *
 from ..utils.callback import Callback
 from ..utils.cast import conv_dbstr_to_unicode
 from . import (BsddbBaseCursor, DbReadBase)
+from .cache import ObjectCache
+from .pedigree import PedigreeIndex
+from .sortkeys import SortKeyIndexes
 from ..utils.id import create_id
 from ..errors import DbError
 
@@ -221,6 +224,8 @@ class DbBsddbRead(DbReadBase, Callback):
     """
 
     __signals__ = {}
+    # Number of handles read per cursor pass by the bulk accessors
+    BATCH_SIZE = 1000
     # If this is True logging will be turned on.
     try:
         _LOG_ALL = int(os.environ.get('GRAMPS_SIGNAL', "0")) == 1
@@ -406,6 +411,10 @@ class DbBsddbRead(DbReadBase, Callback):
         self.surname_list = []
         self.txn = None
         self.has_changed = False
+        self.change_stamp = 0
+        self.object_cache = ObjectCache()
+        self.pedigree_index = PedigreeIndex()
+        self.sort_key_indexes = SortKeyIndexes()
 
     def set_prefixes(self, person, media, family, source, citation, place,
                      event, repository, note):
@@ -479,6 +488,10 @@ class DbBsddbRead(DbReadBase, Callback):
         """
         #remove circular dependance
         self.basedb = None
+        self.object_cache.clear()
+        self.pedigree_index.clear()
+        self.sort_key_indexes.clear()
+        self.change_stamp += 1
         #remove links to functions
         self.disconnect_all()
         for key in self._tables:
@@ -509,6 +522,7 @@ class DbBsddbRead(DbReadBase, Callback):
         Notify clients that the data has changed significantly, and that all
         internal data dependent on the database should be rebuilt.
         """
+        self.sort_key_indexes.clear()
         self.emit('person-rebuild')
         self.emit('family-rebuild')
         self.emit('place-rebuild')
@@ -613,13 +627,65 @@ class DbBsddbRead(DbReadBase, Callback):
         return gid
 
     def get_from_handle(self, handle, class_type, data_map):
-        data = data_map.get(str(handle))
+        handle = str(handle)
+        newobj = self.object_cache.get(handle, class_type)
+        if newobj is not None:
+            return newobj
+        data = data_map.get(handle)
         if data:
             newobj = class_type()
             newobj.unserialize(data)
+            self.object_cache.put(handle, class_type, newobj)
             return newobj
         return None
 
+    def set_object_cache_size(self, size):
+        """
+        Set the number of unserialized primary objects kept in the object
+        cache. A size of 0, the default, disables the cache.
+
+        Objects returned from the cache are shared between callers and must
+        not be modified unless they are committed afterwards. Enable the
+        cache only for read-only passes such as reports, filters and exports.
+        """
+        self.object_cache.set_size(size)
+
+    def get_object_cache_stats(self):
+        """
+        Return a dictionary with the size, number of entries, and the hit and
+        miss counters of the object cache.
+        """
+        return self.object_cache.get_stats()
+
+    def evict_from_object_cache(self, handle):
+        """
+        Remove the object with the given handle from the object cache.
+        """
+        self.object_cache.evict(str(handle))
+
+    def get_pedigree_index(self):
+        """
+        Return the PedigreeIndex of the database, building it from the person
+        and family tables if needed.
+        """
+        if not self.pedigree_index.is_built():
+            self.pedigree_index.build(self)
+        return self.pedigree_index
+
+    def get_sort_key_index(self, name, obj_type):
+        """
+        Return the SortKeyIndex with the given name, for the objects of
+        class name obj_type. The index is kept up to date with the changes
+        to the database and saved with it.
+        """
+        return self.sort_key_indexes.get(name, obj_type)
+
+    def get_change_stamp(self):
+        """
+        Return a number that changes whenever the database is changed.
+        """
+        return self.change_stamp
+
     def get_from_name_and_handle(self, table_name, handle):
         """
         Returns a gen.lib object (or None) given table_name and
@@ -1533,6 +1599,106 @@ class DbBsddbRead(DbReadBase, Callback):
     def get_raw_tag_data(self, handle):
         return self.__get_raw_data(self.tag_map, handle)
 
+    def __fetch_many(self, table_name, handles):
+        """
+        Helper method for the bulk accessors. Return a dictionary mapping the
+        handles found in table_name to their raw data.
+
+        The keys are visited in sorted order through a single cursor, which
+        keeps page access local for large lists of handles.
+        """
+        found = {}
+        try:
+            with self._tables[table_name]["cursor_func"]() as cursor:
+                for key in sorted(set(handles)):
+                    try:
+                        ret = cursor.set(key)
+                    except db.DBNotFoundError:
+                        ret = None
+                    if ret is not None:
+                        found[key] = cPickle.loads(ret[1])
+        except DBERRS, msg:
+            self.__log_error()
+            raise DbError(msg)
+        return found
+
+    def __chunks(self, handles):
+        """
+        Split an iterable of handles into lists of at most BATCH_SIZE string
+        handles.
+        """
+        chunk = []
+        for handle in handles:
+            chunk.append(str(handle))
+            if len(chunk) == self.BATCH_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def get_raw_data_many(self, table_name, handles):
+        """
+        Return an iterator over the raw data of the objects in table_name
+        with the given handles, in the order of handles. None is yielded for
+        handles that are not in the table.
+        """
+        for chunk in self.__chunks(handles):
+            found = self.__fetch_many(table_name, chunk)
+            for handle in chunk:
+                yield found.get(handle)
+
+    def get_from_handles(self, table_name, handles):
+        """
+        Return an iterator over the objects in table_name with the given
+        handles, in the order of handles. None is yielded for handles that
+        are not in the table.
+
+        Objects in the object cache are used as is; the others are read in
+        bulk and added to the cache.
+        """
+        class_type = self._tables[table_name]["class_func"]
+        cache = self.object_cache
+        for chunk in self.__chunks(handles):
+            objects = {}
+            missing = []
+            for handle in chunk:
+                obj = cache.get(handle, class_type)
+                if obj is None:
+                    missing.append(handle)
+                else:
+                    objects[handle] = obj
+            if missing:
+                for handle, data in self.__fetch_many(table_name,
+                                                      missing).iteritems():
+                    obj = class_type()
+                    obj.unserialize(data)
+                    cache.put(handle, class_type, obj)
+                    objects[handle] = obj
+            for handle in chunk:
+                yield objects.get(handle)
+
+    def _f(table_name):
+        """
+        Closure that returns a bulk accessor for a primary object type.
+        """
+        def g(self, handles):
+            return self.get_from_handles(table_name, handles)
+        return g
+
+    # Use closure to define bulk accessors for each primary object type
+
+    get_people_from_handles        = _f('Person')
+    get_families_from_handles      = _f('Family')
+    get_events_from_handles        = _f('Event')
+    get_places_from_handles        = _f('Place')
+    get_sources_from_handles       = _f('Source')
+    get_citations_from_handles     = _f('Citation')
+    get_media_objects_from_handles = _f('Media')
+    get_repositories_from_handles  = _f('Repository')
+    get_notes_from_handles         = _f('Note')
+    get_tags_from_handles          = _f('Tag')
+    del _f
+
     def __has_handle(self, table, handle):
         """
         Helper function for has_<object>_handle methods
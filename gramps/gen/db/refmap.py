@@ -0,0 +1,174 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Extract the rows of the reference map from the primary tables of a family
+tree, for DbBsddb.reindex_reference_map.
+
+The pickled records are read with plain cursors and handed out in chunks,
+either to a function in this process or to a pool of helper processes. The
+rows are returned sorted on their key, so that they can be appended to the
+reference map B-tree in key order.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import cPickle as pickle
+import multiprocessing
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..lib.person import Person
+from ..lib.family import Family
+from ..lib.src import Source
+from ..lib.citation import Citation
+from ..lib.event import Event
+from ..lib.place import Place
+from ..lib.repo import Repository
+from ..lib.mediaobj import MediaObject
+from ..lib.note import Note
+from ..lib.tag import Tag
+from ..constfunc import win
+from dbconst import *
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+CHUNK_SIZE = 1000   # Number of records handed to a helper in one go
+
+_KEY_TO_CLASS = {
+    PERSON_KEY:     Person,
+    FAMILY_KEY:     Family,
+    SOURCE_KEY:     Source,
+    CITATION_KEY:   Citation,
+    EVENT_KEY:      Event,
+    MEDIA_KEY:      MediaObject,
+    PLACE_KEY:      Place,
+    REPOSITORY_KEY: Repository,
+    NOTE_KEY:       Note,
+    TAG_KEY:        Tag,
+    }
+
+_CLASS_TO_KEY = dict((class_.__name__, key)
+                     for (key, class_) in _KEY_TO_CLASS.iteritems())
+
+def _extract_chunk(args):
+    """
+    Return the reference map rows of a chunk of pickled records of the
+    primary table of type key.
+    """
+    key, records = args
+    class_ = _KEY_TO_CLASS[key]
+    rows = []
+    for (handle, data) in records:
+        obj = class_()
+        obj.unserialize(pickle.loads(data))
+        primary = (key, handle)
+        for (ref_class_name, ref_handle) in set(
+                obj.get_referenced_handles_recursively()):
+            rows.append((str((handle, ref_handle)),
+                         (primary, (_CLASS_TO_KEY[ref_class_name],
+                                    ref_handle))))
+    return rows
+
+def _iter_chunks(tables):
+    """
+    Iterate over the records of the (key, table) pairs in tables in
+    chunks of CHUNK_SIZE.
+    """
+    for (key, table) in tables:
+        cursor = table.db.cursor()
+        try:
+            records = []
+            rec = cursor.first()
+            while rec is not None:
+                records.append(rec)
+                if len(records) == CHUNK_SIZE:
+                    yield (key, records)
+                    records = []
+                rec = cursor.next()
+            if records:
+                yield (key, records)
+        finally:
+            cursor.close()
+
+def _apply_ordered(pool, processes, func, chunks):
+    """
+    Apply func to chunks in pool, yielding each chunk with its result in
+    the original order.
+
+    At most twice as many chunks as there are processes are read ahead of
+    the results, so a large table is not held in memory at once.
+    """
+    pending = []
+    for args in chunks:
+        pending.append((args, pool.apply_async(func, (args,))))
+        if len(pending) > 2 * processes:
+            args, result = pending.pop(0)
+            yield (args, result.get())
+    for args, result in pending:
+        yield (args, result.get())
+
+def extract_references(tables, processes=1, callback=None):
+    """
+    Return the rows of the reference map for the records in tables, sorted
+    on their key.
+
+    tables is a list of (key, table) pairs, where key is the type of the
+    objects in the DBShelf table. A row is a (key, data) pair as stored in
+    the reference map. If processes is larger than one, the records are
+    unserialized in that many helper processes. callback is called with the
+    fraction of the records handled so far.
+    """
+    total = float(sum(len(table) for (key, table) in tables)) or 1.0
+    done = 0
+    rows = []
+    if processes > 1 and not win():
+        pool = multiprocessing.Pool(processes)
+        try:
+            for (args, result) in _apply_ordered(pool, processes,
+                                                 _extract_chunk,
+                                                 _iter_chunks(tables)):
+                rows.extend(result)
+                done += len(args[1])
+                if callback:
+                    callback(done / total)
+        except:
+            pool.terminate()
+            pool.join()
+            raise
+        pool.close()
+        pool.join()
+    else:
+        for args in _iter_chunks(tables):
+            rows.extend(_extract_chunk(args))
+            done += len(args[1])
+            if callback:
+                callback(done / total)
+    rows.sort()
+    return rows
@@ -0,0 +1,182 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Read-only access to the tables of a BSDDB family tree from helper processes.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import os
+
+from ..config import config
+if config.get('preferences.use-bsddb3'):
+    from bsddb3 import dbshelve, db
+else:
+    from bsddb import dbshelve, db
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from dbconst import *
+from read import DbBsddbRead
+from write import (FAMILY_TBL, PLACES_TBL, SOURCES_TBL, CITATIONS_TBL,
+                   MEDIA_TBL, EVENTS_TBL, PERSON_TBL, REPO_TBL, NOTE_TBL,
+                   TAG_TBL, META, NAME_GROUP, IDTRANS, FIDTRANS, PIDTRANS,
+                   OIDTRANS, EIDTRANS, RIDTRANS, NIDTRANS, SIDTRANS,
+                   CIDTRANS, TAGTRANS, REF_MAP, REF_REF, KEY_TO_CLASS_MAP)
+
+__all__ = ('DbBsddbSnapshot',)
+
+#-------------------------------------------------------------------------
+#
+# DbBsddbSnapshot
+#
+#-------------------------------------------------------------------------
+class DbBsddbSnapshot(DbBsddbRead):
+    """
+    Read-only view of the primary tables of a BSDDB family tree.
+
+    The snapshot opens the table files read-only in a private environment
+    without logging or transactions, so it can be used from a helper process
+    while the tree is open in the main process. The main process must call
+    DbBsddb.checkpoint() before the snapshot is loaded, and must not change
+    the tree while the snapshot is in use.
+
+    The reference map and its index of referenced objects are opened for
+    find_backlink_handles, but the reference counts are not.
+    """
+
+    def __open_db(self, table_name, dbtype=db.DB_HASH, flags=0):
+        dbmap = db.DB(self.env)
+        dbmap.set_flags(flags)
+        fname = os.path.join(self.full_name, table_name + DBEXT)
+        dbmap.open(fname, table_name, dbtype, DBFLAGS_R)
+        return dbmap
+
+    def __open_shelf(self, table_name, dbtype=db.DB_HASH):
+        dbmap = dbshelve.DBShelf(self.env)
+        fname = os.path.join(self.full_name, table_name + DBEXT)
+        dbmap.open(fname, table_name, dbtype, DBFLAGS_R)
+        return dbmap
+
+    def load(self, name, callback=None, mode=DBMODE_R):
+        """
+        Open the family tree in directory name read-only.
+        """
+        self.readonly = True
+        self.full_name = os.path.abspath(name)
+        self.path = self.full_name
+
+        self.env = db.DBEnv()
+        self.env.set_cachesize(0, DBCACHE)
+        self.env.open(self.full_name, db.DB_CREATE | db.DB_PRIVATE |
+                      db.DB_INIT_MPOOL | db.DB_THREAD)
+
+        self.metadata = self.__open_shelf(META)
+        self.name_formats = self.metadata.get('name_formats', default=[])
+
+        db_maps = [
+            ("family_map",     FAMILY_TBL),
+            ("place_map",      PLACES_TBL),
+            ("source_map",     SOURCES_TBL),
+            ("citation_map",   CITATIONS_TBL),
+            ("media_map",      MEDIA_TBL),
+            ("event_map",      EVENTS_TBL),
+            ("person_map",     PERSON_TBL),
+            ("repository_map", REPO_TBL),
+            ("note_map",       NOTE_TBL),
+            ("tag_map",        TAG_TBL),
+            ]
+        for (dbmap, dbname) in db_maps:
+            setattr(self, dbmap, self.__open_shelf(dbname))
+
+        # Secondary indices return the primary key for a readonly database
+        index_maps = [
+            ("id_trans",  IDTRANS),
+            ("fid_trans", FIDTRANS),
+            ("eid_trans", EIDTRANS),
+            ("pid_trans", PIDTRANS),
+            ("sid_trans", SIDTRANS),
+            ("cid_trans", CIDTRANS),
+            ("oid_trans", OIDTRANS),
+            ("rid_trans", RIDTRANS),
+            ("nid_trans", NIDTRANS),
+            ("tag_trans", TAGTRANS),
+            ]
+        for (dbmap, dbname) in index_maps:
+            setattr(self, dbmap, self.__open_db(dbname, db.DB_HASH,
+                                                db.DB_DUP))
+        self.name_group = self.__open_db(NAME_GROUP, db.DB_HASH, db.DB_DUP)
+
+        self.reference_map = self.__open_shelf(REF_MAP, db.DB_BTREE)
+        self.reference_map_referenced_map = self.__open_db(REF_REF,
+                                                db.DB_BTREE, db.DB_DUPSORT)
+
+        self.db_is_open = True
+        return 1
+
+    def close(self):
+        if not self.db_is_open:
+            return
+        for dbmap in ("id_trans", "fid_trans", "eid_trans", "pid_trans",
+                      "sid_trans", "cid_trans", "oid_trans", "rid_trans",
+                      "nid_trans", "tag_trans", "name_group", "person_map",
+                      "family_map", "place_map", "source_map",
+                      "citation_map", "media_map", "event_map",
+                      "repository_map", "note_map", "tag_map", "metadata",
+                      "reference_map", "reference_map_referenced_map"):
+            getattr(self, dbmap).close()
+            setattr(self, dbmap, None)
+        self.env.close()
+        self.env = None
+        self.db_is_open = False
+        DbBsddbRead.close(self)
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        """
+        Find all objects that hold a reference to the object handle.
+
+        Returns an iterator over (class_name, handle) tuples, see
+        DbBsddb.find_backlink_handles.
+        """
+        handle = str(handle)
+        referenced_cur = self.reference_map_referenced_map.cursor()
+        try:
+            ret = referenced_cur.set(handle)
+        except db.DBNotFoundError:
+            ret = None
+
+        while ret is not None:
+            # the index is not associated with the reference map here, so
+            # it holds the keys of the reference map
+            data = self.reference_map.get(ret[1])
+            if data is not None:
+                name = KEY_TO_CLASS_MAP[data[0][0]]
+                if include_classes is None or name in include_classes:
+                    yield (name, data[0][1])
+            ret = referenced_cur.next_dup()
+
+        referenced_cur.close()
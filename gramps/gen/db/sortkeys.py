@@ -0,0 +1,203 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Sorted lists of the objects of a family tree in the order of the columns of
+the views, which are kept with the database between the views that use them.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from __future__ import with_statement
+import cPickle as pickle
+import heapq
+
+__all__ = ('SortKeyIndex', 'SortKeyIndexes')
+
+_VERSION = 1    # Version of the saved indexes
+
+#-------------------------------------------------------------------------
+#
+# SortKeyIndex
+#
+#-------------------------------------------------------------------------
+class SortKeyIndex(object):
+    """
+    The sorted list of (sortkey, handle) pairs of all objects of one type,
+    in the order of one column of a view.
+
+    The sort keys are computed by the view. The database records which
+    objects of the type changed since, so that only their keys have to be
+    computed again. A change to objects of another type, on which the keys
+    may depend, clears the index.
+    """
+
+    def __init__(self, obj_type):
+        """
+        Create an empty index for the objects of class name obj_type.
+        """
+        self.obj_type = obj_type
+        self.__context = None
+        self.__keys = None
+        self.__changed = set()
+
+    def is_built(self):
+        """
+        Return True if the index holds the keys of all objects.
+        """
+        return self.__keys is not None
+
+    def clear(self):
+        """
+        Remove all keys, so that they are computed again on next use.
+        """
+        self.__context = None
+        self.__keys = None
+        self.__changed = set()
+
+    def objects_changed(self, handles):
+        """
+        Record that the objects with the given handles were added, changed
+        or removed.
+        """
+        if self.__keys is not None:
+            self.__changed.update(handles)
+
+    def get_keys(self, context, build, get_key):
+        """
+        Return a sorted list of the (sortkey, handle) pairs of all objects.
+
+        :param context: a value identifying anything besides the objects
+            that the keys depend on, such as the locale. If it differs from
+            the context of the index, the keys are computed again.
+        :param build: function returning the sorted list of all pairs.
+        :param get_key: function returning the sort key of the object with
+            the given handle, or None if the object no longer exists.
+        """
+        if self.__keys is None or context != self.__context:
+            self.__keys = build()
+            self.__context = context
+            self.__changed = set()
+        elif self.__changed:
+            changed = self.__changed
+            added = []
+            for handle in changed:
+                key = get_key(handle)
+                if key is not None:
+                    added.append((key, handle))
+            added.sort()
+            kept = [item for item in self.__keys if item[1] not in changed]
+            self.__keys = list(heapq.merge(kept, added))
+            self.__changed = set()
+        return list(self.__keys)
+
+    def get_state(self):
+        """
+        Return the contents of the index, for saving it.
+        """
+        return (self.obj_type, self.__context, self.__keys, self.__changed)
+
+    def set_state(self, state):
+        """
+        Restore the contents of the index returned by get_state.
+        """
+        (self.obj_type, self.__context, self.__keys, self.__changed) = state
+
+#-------------------------------------------------------------------------
+#
+# SortKeyIndexes
+#
+#-------------------------------------------------------------------------
+class SortKeyIndexes(object):
+    """
+    The SortKeyIndex objects of a database, by name.
+    """
+
+    def __init__(self):
+        self.__indexes = {}
+
+    def get(self, name, obj_type):
+        """
+        Return the index with the given name for objects of class name
+        obj_type, creating it if needed.
+        """
+        index = self.__indexes.get(name)
+        if index is None or index.obj_type != obj_type:
+            index = self.__indexes[name] = SortKeyIndex(obj_type)
+        return index
+
+    def objects_changed(self, changes):
+        """
+        Update the indexes for the changes of a transaction.
+
+        changes is a dictionary of class name to the handles of the objects
+        of that class that were added, changed or removed.
+        """
+        for index in self.__indexes.itervalues():
+            for (obj_type, handles) in changes.iteritems():
+                if obj_type == index.obj_type:
+                    index.objects_changed(handles)
+                elif handles:
+                    index.clear()
+                    break
+
+    def clear(self):
+        """
+        Clear all indexes.
+        """
+        for index in self.__indexes.itervalues():
+            index.clear()
+
+    def save(self, filename, signature):
+        """
+        Save the built indexes to filename. The signature identifies the
+        state of the tables the indexes belong to.
+        """
+        states = dict((name, index.get_state())
+                      for (name, index) in self.__indexes.iteritems()
+                      if index.is_built())
+        if not states:
+            return
+        with open(filename, 'wb') as index_file:
+            pickle.dump((_VERSION, signature, states), index_file,
+                        pickle.HIGHEST_PROTOCOL)
+
+    def load(self, filename, signature):
+        """
+        Load the indexes saved in filename, if they were saved with the same
+        signature. Return True if the indexes were loaded.
+        """
+        self.__indexes = {}
+        try:
+            with open(filename, 'rb') as index_file:
+                data = pickle.load(index_file)
+        except (IOError, EOFError, pickle.UnpicklingError):
+            return False
+        if (not isinstance(data, tuple) or len(data) != 3 or
+                data[0] != _VERSION or data[1] != signature):
+            return False
+        for (name, state) in data[2].iteritems():
+            index = SortKeyIndex(state[0])
+            index.set_state(state)
+            self.__indexes[name] = index
+        return True
@@ -0,0 +1,71 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/db/test/backupchanges_test.py
+# $Id$
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ..backupchanges import BackupChanges
+
+class BackupChangesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.changes = BackupChanges()
+
+    def test_unknown(self):
+        self.changes.objects_changed('person', ['P1'])
+        self.assertFalse(self.changes.is_known())
+        self.assertEqual(self.changes.get_changes(), None)
+
+    def test_record(self):
+        self.changes.clear(True)
+        self.changes.objects_changed('person', ['P1', 'P2'])
+        self.changes.objects_changed('person', ['P1'])
+        self.changes.objects_changed('note', ['N1'])
+        self.changes.objects_changed('family', [])
+        self.assertEqual(self.changes.get_changes(),
+                         {'person': set(['P1', 'P2']), 'note': set(['N1'])})
+        self.changes.invalidate()
+        self.assertEqual(self.changes.get_changes(), None)
+
+    def test_save_load(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, 'backupchanges.idx')
+            self.changes.save(fname, 1)
+            self.assertFalse(os.path.exists(fname))
+            self.changes.clear(True)
+            self.changes.objects_changed('event', ['E1'])
+            self.changes.save(fname, 1)
+            changes = BackupChanges()
+            self.assertFalse(changes.load(fname, 2))
+            self.assertFalse(changes.is_known())
+            self.assertTrue(changes.load(fname, 1))
+            self.assertEqual(changes.get_changes(), {'event': set(['E1'])})
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,7 +42,9 @@ class DbTest(object):
         "find_next_place_gramps_id",
         "find_next_repository_gramps_id",
         "find_next_source_gramps_id",
+        "get_backlink_count",
         "get_bookmarks",
+        "get_change_stamp",
         "get_child_reference_types",
         "get_default_handle",
         "get_default_person",
@@ -54,6 +56,7 @@ class DbTest(object):
         "get_event_roles",
         "get_family_attribute_types",
         "get_family_bookmarks",
+        "get_families_from_handles",
         "get_family_cursor",
         "get_family_event_types",
         "get_family_from_gramps_id",
@@ -87,6 +90,7 @@ class DbTest(object):
         "get_number_of_tags",
         "get_object_from_gramps_id",
         "get_object_from_handle",
+        "get_people_from_handles",
         "get_person_attribute_types",
         "get_person_cursor",
         "get_person_event_types",
@@ -98,6 +102,7 @@ class DbTest(object):
         "get_place_from_gramps_id",
         "get_place_from_handle",
         "get_place_handles",
+        "get_raw_data_many",
         "get_raw_event_data",
         "get_raw_family_data",
         "get_raw_note_data",
@@ -118,6 +123,7 @@ class DbTest(object):
         "get_repository_types",
         "get_researcher",
         "get_save_path",
+        "get_sort_key_index",
         "get_source_bookmarks",
         "get_source_cursor",
         "get_source_from_gramps_id",
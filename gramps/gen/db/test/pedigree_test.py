@@ -0,0 +1,150 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/db/test/pedigree_test.py
+# $Id$
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ..pedigree import PedigreeIndex
+
+def person_data(handle, families, parent_families):
+    data = [None] * 21
+    data[0] = handle
+    data[8] = families
+    data[9] = parent_families
+    return tuple(data)
+
+def family_data(handle, father, mother, children):
+    return (handle, None, father, mother,
+            [(False, [], [], child, (1, ''), (1, '')) for child in children])
+
+class Cursor(object):
+    def __init__(self, rows):
+        self.rows = rows
+    def __enter__(self):
+        return iter(self.rows)
+    def __exit__(self, *args):
+        return False
+
+class Tables(object):
+    """
+    Grandparents A and B, parents C and D, child E. C's second family,
+    with G, has child F. E and F marry and have child H, so C is a
+    duplicated ancestor of H.
+    """
+    def __init__(self):
+        self.people = [
+            person_data('A', ['F1'], []),
+            person_data('B', ['F1'], []),
+            person_data('C', ['F2', 'F3'], ['F1']),
+            person_data('D', ['F2'], []),
+            person_data('E', ['F4'], ['F2']),
+            person_data('F', ['F4'], ['F3']),
+            person_data('G', ['F3'], []),
+            person_data('H', [], ['F4']),
+            ]
+        self.families = [
+            family_data('F1', 'A', 'B', ['C']),
+            family_data('F2', 'C', 'D', ['E']),
+            family_data('F3', 'C', 'G', ['F']),
+            family_data('F4', 'E', 'F', ['H']),
+            ]
+    def get_person_cursor(self):
+        return Cursor([(data[0], data) for data in self.people])
+    def get_family_cursor(self):
+        return Cursor([(data[0], data) for data in self.families])
+
+class PedigreeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PedigreeIndex()
+        self.index.build(Tables())
+
+    def test_ancestors(self):
+        index = self.index
+        self.assertEqual(index.find_ancestors(['E']), set('ABCD'))
+        self.assertEqual(index.find_ancestors(['E'], min_gen=0),
+                         set('ABCDE'))
+        self.assertEqual(index.find_ancestors(['E'], max_gen=1), set('CD'))
+        self.assertEqual(index.find_ancestors(['H'], min_gen=3), set('AB'))
+        self.assertEqual(index.find_duplicated_ancestors('H'), set('ABC'))
+
+    def test_descendants(self):
+        index = self.index
+        self.assertEqual(index.find_descendants(['A']), set('CEFH'))
+        self.assertEqual(index.find_descendants(['C'], max_gen=1), set('EF'))
+        self.assertEqual(index.find_descendants(['A'], min_gen=3), set('H'))
+
+    def test_iter_ancestors(self):
+        handles = list(self.index.iter_ancestors(['H', 'E']))
+        self.assertEqual(handles[:2], ['H', 'E'])
+        self.assertEqual(sorted(handles), list('ABCDEFGH'))
+
+    def test_common_ancestor(self):
+        index = self.index
+        self.assertTrue(index.have_common_ancestor('E', 'F'))
+        self.assertTrue(index.have_common_ancestor('A', 'H'))
+        self.assertTrue(index.have_common_ancestor('H', 'H'))
+        self.assertFalse(index.have_common_ancestor('D', 'G'))
+        self.assertFalse(index.have_common_ancestor('B', 'G'))
+        # D and G become siblings in a family without parents
+        index.set_person('D', ['F2'], ['F5'])
+        index.set_person('G', ['F3'], ['F5'])
+        index.set_family('F5', None, None, ['D', 'G'])
+        self.assertTrue(index.have_common_ancestor('D', 'G'))
+        self.assertFalse(index.have_common_ancestor('B', 'G'))
+
+    def test_loop(self):
+        # A is made a child of E and F, the searches must still end
+        self.index.set_person('A', ['F1'], ['F4'])
+        self.index.set_family('F4', 'E', 'F', ['H', 'A'])
+        self.assertEqual(self.index.find_ancestors(['A']), set('ABCDEFG'))
+        self.assertEqual(self.index.find_ancestors(['H'], min_gen=10),
+                         set('ABCDEFG'))
+        self.assertEqual(self.index.find_descendants(['A'], min_gen=10),
+                         set('ACEFH'))
+
+    def test_update(self):
+        self.index.remove_family('F3')
+        self.assertEqual(self.index.find_ancestors(['F']), set())
+        self.index.update_family_data('F3',
+                                      family_data('F3', 'G', None, ['F']))
+        self.assertEqual(self.index.get_parents('F'), ['G'])
+
+    def test_save_load(self):
+        path = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(path, 'pedigree.idx')
+            self.index.save(fname, 'signature')
+            index = PedigreeIndex()
+            self.assertFalse(index.load(fname, 'other'))
+            self.assertFalse(index.is_built())
+            self.assertTrue(index.load(fname, 'signature'))
+            self.assertEqual(index.find_descendants(['A']), set('CEFH'))
+        finally:
+            shutil.rmtree(path)
+
+if __name__ == "__main__":
+    unittest.main()
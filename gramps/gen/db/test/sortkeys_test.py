@@ -0,0 +1,85 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/db/test/sortkeys_test.py
+# $Id$
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ..sortkeys import SortKeyIndexes
+
+class SortKeyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.names = {'P1': 'Smith', 'P2': 'Adams', 'P3': 'Jones'}
+        self.builds = 0
+        self.indexes = SortKeyIndexes()
+
+    def expected(self):
+        return sorted((name, handle)
+                      for (handle, name) in self.names.iteritems())
+
+    def build(self):
+        self.builds += 1
+        return self.expected()
+
+    def get_keys(self, context='C'):
+        index = self.indexes.get('PersonView.sort_name', 'Person')
+        return index.get_keys(context, self.build, self.names.get)
+
+    def test_patch(self):
+        self.get_keys()
+        self.names['P1'] = 'Baker'
+        self.names['P4'] = 'Zorn'
+        del self.names['P2']
+        self.indexes.objects_changed(
+            {'Person': set(['P1', 'P2', 'P4']), 'Family': set()})
+        self.assertEqual(self.get_keys(), self.expected())
+        self.assertEqual(self.builds, 1)
+
+    def test_rebuild(self):
+        self.get_keys()
+        self.names['P1'] = 'Baker'
+        self.indexes.objects_changed({'Family': set(['F1'])})
+        self.assertEqual(self.get_keys(), self.expected())
+        self.assertEqual(self.builds, 2)
+        self.get_keys(context='de_DE')
+        self.assertEqual(self.builds, 3)
+
+    def test_save_load(self):
+        keys = self.get_keys()
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, 'sortkeys.idx')
+            self.indexes.save(fname, 1)
+            self.indexes = SortKeyIndexes()
+            self.assertFalse(self.indexes.load(fname, 2))
+            self.assertTrue(self.indexes.load(fname, 1))
+            self.assertEqual(self.get_keys(), keys)
+            self.assertEqual(self.builds, 1)
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -295,10 +295,15 @@ class DbUndo(object):
         Helper method to undo a reference map entry
         """
         try:
+            old_data = db_map.get(handle, txn=self.txn)
             if data is None:
                 db_map.delete(handle, txn=self.txn)
             else:
                 db_map.put(handle, data, txn=self.txn)
+            if old_data is None:
+                self.db._update_reference_count(data, 1, self.txn)
+            elif data is None:
+                self.db._update_reference_count(old_data, -1, self.txn)
 
         except DBERRS, msg:
             self.db._log_error()
@@ -308,10 +313,15 @@ class DbUndo(object):
         """
         Helper method to undo/redo the changes made
         """
+        self.db.evict_from_object_cache(handle)
+        self.db.backup_changes.objects_changed(signal_root, [handle])
         try:
             if data is None:
                 emit(signal_root + '-delete', ([handle],))
                 db_map.delete(handle, txn=self.txn)
+                # listeners of the delete signal may have cached the object
+                self.db.evict_from_object_cache(handle)
+                self.__update_pedigree_index(signal_root, handle, data)
             else:
                 ex_data = db_map.get(handle, txn=self.txn)
                 if ex_data:
@@ -319,12 +329,22 @@ class DbUndo(object):
                 else:
                     signal = signal_root + '-add'
                 db_map.put(handle, data, txn=self.txn)
+                self.__update_pedigree_index(signal_root, handle, data)
                 emit(signal, ([handle],))
 
         except DBERRS, msg:
             self.db._log_error()
             raise DbError(msg)
 
+    def __update_pedigree_index(self, signal_root, handle, data):
+        """
+        Helper method to keep the pedigree index in step with undo/redo
+        """
+        if signal_root == 'person':
+            self.db.pedigree_index.update_person_data(handle, data)
+        elif signal_root == 'family':
+            self.db.pedigree_index.update_family_data(handle, data)
+
     undo_count = property(lambda self:len(self.undoq))
     redo_count = property(lambda self:len(self.redoq))
 
@@ -77,11 +77,15 @@ from ..utils.cast import (conv_unicode_tosrtkey, conv_dbstr_to_unicode)
 from ..updatecallback import UpdateCallback
 from ..errors import DbError
 from ..constfunc import win
+from refmap import extract_references
+from backupchanges import BackupChanges
 
 _LOG = logging.getLogger(DBLOGNAME)
 LOG = logging.getLogger(".citation")
 _MINVERSION = 9
 _DBVERSION = 16
+_REINDEX_BATCH = 10000  # Reference map rows written per transaction
+_REFCOUNT_VERSION = 1   # Version of the reference count table
 
 IDTRANS     = "person_id"
 FIDTRANS    = "family_id"
@@ -108,9 +112,14 @@ REPO_TBL    = "repo"
 NOTE_TBL    = "note"
 TAG_TBL     = "tag"
 
+PRIMARY_TBLS = (PERSON_TBL, FAMILY_TBL, SOURCES_TBL, CITATIONS_TBL,
+                EVENTS_TBL, MEDIA_TBL, PLACES_TBL, REPO_TBL, NOTE_TBL,
+                TAG_TBL)
+
 REF_MAP     = "reference_map"
 REF_PRI     = "primary_map"
 REF_REF     = "referenced_map"
+REF_COUNT   = "reference_count"
 
 DBERRS      = (db.DBRunRecoveryError, db.DBAccessError, 
                db.DBPageNotFoundError, db.DBInvalidArgError)
@@ -198,6 +207,52 @@ class DbBsddbAssocCursor(BsddbBaseCursor):
         self.cursor = source.cursor(txn)
         self.source = source
         
+#-------------------------------------------------------------------------
+#
+# BulkIdMap
+#
+#-------------------------------------------------------------------------
+class BulkIdMap(object):
+    """
+    In memory stand-in for a gramps_id secondary index during a bulk load.
+
+    Lookups return the pickled data of the primary table, as the secondary
+    index they replace does.
+    """
+
+    def __init__(self, primary):
+        self.primary = primary
+        self.handles = {}
+        self.ids = {}
+
+    def get(self, key, default=None, txn=None):
+        handle = self.handles.get(key)
+        if handle is None:
+            return default
+        return self.primary.db.get(handle, txn=txn)
+
+    def has_key(self, key, txn=None):
+        return key in self.handles
+
+    __contains__ = has_key
+
+    def keys(self, txn=None):
+        return self.handles.keys()
+
+    def put(self, handle, gramps_id):
+        self.delete(handle)
+        gramps_id = str(gramps_id)
+        self.handles[gramps_id] = handle
+        self.ids[handle] = gramps_id
+
+    def delete(self, handle):
+        gramps_id = self.ids.pop(handle, None)
+        if gramps_id is not None and self.handles.get(gramps_id) == handle:
+            del self.handles[gramps_id]
+
+    def close(self):
+        pass
+
 #-------------------------------------------------------------------------
 #
 # DbBsddb
@@ -241,7 +296,10 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         DbWriteBase.__init__(self)
         #UpdateCallback.__init__(self)
         self.secondary_connected = False
+        self.bulk_id_maps = None
+        self.reference_count = None
         self.has_changed = False
+        self.backup_changes = BackupChanges()
         self.brief_name = None
         self.update_env_version = False
 
@@ -431,6 +489,10 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
 
         if self.db_is_open:
             self.close()
+        self.object_cache.clear()
+        self.pedigree_index.clear()
+        self.sort_key_indexes.clear()
+        self.backup_changes.clear()
 
         self.readonly = mode == DBMODE_R
         #super(DbBsddbRead, self).load(name, callback, mode)
@@ -441,6 +503,10 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.full_name = os.path.abspath(name)
         self.path = self.full_name
         self.brief_name = os.path.basename(name)
+        pedigree_signature = self.__table_signature((PERSON_TBL, FAMILY_TBL))
+        sort_keys_signature = self.__table_signature(PRIMARY_TBLS)
+        backup_changes_signature = self.__table_signature(PRIMARY_TBLS)
+        ref_count_signature = self.__table_signature((REF_MAP, REF_COUNT))
 
         self.__check_bdb_version(name)
 
@@ -542,6 +608,24 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.name_group = self.__open_db(self.full_name, NAME_GROUP,
                               db.DB_HASH, db.DB_DUP)
 
+        # Open the reference count table. The table is only up to date if
+        # its signature was saved when the tree was last closed: a tree
+        # changed by an older version of Gramps, or not closed properly,
+        # has stale counts. A table which is new or stale is filled from
+        # the reference map below, and is not used in a read-only tree. The
+        # saved signature is removed, as for the pedigree index.
+        fname = os.path.join(self.full_name, REFCOUNTFN)
+        new_reference_count = (ref_count_signature is None or
+                               _load_signature(fname, _REFCOUNT_VERSION) !=
+                               ref_count_signature)
+        if not self.readonly and os.path.isfile(fname):
+            os.remove(fname)
+        if new_reference_count and self.readonly:
+            self.reference_count = None
+        else:
+            self.reference_count = self.__open_shelf(self.full_name,
+                                                     REF_COUNT)
+
         # Here we take care of any changes in the tables related to new code.
         # If secondary indices change, then they should removed
         # or rebuilt by upgrade as well. In any case, the
@@ -561,6 +645,10 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         if not self.secondary_connected:
             self.__connect_secondary()
 
+        if new_reference_count and not self.readonly:
+            with self.get_cursor(self.reference_map) as cursor:
+                self.__write_reference_count(cursor)
+
         if callback:
             callback(75)
 
@@ -568,12 +656,50 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.__open_undodb()
         self.db_is_open = True
 
+        # Reuse the pedigree index saved when the tree was closed, and remove
+        # it, so a stale index is not picked up after a crash
+        if pedigree_signature is not None:
+            fname = os.path.join(self.full_name, PEDIGREEFN)
+            self.pedigree_index.load(fname, pedigree_signature)
+            if not self.readonly and os.path.isfile(fname):
+                os.remove(fname)
+
+        # The same for the sort key indexes of the views
+        if sort_keys_signature is not None:
+            fname = os.path.join(self.full_name, SORTKEYSFN)
+            self.sort_key_indexes.load(fname, sort_keys_signature)
+            if not self.readonly and os.path.isfile(fname):
+                os.remove(fname)
+
+        # The changes since the last backup, without which the next backup
+        # is a full one
+        if backup_changes_signature is not None:
+            fname = os.path.join(self.full_name, BACKUPCHANGESFN)
+            self.backup_changes.load(fname, backup_changes_signature)
+            if not self.readonly and os.path.isfile(fname):
+                os.remove(fname)
+
         if callback:
             callback(87)
         
         self.abort_possible = True
         return 1
 
+    def __table_signature(self, tables):
+        """
+        Return the size and modification time of the given tables, which
+        identify the state a saved index belongs to, or None if the tables
+        do not exist.
+        """
+        signature = []
+        for table in tables:
+            try:
+                stat = os.stat(_mkname(self.full_name, table))
+            except OSError:
+                return None
+            signature.append((stat.st_size, stat.st_mtime))
+        return tuple(signature)
+
     def __open_undodb(self):
         """
         Open the undo database
@@ -765,6 +891,63 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         if callback:
             callback(12)
 
+    def __begin_bulk_load(self):
+        """
+        Replace the secondary indices by in memory gramps_id maps for the
+        duration of a bulk transaction.
+
+        The reference map is not kept up to date during a bulk load, it is
+        rebuilt at the end by __end_bulk_load.
+        """
+        id_maps = [
+            (PERSON_KEY,     "id_trans",  IDTRANS,  self.person_map),
+            (FAMILY_KEY,     "fid_trans", FIDTRANS, self.family_map),
+            (EVENT_KEY,      "eid_trans", EIDTRANS, self.event_map),
+            (PLACE_KEY,      "pid_trans", PIDTRANS, self.place_map),
+            (SOURCE_KEY,     "sid_trans", SIDTRANS, self.source_map),
+            (CITATION_KEY,   "cid_trans", CIDTRANS, self.citation_map),
+            (MEDIA_KEY,      "oid_trans", OIDTRANS, self.media_map),
+            (REPOSITORY_KEY, "rid_trans", RIDTRANS, self.repository_map),
+            (NOTE_KEY,       "nid_trans", NIDTRANS, self.note_map),
+            (TAG_KEY,        "tag_trans", TAGTRANS, self.tag_map),
+            ]
+
+        self.bulk_id_maps = {}
+        for (key, dbmap, dbname, primary) in id_maps:
+            id_map = BulkIdMap(primary)
+            with self.get_cursor(primary) as cursor:
+                for handle, data in cursor:
+                    id_map.put(handle, data[1])
+            self.bulk_id_maps[key] = id_map
+
+        secondary = [(dbmap, dbname) for (key, dbmap, dbname, primary)
+                     in id_maps]
+        secondary += [
+            ("surnames", SURNAMES),
+            ("reference_map_primary_map", REF_PRI),
+            ("reference_map_referenced_map", REF_REF),
+            ]
+        for (dbmap, dbname) in secondary:
+            getattr(self, dbmap).close()
+            _db = db.DB(self.env)
+            try:
+                _db.remove(_mkname(self.full_name, dbname), dbname)
+            except db.DBNoSuchFileError:
+                pass
+
+        for (key, dbmap, dbname, primary) in id_maps:
+            setattr(self, dbmap, self.bulk_id_maps[key])
+        self.secondary_connected = False
+
+    def __end_bulk_load(self):
+        """
+        Rebuild the secondary indices and the reference map after a bulk
+        load.
+        """
+        self.bulk_id_maps = None
+        self.rebuild_secondary()
+        self.reindex_reference_map(lambda percent: None)
+
     @catch_db_error
     def find_backlink_handles(self, handle, include_classes=None):
         """
@@ -919,11 +1102,12 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         the passed transaction.
         """
         if not self.readonly:
+            old_data = self.reference_map.get(str(key), txn=txn)
             if not transaction.batch:
-                old_data = self.reference_map.get(str(key), txn=txn)
                 transaction.add(REFERENCE_KEY, TXNDEL, str(key), old_data, None)
                 #transaction.reference_del.append(str(key))
             self.reference_map.delete(str(key), txn=txn)
+            self._update_reference_count(old_data, -1, txn)
 
     def __add_reference(self, key, data, transaction, txn):
         """
@@ -935,17 +1119,90 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             return
         
         self.reference_map.put(str(key), data, txn=txn)
+        self._update_reference_count(data, 1, txn)
         if not transaction.batch:
             transaction.add(REFERENCE_KEY, TXNADD, str(key), None, data)
             #transaction.reference_add.append((str(key), data))
 
+    def _update_reference_count(self, data, delta, txn=None):
+        """
+        Add delta to the number of references of the primary object class
+        in the reference map entry data to the referenced object.
+        """
+        if data is None or self.reference_count is None:
+            return
+        (primary_key, dummy), (dummy, ref_handle) = data
+        ref_handle = str(ref_handle)
+        class_name = KEY_TO_CLASS_MAP[primary_key]
+        counts = self.reference_count.get(ref_handle, txn=txn) or {}
+        count = counts.get(class_name, 0) + delta
+        if count > 0:
+            counts[class_name] = count
+        else:
+            counts.pop(class_name, None)
+        if counts:
+            self.reference_count.put(ref_handle, counts, txn=txn)
+        else:
+            self.reference_count.delete(ref_handle, txn=txn)
+
+    def __write_reference_count(self, rows):
+        """
+        Replace the contents of the reference count table by the counts of
+        the reference map entries in rows, an iterable of (key, data) pairs.
+        """
+        counts = {}
+        for (key, data) in rows:
+            (primary_key, dummy), (dummy, ref_handle) = data
+            class_counts = counts.setdefault(str(ref_handle), {})
+            class_name = KEY_TO_CLASS_MAP[primary_key]
+            class_counts[class_name] = class_counts.get(class_name, 0) + 1
+
+        self.reference_count.truncate()
+        items = counts.items()
+        for index in xrange(0, len(items), _REINDEX_BATCH):
+            with BSDDBTxn(self.env, self.reference_count) as txn:
+                for (handle, class_counts) in \
+                        items[index:index + _REINDEX_BATCH]:
+                    txn.put(handle, class_counts)
+
+    @catch_db_error
+    def get_backlink_count(self, handle, include_classes=None):
+        """
+        Return the number of objects that hold a reference to the object
+        handle, looked up in the reference count table.
+
+        :param handle: handle of the object to search for.
+        :type handle: database handle
+        :param include_classes: list of class names to count.
+            Default: None means count all classes.
+        :type include_classes: list of class names
+        """
+        if self.reference_count is None:
+            return DbBsddbRead.get_backlink_count(self, handle,
+                                                  include_classes)
+        counts = self.reference_count.get(str(handle), txn=self.txn)
+        if not counts:
+            return 0
+        if include_classes is None:
+            return sum(counts.itervalues())
+        return sum(counts.get(class_name, 0)
+                   for class_name in include_classes)
+
     @catch_db_error
-    def reindex_reference_map(self, callback):
+    def reindex_reference_map(self, callback, processes=None):
         """
         Reindex all primary records in the database.
-        
-        This will be a slow process for large databases.
+
+        The references of all objects are collected and sorted first, then
+        they are written to an empty reference map in key order and the
+        secondary indices of the reference map are built in one pass.
+        callback is called with the step reached, from 1 to 6; the steps 3
+        to 5 are reported in fractions. If processes is larger than one,
+        the objects are unserialized in that many helper processes. It
+        defaults to the behavior.reindex-processes preference.
         """
+        if processes is None:
+            processes = config.get('behavior.reindex-processes')
 
         # First, remove the reference map and related tables
 
@@ -964,55 +1221,47 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
                 pass
             callback(index+1)
 
-        # Open reference_map and primary map
         self.reference_map  = self.__open_shelf(self.full_name, REF_MAP, 
                                   dbtype=db.DB_BTREE)
-        
-        self.reference_map_primary_map = self.__open_db(self.full_name,
-                                            REF_PRI, db.DB_BTREE, db.DB_DUP)
-
-        self.reference_map.associate(self.reference_map_primary_map,
-                                     find_primary_handle, DBFLAGS_O)
-
-        # Make a tuple of the functions and classes that we need for
-        # each of the primary object tables.
 
         with DbTxn(_("Rebuild reference map"), self, batch=True,
-                                    no_magic=True) as transaction:
-            callback(4)
-
-            primary_table = (
-                            (self.get_person_cursor, Person),
-                            (self.get_family_cursor, Family),
-                            (self.get_event_cursor, Event),
-                            (self.get_place_cursor, Place),
-                            (self.get_source_cursor, Source),
-                            (self.get_citation_cursor, Citation),
-                            (self.get_media_cursor, MediaObject),
-                            (self.get_repository_cursor, Repository),
-                            (self.get_note_cursor, Note),
-                            (self.get_tag_cursor, Tag),
-                            )
-                         
-            # Now we use the functions and classes defined above
-            # to loop through each of the primary object tables.
-        
-            for cursor_func, class_func in primary_table:
-                logging.info("Rebuilding %s reference map" %
-                                class_func.__name__)
-                with cursor_func() as cursor:
-                    for found_handle, val in cursor:
-                        obj = class_func()
-                        obj.unserialize(val)
-                        with BSDDBTxn(self.env) as txn:
-                            self.update_reference_map(obj, transaction, txn.txn)
-
-            callback(5)
-
+                                    no_magic=True):
+            primary_table = [
+                            (PERSON_KEY, self.person_map),
+                            (FAMILY_KEY, self.family_map),
+                            (EVENT_KEY, self.event_map),
+                            (PLACE_KEY, self.place_map),
+                            (SOURCE_KEY, self.source_map),
+                            (CITATION_KEY, self.citation_map),
+                            (MEDIA_KEY, self.media_map),
+                            (REPOSITORY_KEY, self.repository_map),
+                            (NOTE_KEY, self.note_map),
+                            (TAG_KEY, self.tag_map),
+                            ]
+
+            rows = extract_references(primary_table, processes,
+                                      lambda done: callback(3 + done))
+            total = float(len(rows)) or 1.0
+            for index in xrange(0, len(rows), _REINDEX_BATCH):
+                with BSDDBTxn(self.env, self.reference_map) as txn:
+                    for (key, data) in rows[index:index + _REINDEX_BATCH]:
+                        txn.put(key, data)
+                done = min(index + _REINDEX_BATCH, len(rows))
+                callback(4 + done / total)
+            self.__write_reference_count(rows)
+            del rows
+
+        # Associating the secondary indices with the filled reference map
+        # builds them from it
+        self.reference_map_primary_map = self.__open_db(self.full_name,
+                                            REF_PRI, db.DB_BTREE, db.DB_DUP)
         self.reference_map_referenced_map = self.__open_db(self.full_name,
             REF_REF, db.DB_BTREE, db.DB_DUP|db.DB_DUPSORT)
 
         flags = DBFLAGS_R if self.readonly else DBFLAGS_O
+        self.reference_map.associate(self.reference_map_primary_map,
+                                     find_primary_handle, flags=flags)
+        callback(5)
         self.reference_map.associate(self.reference_map_referenced_map,
                                      find_referenced_handle, flags=flags)
         callback(6)
@@ -1077,6 +1326,21 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.env        = None
         self.db_is_open = False
     
+    @catch_db_error
+    def checkpoint(self):
+        """
+        Flush all committed changes to the table files, so that they can be
+        read by a DbBsddbSnapshot opened in another process.
+
+        Returns False if the tables cannot be flushed because the database
+        is closed or a transaction is in progress.
+        """
+        if not self.db_is_open or self.txn is not None:
+            return False
+        if not self.readonly:
+            self.env.txn_checkpoint(0, 0, db.DB_FORCE)
+        return True
+
     @catch_db_error
     def close(self):
         if not self.db_is_open:
@@ -1106,6 +1370,8 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.reference_map_primary_map.close()
         self.reference_map_referenced_map.close()
         self.reference_map.close()
+        if self.reference_count is not None:
+            self.reference_count.close()
         self.secondary_connected = False
 
         # primary databases must be closed after secondary indexes, or
@@ -1123,6 +1389,33 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.env.close()
         self.__close_undodb()
 
+        if not self.readonly and self.reference_count is not None:
+            ref_count_signature = self.__table_signature((REF_MAP,
+                                                          REF_COUNT))
+            if ref_count_signature is not None:
+                _save_signature(os.path.join(self.full_name, REFCOUNTFN),
+                                _REFCOUNT_VERSION, ref_count_signature)
+
+        if not self.readonly and self.pedigree_index.is_built():
+            pedigree_signature = self.__table_signature((PERSON_TBL,
+                                                         FAMILY_TBL))
+            if pedigree_signature is not None:
+                self.pedigree_index.save(
+                    os.path.join(self.full_name, PEDIGREEFN),
+                    pedigree_signature)
+
+        if not self.readonly:
+            sort_keys_signature = self.__table_signature(PRIMARY_TBLS)
+            if sort_keys_signature is not None:
+                self.sort_key_indexes.save(
+                    os.path.join(self.full_name, SORTKEYSFN),
+                    sort_keys_signature)
+            backup_changes_signature = self.__table_signature(PRIMARY_TBLS)
+            if backup_changes_signature is not None:
+                self.backup_changes.save(
+                    os.path.join(self.full_name, BACKUPCHANGESFN),
+                    backup_changes_signature)
+
         self.person_map     = None
         self.family_map     = None
         self.repository_map = None
@@ -1154,6 +1447,7 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         self.reference_map_primary_map = None
         self.reference_map_referenced_map = None
         self.reference_map = None
+        self.reference_count = None
         self.undo_callback = None
         self.redo_callback = None
         self.undo_history_callback = None
@@ -1316,7 +1610,12 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             return
 
         handle = str(handle)
-        if transaction.batch:
+        self.object_cache.evict(handle)
+        if self.bulk_id_maps is not None:
+            self.bulk_id_maps[key].delete(handle)
+            with BSDDBTxn(self.env, data_map) as txn:
+                txn.delete(handle)
+        elif transaction.batch:
             with BSDDBTxn(self.env, data_map) as txn:
                 self.delete_primary_from_reference_map(handle, transaction,
                                                         txn=txn.txn)
@@ -1327,6 +1626,8 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             old_data = data_map.get(handle, txn=self.txn)
             data_map.delete(handle, txn=self.txn)
             transaction.add(key, TXNDEL, handle, old_data, None)
+        if key == FAMILY_KEY:
+            self.pedigree_index.remove_family(handle)
 
     def remove_person(self, handle, transaction):
         """
@@ -1337,9 +1638,14 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         if self.readonly or not handle:
             return
         person = self.get_person_from_handle(handle)
+        self.object_cache.evict(str(handle))
         self.genderStats.uncount_person (person)
         self.remove_from_surname_list(person)
-        if transaction.batch:
+        if self.bulk_id_maps is not None:
+            self.bulk_id_maps[PERSON_KEY].delete(str(handle))
+            with BSDDBTxn(self.env, self.person_map) as txn:
+                txn.delete(str(handle))
+        elif transaction.batch:
             with BSDDBTxn(self.env, self.person_map) as txn:            
                 self.delete_primary_from_reference_map(handle, transaction,
                                                        txn=txn.txn)
@@ -1349,6 +1655,7 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
                                                    txn=self.txn)
             self.person_map.delete(str(handle), txn=self.txn)
             transaction.add(PERSON_KEY, TXNDEL, handle, person.serialize(), None)
+        self.pedigree_index.remove_person(handle)
 
     def remove_source(self, handle, transaction):
         """
@@ -1512,16 +1819,24 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
 
         obj.change = int(change_time or time.time())
         handle = str(obj.handle)
+        self.object_cache.evict(handle)
 
-        self.update_reference_map(obj, transaction, self.txn)
+        if self.bulk_id_maps is None:
+            self.update_reference_map(obj, transaction, self.txn)
 
         new_data = obj.serialize()
+        if self.bulk_id_maps is not None:
+            self.bulk_id_maps[key].put(handle, new_data[1])
         old_data = None
         if not transaction.batch:
             old_data = data_map.get(handle, txn=self.txn)
             op = TXNUPD if old_data else TXNADD
             transaction.add(key, op, handle, old_data, new_data)
         data_map.put(handle, new_data, txn=self.txn)
+        if key == PERSON_KEY:
+            self.pedigree_index.update_person_data(handle, new_data)
+        elif key == FAMILY_KEY:
+            self.pedigree_index.update_family_data(handle, new_data)
         return old_data
         
     def commit_person(self, person, transaction, change_time=None):
@@ -1734,8 +2049,12 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
                           transaction, change_time)
 
     def get_from_handle(self, handle, class_type, data_map):
+        handle = str(handle)
+        newobj = self.object_cache.get(handle, class_type)
+        if newobj is not None:
+            return newobj
         try:
-            data = data_map.get(str(handle), txn=self.txn)
+            data = data_map.get(handle, txn=self.txn)
         except:
             data = None
             # under certain circumstances during a database reload,
@@ -1745,6 +2064,7 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         if data:
             newobj = class_type()
             newobj.unserialize(data)
+            self.object_cache.put(handle, class_type, newobj)
             return newobj
         return None
 
@@ -1756,6 +2076,10 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         Supported transaction parameters:
         no_magic: Boolean, defaults to False, indicating if secondary indices
                   should be disconnected.
+        bulk:     Boolean, defaults to False, indicating if all secondary
+                  indices and the reference map should be left out of date
+                  during a batch transaction and rebuilt when it ends.
+                  Meant for imports which add many objects.
         """
         if self.txn is not None:
             msg = self.transaction.get_description()
@@ -1778,6 +2102,9 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             self.env.txn_checkpoint()
 
             if (self.secondary_connected and
+                    getattr(transaction, 'bulk', False)):
+                self.__begin_bulk_load()
+            elif (self.secondary_connected and
                     not getattr(transaction, 'no_magic', False)):
                 # Disconnect unneeded secondary indices
                 self.surnames.close()
@@ -1819,16 +2146,47 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             self.txn = None
         self.env.log_flush()
         if not transaction.batch:
+            # update the indexes before the views hear of the changes
+            self.__update_sort_key_indexes(transaction)
+            self.__update_backup_changes(transaction)
             emit = self.__emit
             for obj_type, obj_name in KEY_TO_NAME_MAP.iteritems():
                 emit(transaction, obj_type, TXNADD, obj_name, '-add')
                 emit(transaction, obj_type, TXNUPD, obj_name, '-update')
                 emit(transaction, obj_type, TXNDEL, obj_name, '-delete')
+        else:
+            self.sort_key_indexes.clear()
+            self.backup_changes.invalidate()
         self.transaction = None
         transaction.clear()
         self.undodb.commit(transaction, msg)
         self.__after_commit(transaction)
         self.has_changed = True
+        self.change_stamp += 1
+
+    def __update_sort_key_indexes(self, transaction):
+        """
+        Record the objects changed in the transaction in the sort key
+        indexes
+        """
+        changes = {}
+        for obj_type, class_name in KEY_TO_CLASS_MAP.iteritems():
+            changes[class_name] = set(
+                handle for trans_type in (TXNADD, TXNUPD, TXNDEL)
+                if (obj_type, trans_type) in transaction
+                for handle, data in transaction[(obj_type, trans_type)])
+        self.sort_key_indexes.objects_changed(changes)
+
+    def __update_backup_changes(self, transaction):
+        """
+        Record the objects changed in the transaction for the next backup
+        """
+        for obj_type, obj_name in KEY_TO_NAME_MAP.iteritems():
+            for trans_type in (TXNADD, TXNUPD, TXNDEL):
+                if (obj_type, trans_type) in transaction:
+                    self.backup_changes.objects_changed(obj_name,
+                        [handle for handle, data in
+                         transaction[(obj_type, trans_type)]])
 
     def __emit(self, transaction, obj_type, trans_type, obj, suffix):
         """
@@ -1861,6 +2219,14 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
             self.bsddbtxn.abort()
             self.bsddbtxn = None
             self.txn = None
+        # objects read during the transaction may no longer match the tables
+        self.object_cache.clear()
+        self.pedigree_index.clear()
+        self.sort_key_indexes.clear()
+        if transaction.batch:
+            # changes of batch transactions are not undone
+            self.backup_changes.invalidate()
+        self.change_stamp += 1
         if not transaction.batch:
             # It can occur that the listview is already updated because of
             # the "model-treeview automatic update" combined with a
@@ -1885,7 +2251,9 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
         if transaction.batch:
             self.env.txn_checkpoint()
 
-            if not getattr(transaction, 'no_magic', False):
+            if self.bulk_id_maps is not None:
+                self.__end_bulk_load()
+            elif not getattr(transaction, 'no_magic', False):
                 # create new secondary indices to replace the ones removed
 
                 self.surnames = self.__open_db(self.full_name, SURNAMES,
@@ -1915,14 +2283,20 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
 
     def undo(self, update_history=True):
         self.undodb.undo(update_history)
+        self.sort_key_indexes.clear()
+        self.change_stamp += 1
         return
 
     def redo(self, update_history=True):
         self.undodb.redo(update_history)
+        self.sort_key_indexes.clear()
+        self.change_stamp += 1
         return
 
     def gramps_upgrade(self, callback=None):
         UpdateCallback.__init__(self, callback)
+        # the upgrade rewrites the tables outside of transactions
+        self.backup_changes.invalidate()
         
         version = self.metadata.get('version', default=_MINVERSION)
 
@@ -2017,6 +2391,28 @@ class DbBsddb(DbBsddbRead, DbWriteBase, UpdateCallback):
 def _mkname(path, name):
     return os.path.join(path, name + DBEXT)
 
+def _save_signature(fname, version, signature):
+    """
+    Save the version and the table signature of a table kept up to date
+    with other tables.
+    """
+    with open(fname, 'wb') as sig_file:
+        pickle.dump((version, signature), sig_file, pickle.HIGHEST_PROTOCOL)
+
+def _load_signature(fname, version):
+    """
+    Return the table signature saved in fname, or None if there is none or
+    it was saved for another version of the table.
+    """
+    try:
+        with open(fname, 'rb') as sig_file:
+            data = pickle.load(sig_file)
+    except (IOError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(data, tuple) or len(data) != 2 or data[0] != version:
+        return None
+    return data[1]
+
 def clear_lock_file(name):
     try:
         os.unlink(os.path.join(name, DBLOCKFN))
@@ -106,6 +106,9 @@ _F_RAWFN = 4 # name format raw function
 
 PAT_AS_SURN = False
 
+# number of names remembered for each name format
+_MAX_CACHED = 20000
+
 #-------------------------------------------------------------------------
 #
 # Local functions
@@ -289,6 +292,25 @@ def _raw_single_surname(raw_surn_data_list):
         result += "%s " % (raw_surn_data[_SURNAME_IN_LIST])
     return ' '.join(result.split()).strip()
 
+def _raw_name_key(raw_data):
+    """
+    Return the parts of the raw data of a name that the name formats use, as
+    a key of the names already formatted.
+    """
+    return (raw_data[_FIRSTNAME],
+            tuple([tuple(surn) for surn in raw_data[_SURNAME_LIST]]),
+            raw_data[_SUFFIX], raw_data[_TITLE], raw_data[_CALL],
+            raw_data[_NICK], raw_data[_FAMNICK])
+
+def _name_key(name):
+    """
+    Return the parts of a Name that the name formats use, as a key of the
+    names already formatted.
+    """
+    return (name.first_name,
+            tuple([surn.serialize() for surn in name.surname_list]),
+            name.suffix, name.title, name.call, name.nick, name.famnick)
+
 def cleanup_name(namestring):
     """Remove too long white space due to missing name parts, 
        so "a   b" becomes "a b" and "a , b" becomes "a, b"
@@ -339,6 +361,11 @@ class NameDisplay(object):
         global WITH_GRAMP_CONFIG
         global PAT_AS_SURN
         self.name_formats = {}
+        # the names formatted, by name format number
+        self.__cache = {}
+        self.__raw_cache = {}
+        # the raw formats that are quicker than looking the name up
+        self.__quick_raw = (self._raw_lnfn, self._raw_fnln, self._raw_fn)
         
         if WITH_GRAMPS_CONFIG:
             self.default_format = config.get('preferences.name-format')
@@ -361,6 +388,14 @@ class NameDisplay(object):
         """ How to handle single patronymic as surname is changed"""
         global PAT_AS_SURN
         PAT_AS_SURN = config.get('preferences.patronimic-surname')
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Forget the names formatted, as they are formatted differently now.
+        """
+        self.__cache = {}
+        self.__raw_cache = {}
 
     def get_pat_as_surn(self):
         global PAT_AS_SURN
@@ -419,6 +454,7 @@ class NameDisplay(object):
             del self.name_formats[num]
         except:
             pass
+        self.clear_cache()
 
     def set_default_format(self, num):
         if num not in self.name_formats:
@@ -429,6 +465,7 @@ class NameDisplay(object):
             num = Name.LNFN
             
         self.default_format = num
+        self.clear_cache()
         
         self.name_formats[Name.DEF] = (self.name_formats[Name.DEF][_F_NAME],
                                        self.name_formats[Name.DEF][_F_FMT],
@@ -791,7 +828,7 @@ class NameDisplay(object):
         @rtype: str
         """
         num = self._is_format_valid(name.sort_as)
-        return self.name_formats[num][_F_FN](name)
+        return self.__format(num, name)
 
     def truncate(self, full_name, max_length=15, elipsis="..."):
         name_out = ""
@@ -817,7 +854,7 @@ class NameDisplay(object):
         @rtype: str
         """
         num = self._is_format_valid(raw_data[_SORT])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self.__format_raw(num, raw_data)
 
     def display(self, person):
         """
@@ -864,7 +901,7 @@ class NameDisplay(object):
             return ""
 
         num = self._is_format_valid(name.display_as)
-        return self.name_formats[num][_F_FN](name)
+        return self.__format(num, name)
 
     def raw_display_name(self, raw_data):
         """
@@ -877,7 +914,52 @@ class NameDisplay(object):
         @rtype: str
         """
         num = self._is_format_valid(raw_data[_DISPLAY])
-        return self.name_formats[num][_F_RAWFN](raw_data)
+        return self.__format_raw(num, raw_data)
+
+    def __format(self, num, name):
+        """
+        Format the Name name with the name format num, remembering the names
+        formatted.
+        """
+        names = self.__cache.get(num)
+        if names is None:
+            names = self.__cache[num] = {}
+        key = _name_key(name)
+        try:
+            return names[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # some part of the name cannot be a key
+            return self.name_formats[num][_F_FN](name)
+        if len(names) >= _MAX_CACHED:
+            names.clear()
+        text = names[key] = self.name_formats[num][_F_FN](name)
+        return text
+
+    def __format_raw(self, num, raw_data):
+        """
+        Format the raw data of a name with the name format num, remembering
+        the names formatted.
+        """
+        func = self.name_formats[num][_F_RAWFN]
+        if func in self.__quick_raw:
+            return func(raw_data)
+        names = self.__raw_cache.get(num)
+        if names is None:
+            names = self.__raw_cache[num] = {}
+        key = _raw_name_key(raw_data)
+        try:
+            return names[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # some part of the name cannot be a key
+            return func(raw_data)
+        if len(names) >= _MAX_CACHED:
+            names.clear()
+        text = names[key] = func(raw_data)
+        return text
 
     def display_given(self, person):
         return self.format_str(person.get_primary_name(),'%f')
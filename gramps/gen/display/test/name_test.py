@@ -0,0 +1,96 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/display/test/name_test.py
+# $Id$
+
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ...lib import Name, Surname
+from ..name import NameDisplay, _F_FN, _F_RAWFN
+
+def make_name(first_name, surname):
+    name = Name()
+    name.set_first_name(first_name)
+    surn = Surname()
+    surn.set_surname(surname)
+    name.set_surname_list([surn])
+    return name
+
+class NameDisplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.nd = NameDisplay()
+        self.nd.set_default_format(Name.LNFN)
+        self.name = make_name("Jan", "Smith")
+        self.calls = []
+
+    def count_calls(self):
+        """
+        Make the name formats record the names they format.
+        """
+        def counted(func):
+            def format_name(name):
+                self.calls.append(name)
+                return func(name)
+            return format_name
+        for (num, fmt) in self.nd.name_formats.items():
+            fmt = list(fmt)
+            fmt[_F_FN] = counted(fmt[_F_FN])
+            fmt[_F_RAWFN] = counted(fmt[_F_RAWFN])
+            self.nd.name_formats[num] = tuple(fmt)
+
+    def test_cache_hit(self):
+        # the raw names of the standard formats are not remembered, they
+        # are quicker to format again
+        self.nd.set_default_format(self.nd.add_name_format("Name", "%f %l"))
+        text = self.nd.display_name(self.name)
+        raw_text = self.nd.raw_display_name(self.name.serialize())
+        self.assertEqual(text, "Jan Smith")
+        self.assertEqual(raw_text, "Jan Smith")
+        self.count_calls()
+        self.assertEqual(self.nd.display_name(self.name), text)
+        self.assertEqual(self.nd.display_name(make_name("Jan", "Smith")),
+                         text)
+        self.assertEqual(self.nd.raw_display_name(self.name.serialize()),
+                         raw_text)
+        self.assertEqual(self.calls, [])
+        # another name is formatted
+        self.assertEqual(self.nd.display_name(make_name("Ann", "Smith")),
+                         "Ann Smith")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_set_name_format(self):
+        self.assertEqual(self.nd.display_name(self.name), "Smith, Jan")
+        self.nd.set_name_format([(Name.LNFN, "Given", "%f", True)])
+        self.assertEqual(self.nd.display_name(self.name), "Jan")
+
+    def test_set_default_format(self):
+        self.assertEqual(self.nd.display_name(self.name), "Smith, Jan")
+        self.assertEqual(self.nd.raw_display_name(self.name.serialize()),
+                         "Smith, Jan")
+        self.nd.set_default_format(Name.FNLN)
+        self.assertEqual(self.nd.display_name(self.name), "Jan Smith")
+        self.assertEqual(self.nd.raw_display_name(self.name.serialize()),
+                         "Jan Smith")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,7 @@
 Package providing filtering framework for GRAMPS.
 """
 from __future__ import with_statement
+from itertools import izip
 
 #------------------------------------------------------------------------
 #
@@ -42,6 +43,21 @@ from ..lib.repo import Repository
 from ..lib.mediaobj import MediaObject
 from ..lib.note import Note
 from ..lib.tag import Tag
+from _parallel import check_parallel
+
+def uses_raw(rule):
+    """
+    Return True if rule can be applied to the raw data of an object: it has
+    an apply_raw, and no subclass of the class defining it replaces apply.
+    """
+    if rule.apply_raw is None:
+        return False
+    for cls in type(rule).__mro__:
+        if 'apply_raw' in cls.__dict__:
+            return True
+        if 'apply' in cls.__dict__:
+            return False
+    return False
 
 #-------------------------------------------------------------------------
 #
@@ -52,6 +68,7 @@ class GenericFilter(object):
     """Filter class that consists of several rules."""
     
     logical_functions = ['or', 'and', 'xor', 'one']
+    namespace = 'Person'
 
     def __init__(self, source=None):
         if source:
@@ -156,9 +173,105 @@ class GenericFilter(object):
                     final_list.append(data)
         return final_list
 
+    def split_raw_rules(self):
+        """
+        Split the rules in the rules that can be applied to the raw data of
+        an object, and the rules that need the object itself.
+        """
+        raw_rules = [rule for rule in self.flist if uses_raw(rule)]
+        obj_rules = [rule for rule in self.flist if not uses_raw(rule)]
+        return raw_rules, obj_rules
+
+    def iter_raw_data(self, db, id_list, tupleind=None):
+        """
+        Return an iterator over (item, data) pairs for the items of id_list,
+        with data the raw data of the object, or None if the database does
+        not provide bulk access to raw data.
+        """
+        if tupleind is None:
+            handles = id_list
+        else:
+            handles = [item[tupleind] for item in id_list]
+        try:
+            raw_list = db.get_raw_data_many(self.namespace, handles)
+        except NotImplementedError:
+            return None
+        return izip(id_list, raw_list)
+
+    def check_raw(self, db, id_list, raw_test, cb_progress=None,
+                  tupleind=None):
+        """
+        Run the filter on the raw data of the objects. raw_test is called
+        with the raw data and returns True or False, building the object
+        only if the rules that need it have to be evaluated.
+
+        Return None if the raw data of id_list is not available, in which
+        case the caller should use the object based evaluation.
+        """
+        final_list = []
+
+        if id_list is None:
+            with self.get_cursor(db) as cursor:
+                for handle, data in cursor:
+                    if cb_progress:
+                        cb_progress()
+                    if raw_test(db, data) != self.invert:
+                        final_list.append(handle)
+        else:
+            raw_iter = self.iter_raw_data(db, id_list, tupleind)
+            if raw_iter is None:
+                return None
+            for item, data in raw_iter:
+                if cb_progress:
+                    cb_progress()
+                # a missing object matches all rules, as in check_and
+                val = raw_test(db, data) if data is not None else True
+                if val != self.invert:
+                    final_list.append(item)
+        return final_list
+
+    def make_raw_test(self, raw_rules, obj_rules, logical_op):
+        """
+        Return a function that applies the 'and' or 'or' combination of the
+        rules to the raw data of an object. The cheap raw rules are run
+        first, and the object is built only when the obj_rules are needed
+        to decide.
+        """
+        make_obj = self.make_obj
+        if logical_op == 'and':
+            def raw_test(db, data):
+                for rule in raw_rules:
+                    if not rule.apply_raw(db, data):
+                        return False
+                if not obj_rules:
+                    return True
+                obj = make_obj()
+                obj.unserialize(data)
+                return all(rule.apply(db, obj) for rule in obj_rules)
+        else:
+            def raw_test(db, data):
+                for rule in raw_rules:
+                    if rule.apply_raw(db, data):
+                        return True
+                if not obj_rules:
+                    return False
+                obj = make_obj()
+                obj.unserialize(data)
+                return any(rule.apply(db, obj) for rule in obj_rules)
+        return raw_test
+
     def check_and(self, db, id_list, cb_progress=None, tupleind=None):
         final_list = []
-        flist = self.flist
+        raw_rules, flist = self.split_raw_rules()
+
+        if raw_rules:
+            raw_test = self.make_raw_test(raw_rules, flist, 'and')
+            final_list = self.check_raw(db, id_list, raw_test, cb_progress,
+                                        tupleind)
+            if final_list is not None:
+                return final_list
+            final_list = []
+            flist = self.flist
 
         if id_list is None:
             with self.get_cursor(db) as cursor:
@@ -185,6 +298,13 @@ class GenericFilter(object):
         return final_list
 
     def check_or(self, db, id_list, cb_progress=None, tupleind=None):
+        raw_rules, obj_rules = self.split_raw_rules()
+        if raw_rules:
+            raw_test = self.make_raw_test(raw_rules, obj_rules, 'or')
+            final_list = self.check_raw(db, id_list, raw_test, cb_progress,
+                                        tupleind)
+            if final_list is not None:
+                return final_list
         return self.check_func(db, id_list, self.or_test, cb_progress,
                                 tupleind)
 
@@ -237,6 +357,9 @@ class GenericFilter(object):
         If tupleind is given, id_list is supposed to consist of a list of 
         tuples, with the handle being index tupleind. So 
         handle_0 = id_list[0][tupleind]
+
+        Long lists are checked in helper processes if the
+        behavior.filter-processes preference is set, see check_parallel.
         
         :Returns: if id_list given, it is returned with the items that 
                 do not match the filter, filtered out.
@@ -246,13 +369,17 @@ class GenericFilter(object):
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db)
-        res = m(db, id_list, cb_progress, tupleind)
+        res = check_parallel(self, db, id_list, cb_progress, tupleind)
+        if res is None:
+            res = m(db, id_list, cb_progress, tupleind)
         for rule in self.flist:
             rule.requestreset()
         return res
 
 class GenericFamilyFilter(GenericFilter):
 
+    namespace = 'Family'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -267,6 +394,8 @@ class GenericFamilyFilter(GenericFilter):
 
 class GenericEventFilter(GenericFilter):
 
+    namespace = 'Event'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -281,6 +410,8 @@ class GenericEventFilter(GenericFilter):
    
 class GenericSourceFilter(GenericFilter):
 
+    namespace = 'Source'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -295,6 +426,8 @@ class GenericSourceFilter(GenericFilter):
 
 class GenericCitationFilter(GenericFilter):
 
+    namespace = 'Citation'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -309,6 +442,8 @@ class GenericCitationFilter(GenericFilter):
 
 class GenericPlaceFilter(GenericFilter):
 
+    namespace = 'Place'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -323,6 +458,8 @@ class GenericPlaceFilter(GenericFilter):
 
 class GenericMediaFilter(GenericFilter):
 
+    namespace = 'Media'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -337,6 +474,8 @@ class GenericMediaFilter(GenericFilter):
 
 class GenericRepoFilter(GenericFilter):
 
+    namespace = 'Repository'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
@@ -351,6 +490,8 @@ class GenericRepoFilter(GenericFilter):
 
 class GenericNoteFilter(GenericFilter):
 
+    namespace = 'Note'
+
     def __init__(self, source=None):
         GenericFilter.__init__(self, source)
 
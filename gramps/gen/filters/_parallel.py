@@ -0,0 +1,143 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Evaluate a filter in a pool of helper processes.
+
+The rules of the filter are prepared in the main process. The helper
+processes are forked after that, so they inherit the prepared rules, and
+each of them opens the family tree read-only with DbBsddbSnapshot. The
+handles are split in chunks, and the results of the chunks are merged in
+the original order.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+#-------------------------------------------------------------------------
+from itertools import izip
+import multiprocessing
+
+#-------------------------------------------------------------------------
+#
+# enable logging for error handling
+#
+#-------------------------------------------------------------------------
+import logging
+LOG = logging.getLogger(".filter")
+
+#-------------------------------------------------------------------------
+#
+# GRAMPS modules
+#
+#-------------------------------------------------------------------------
+from ..config import config
+from ..constfunc import win
+from ..db import DbReadBase, DbBsddb, DbBsddbSnapshot
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+CHUNK_SIZE = 1000   # Number of handles checked by a helper in one go
+MIN_ROWS = 5000     # Smaller lists are not worth starting helpers for
+
+# Filter and database of a helper process, set by _init_worker
+_FILTER = None
+_DB = None
+
+def _init_worker(path, filt):
+    global _FILTER, _DB
+    _FILTER = filt
+    _DB = DbBsddbSnapshot()
+    _DB.load(path)
+
+def _check_chunk(args):
+    chunk, tupleind = args
+    return _FILTER.get_check_func()(_DB, chunk, None, tupleind)
+
+def rules_parallel_safe(flist):
+    """
+    Return True if all prepared rules in flist, and the rules of the filters
+    they refer to, can be evaluated in a helper process.
+
+    Rules which hold on to the database of the main process cannot.
+    """
+    for rule in flist:
+        if not rule.parallel_safe:
+            return False
+        for value in rule.__dict__.itervalues():
+            if isinstance(value, DbReadBase):
+                return False
+        if hasattr(rule, 'find_filter'):
+            filt = rule.find_filter()
+            if filt is not None and not rules_parallel_safe(filt.flist):
+                return False
+    return True
+
+def check_parallel(filt, db, id_list, cb_progress=None, tupleind=None):
+    """
+    Apply the prepared filter filt in a pool of helper processes.
+
+    The number of processes is set by the behavior.filter-processes
+    preference. Returns None if the filter must be applied in this process:
+    if parallel evaluation is switched off, db is not a BSDDB family tree,
+    the tree cannot be flushed to disk, id_list is not a long enough list,
+    or one of the rules cannot be evaluated in a helper process.
+    """
+    processes = config.get('behavior.filter-processes')
+    if processes < 2 or win() or not isinstance(db, DbBsddb):
+        return None
+    if not rules_parallel_safe(filt.flist):
+        return None
+
+    if id_list is None:
+        id_list = db.get_table_metadata(filt.namespace)["handles_func"]()
+        tupleind = None
+    elif not isinstance(id_list, (list, tuple)):
+        return None
+    if len(id_list) < MIN_ROWS:
+        return None
+    if not db.checkpoint():
+        return None
+
+    chunks = [(id_list[index:index + CHUNK_SIZE], tupleind)
+              for index in xrange(0, len(id_list), CHUNK_SIZE)]
+    LOG.debug("checking %d rows in %d chunks with %d processes" %
+              (len(id_list), len(chunks), processes))
+
+    final_list = []
+    pool = multiprocessing.Pool(processes, _init_worker,
+                                (db.get_save_path(), filt))
+    try:
+        for args, result in izip(chunks, pool.imap(_check_chunk, chunks)):
+            if cb_progress:
+                for dummy in xrange(len(args[0])):
+                    cb_progress()
+            final_list.extend(result)
+    except:
+        pool.terminate()
+        pool.join()
+        raise
+    pool.close()
+    pool.join()
+    return final_list
@@ -54,3 +54,7 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def apply_raw(self, db, data):
+        # the gramps_id is at index 1 for all primary objects
+        return data[1] == self.list[0]
@@ -44,6 +44,7 @@ class HasReferenceCountBase(Rule):
     name        = 'Objects with a reference count of <count>'
     description = "Matches objects with a certain reference count"
     category    = _('General filters')
+    parallel_safe = False
 
 
     def prepare(self, db):
@@ -59,10 +60,7 @@ class HasReferenceCountBase(Rule):
 
 
     def apply(self, db, obj):
-        handle = obj.get_handle()
-        count = 0
-        for item in db.find_backlink_handles(handle):
-            count += 1
+        count = db.get_backlink_count(obj.get_handle())
 
         if self.count_type == 0:     # "lesser than"
             return count < self.userSelectedCount
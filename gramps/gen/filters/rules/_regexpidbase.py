@@ -61,3 +61,7 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match.match(obj.gramps_id) is not None
+
+    def apply_raw(self, db, data):
+        # the gramps_id is at index 1 for all primary objects
+        return self.match.match(data[1]) is not None
@@ -54,6 +54,16 @@ class Rule(object):
     category    = _('Miscellaneous filters')
     description = _('No description')
 
+    # Rules that can be decided from the raw (serialized) data of an object
+    # set this to a method apply_raw(db, data). The filter then runs them
+    # before the object is built, and builds it only if needed.
+    apply_raw = None
+
+    # Rules that cannot be evaluated in a helper process on a read-only
+    # copy of the database (for instance because they need the reference
+    # map) set this to False.
+    parallel_safe = True
+
     def __init__(self, arg, use_regex=False):
         self.list = []
         self.regex = []
@@ -56,6 +56,7 @@ class MatchesPersonFilter(MatchesFilterBase):
     
     # we want to have this filter show person filters
     namespace   = 'Person'
+    parallel_safe = False
     
     def prepare(self, db):
         MatchesFilterBase.prepare(self, db)
@@ -50,3 +50,5 @@ class ChildHasIdOf(HasGrampsId):
     category    = _('Child filters')
     base_class = HasGrampsId
     apply = child_base
+    # HasGrampsId.apply_raw tests the id of the family itself
+    apply_raw = None
@@ -50,3 +50,5 @@ class FatherHasIdOf(HasGrampsId):
     category    = _('Father filters')
     base_class = HasGrampsId
     apply = father_base
+    # HasGrampsId.apply_raw tests the id of the family itself
+    apply_raw = None
@@ -27,6 +27,8 @@ Any rule that matches family based on personal rule applied
 to father, mother, or any child, just needs to do two things:
 > Set the class attribute 'base_class' to the personal rule
 > Set apply method to be an appropriate wrapper below
+If the personal rule has an apply_raw method, it tests the data of the
+family, so it must also be set to None.
 Example:
 in the class body, outside any method:
 >    base_class = SearchName
@@ -50,3 +50,5 @@ class MotherHasIdOf(HasGrampsId):
     category    = _('Mother filters')
     base_class = HasGrampsId
     apply = mother_base
+    # HasGrampsId.apply_raw tests the id of the family itself
+    apply_raw = None
@@ -51,3 +51,6 @@ class Everyone(Rule):
 
     def apply(self,db,person):
         return True
+
+    def apply_raw(self, db, data):
+        return True
@@ -48,3 +48,8 @@ class HasTag(HasTagBase):
     labels      = [ _('Tag:') ]
     name        = _('People with the <tag>')
     description = _("Matches people with the particular tag")
+
+    def apply_raw(self, db, data):
+        if self.tag_handle is None:
+            return False
+        return self.tag_handle in data[18]
@@ -49,3 +49,6 @@ class HasUnknownGender(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.UNKNOWN
+
+    def apply_raw(self, db, data):
+        return data[2] == Person.UNKNOWN
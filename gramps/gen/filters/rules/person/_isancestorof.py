@@ -33,6 +33,7 @@ from ....ggettext import gettext as _
 #
 #-------------------------------------------------------------------------
 from .. import Rule
+from ....db import get_pedigree
 
 #-------------------------------------------------------------------------
 #
@@ -49,7 +50,6 @@ class IsAncestorOf(Rule):
 
     def prepare(self, db):
         """Assume that if 'Inclusive' not defined, assume inclusive"""
-        self.db = db
         self.map = set()
         try:
             first = 0 if int(self.list[1]) else 1
@@ -57,7 +57,7 @@ class IsAncestorOf(Rule):
             first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db,root_person,first)
+            self.init_ancestor_list(db, [root_person.handle], first)
         except:
             pass
 
@@ -67,19 +67,6 @@ class IsAncestorOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
-    def init_ancestor_list(self, db, person,first):
-        if not person:
-            return
-        if not first:
-            self.map.add(person.handle)
-        
-        fam_id = person.get_main_parents_family_handle()
-        fam = db.get_family_from_handle(fam_id)
-        if fam:
-            f_id = fam.get_father_handle()
-            m_id = fam.get_mother_handle()
-        
-            if f_id:
-                self.init_ancestor_list(db,db.get_person_from_handle(f_id),0)
-            if m_id:
-                self.init_ancestor_list(db,db.get_person_from_handle(m_id),0)
+    def init_ancestor_list(self, db, handles, first):
+        self.map.update(get_pedigree(db).find_ancestors(handles,
+                                                        min_gen=first))
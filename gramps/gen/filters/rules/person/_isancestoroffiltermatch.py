@@ -55,7 +55,6 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
         IsAncestorOf.__init__(self,list)
     
     def prepare(self,db):
-        self.db = db
         self.map = set()
         try:
             if int(self.list[1]):
@@ -67,10 +66,10 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
             
         filt = MatchesFilter(self.list[0:1])
         filt.requestprepare(db)
-        for person in db.iter_people():
-            if filt.apply(db, person):
-                self.init_ancestor_list(db, person, first)
+        handles = [person.handle for person in db.iter_people()
+                   if filt.apply(db, person)]
         filt.requestreset()
+        self.init_ancestor_list(db, handles, first)
 
     def reset(self):
         self.map.clear()
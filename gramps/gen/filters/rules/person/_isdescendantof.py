@@ -33,6 +33,7 @@ from ....ggettext import gettext as _
 #
 #-------------------------------------------------------------------------
 from .. import Rule
+from ....db import get_pedigree
 
 #-------------------------------------------------------------------------
 #
@@ -49,7 +50,6 @@ class IsDescendantOf(Rule):
     description = _('Matches all descendants for the specified person')
 
     def prepare(self, db):
-        self.db = db
         self.map = set()
         try:
             first = False if int(self.list[1]) else True
@@ -57,7 +57,7 @@ class IsDescendantOf(Rule):
             first = True
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person,first)
+            self.init_list(db, [root_person.handle], first)
         except:
             pass
 
@@ -67,15 +67,6 @@ class IsDescendantOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
-    def init_list(self, person, first):
-        if not person:
-            return
-        if not first:
-            self.map.add(person.handle)
-        
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(
-                        self.db.get_person_from_handle(child_ref.ref), 0)
+    def init_list(self, db, handles, first):
+        self.map.update(get_pedigree(db).find_descendants(handles,
+                                                          min_gen=int(first)))
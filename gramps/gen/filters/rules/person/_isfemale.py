@@ -49,3 +49,6 @@ class IsFemale(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.FEMALE
+
+    def apply_raw(self, db, data):
+        return data[2] == Person.FEMALE
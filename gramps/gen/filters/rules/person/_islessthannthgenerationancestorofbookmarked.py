@@ -38,6 +38,7 @@ except:
 #
 #-------------------------------------------------------------------------
 from .. import Rule
+from ....db import get_pedigree
 
 #-------------------------------------------------------------------------
 #
@@ -57,7 +58,6 @@ class IsLessThanNthGenerationAncestorOfBookmarked(Rule):
                     "not more than N generations away")
 
     def prepare(self, db):
-        self.db = db
         bookmarks = db.get_bookmarks().get()
         self.map = set()
         if len(bookmarks) == 0:
@@ -65,31 +65,8 @@ class IsLessThanNthGenerationAncestorOfBookmarked(Rule):
         else:
             self.bookmarks = set(bookmarks)
             self.apply = self.apply_real
-            for self.bookmarkhandle in self.bookmarks:
-                self.init_ancestor_list(self.bookmarkhandle, 1)
-
-
-    def init_ancestor_list(self, handle, gen):
-#        if p.get_handle() in self.map:
-#            loop_error(self.orig,p)
-        if not handle:
-            return
-        if gen:
-            self.map.add(handle)
-            if gen >= int(self.list[0]):
-                return
-        
-        p = self.db.get_person_from_handle(handle)
-        fam_id = p.get_main_parents_family_handle()
-        fam = self.db.get_family_from_handle(fam_id)
-        if fam:
-            f_id = fam.get_father_handle()
-            m_id = fam.get_mother_handle()
-        
-            if f_id:
-                self.init_ancestor_list(f_id, gen+1)
-            if m_id:
-                self.init_ancestor_list(m_id, gen+1)
+            self.map = get_pedigree(db).find_ancestors(
+                self.bookmarks, min_gen=1, max_gen=int(self.list[0]))
 
     def apply_real(self, db, person):
         return person.handle in self.map
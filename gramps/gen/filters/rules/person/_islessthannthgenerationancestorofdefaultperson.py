@@ -33,6 +33,7 @@ from ....ggettext import gettext as _
 #
 #-------------------------------------------------------------------------
 from .. import Rule
+from ....db import get_pedigree
 
 #-------------------------------------------------------------------------
 #
@@ -52,38 +53,16 @@ class IsLessThanNthGenerationAncestorOfDefaultPerson(Rule):
                     "not more than N generations away")
 
     def prepare(self,db):
-        self.db = db
         self.map = set()
         p = db.get_default_person()
         if p:
             self.def_handle = p.get_handle()
             self.apply = self.apply_real
-            self.init_ancestor_list(self.def_handle, 1)
+            self.map = get_pedigree(db).find_ancestors(
+                [self.def_handle], min_gen=1, max_gen=int(self.list[0]))
         else:
             self.apply = lambda db,p: False
 
-    def init_ancestor_list(self, handle, gen):
-#        if p.get_handle() in self.map:
-#            loop_error(self.orig,p)
-        if not handle:
-            return
-        if gen:
-            self.map.add(handle)
-            if gen >= int(self.list[0]):
-                return
-        
-        p = self.db.get_person_from_handle(handle)
-        fam_id = p.get_main_parents_family_handle()
-        fam = self.db.get_family_from_handle(fam_id)
-        if fam:
-            f_id = fam.get_father_handle()
-            m_id = fam.get_mother_handle()
-        
-            if f_id:
-                self.init_ancestor_list(f_id, gen+1)
-            if m_id:
-                self.init_ancestor_list(m_id, gen+1)
-
     def apply_real(self,db,person):
         return person.handle in self.map
 
@@ -49,3 +49,6 @@ class IsMale(Rule):
 
     def apply(self,db,person):
         return person.gender == Person.MALE
+
+    def apply_raw(self, db, data):
+        return data[2] == Person.MALE
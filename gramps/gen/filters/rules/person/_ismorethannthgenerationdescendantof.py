@@ -33,6 +33,7 @@ from ....ggettext import gettext as _
 #
 #-------------------------------------------------------------------------
 from .. import Rule
+from ....db import get_pedigree
 
 #-------------------------------------------------------------------------
 #
@@ -51,11 +52,11 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
     
     
     def prepare(self ,db):
-        self.db = db
         self.map = set()
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, 0)
+            self.map = get_pedigree(db).find_descendants(
+                [root_person.handle], min_gen=int(self.list[1]))
         except:
             pass
 
@@ -64,16 +65,3 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
 
     def apply(self,db,person):
         return person.handle in self.map
-
-    def init_list(self, person, gen):
-        if not person:
-            return
-        if gen >= int(self.list[1]):
-            self.map.add(person.handle)
-
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(
-                        self.db.get_person_from_handle(child_ref.ref), gen+1)
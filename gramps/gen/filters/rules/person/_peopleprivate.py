@@ -43,3 +43,6 @@ class PeoplePrivate(IsPrivate):
     name        = _('People marked private')
     description = _("Matches people that are indicated as private")
     category    = _('General filters')
+
+    def apply_raw(self, db, data):
+        return bool(data[19])
@@ -44,3 +44,6 @@ class PeoplePublic(IsPublic):
     name        = _('People not marked private')
     description = _("Matches people that are not indicated as private")
     category    = _('General filters')
+
+    def apply_raw(self, db, data):
+        return not data[19]
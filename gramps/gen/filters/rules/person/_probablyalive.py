@@ -32,7 +32,7 @@ from ....ggettext import gettext as _
 # GRAMPS modules
 #
 #-------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import probably_alive, get_alive_estimator
 from .. import Rule
 from ....datehandler import parser
 
@@ -52,6 +52,16 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(unicode(self.list[0]))
         except:
             self.current_date = None
+        try:
+            self.estimator = get_alive_estimator(db)
+        except NotImplementedError:
+            self.estimator = None
+
+    def reset(self):
+        self.estimator = None
 
     def apply(self,db,person):
+        if self.estimator is not None:
+            return self.estimator.probably_alive(person.handle,
+                                                 self.current_date)
         return probably_alive(person,db,self.current_date)
@@ -54,6 +54,7 @@ class MatchesEventFilter(MatchesFilterBase):
     category    = _('General filters')
     # we want to have this filter show event filters
     namespace   = 'Event'
+    parallel_safe = False
 
 
     def apply(self,db,event):
@@ -0,0 +1,94 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/filters/test/genericfilter_test.py
+# $Id$
+
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ...lib import Person, Family
+from .._genericfilter import GenericFamilyFilter, uses_raw
+from ..rules.family import HasIdOf, FatherHasIdOf
+
+class Cursor(object):
+    def __init__(self, rows):
+        self.rows = rows
+    def __enter__(self):
+        return iter(self.rows)
+    def __exit__(self, *args):
+        return False
+
+class Database(object):
+    """
+    Family F0001 of father I0001, and family F0002 without a father.
+    """
+    def __init__(self):
+        self.people = {}
+        self.families = {}
+        person = Person()
+        person.set_handle('P1')
+        person.set_gramps_id('I0001')
+        self.people['P1'] = person
+        family = Family()
+        family.set_handle('F1')
+        family.set_gramps_id('F0001')
+        family.set_father_handle('P1')
+        self.families['F1'] = family
+        family = Family()
+        family.set_handle('F2')
+        family.set_gramps_id('F0002')
+        self.families['F2'] = family
+    def get_person_from_handle(self, handle):
+        return self.people.get(handle)
+    def get_family_from_handle(self, handle):
+        return self.families.get(handle)
+    def get_family_cursor(self):
+        return Cursor(sorted((handle, family.serialize())
+                             for (handle, family)
+                             in self.families.iteritems()))
+    def get_raw_data_many(self, namespace, handles):
+        return [self.families[handle].serialize() for handle in handles]
+
+class GenericFilterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = Database()
+
+    def run_filter(self, rule, id_list=None):
+        filt = GenericFamilyFilter()
+        filt.add_rule(rule)
+        return filt.apply(self.db, id_list)
+
+    def test_raw_rule(self):
+        rule = HasIdOf(['F0002'])
+        self.assertTrue(uses_raw(rule))
+        self.assertEqual(self.run_filter(rule), ['F2'])
+        self.assertEqual(self.run_filter(rule, ['F1', 'F2']), ['F2'])
+
+    def test_member_rule(self):
+        # the rule tests the id of the father, not that of the family
+        rule = FatherHasIdOf(['I0001'])
+        self.assertFalse(uses_raw(rule))
+        self.assertEqual(self.run_filter(rule), ['F1'])
+        self.assertEqual(self.run_filter(FatherHasIdOf(['F0001'])), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,6 +38,7 @@ importers, exporters, quick reports, and document generators.
 import os
 import sys
 import re
+import time
 from ..ggettext import gettext as _
 
 #-------------------------------------------------------------------------
@@ -46,6 +47,7 @@ from ..ggettext import gettext as _
 #
 #-------------------------------------------------------------------------
 from ..config import config
+from ..const import PLUGIN_CACHE
 from . import PluginRegister, ImportPlugin, ExportPlugin, DocGenPlugin
 
 #-------------------------------------------------------------------------
@@ -94,6 +96,17 @@ class BasePluginManager(object):
         self.__pgr = PluginRegister.get_instance()
         self.__registereddir_set = set()
         self.__loaded_plugins = {}
+        self.__cache_loaded = False
+        self.__scan_times = []
+
+    def get_scan_times(self):
+        """
+        Return a list of (directory, seconds, files read, files cached)
+        tuples, one for each call of reg_plugins: the time taken to register
+        the plugins of the directory, and how many registration files were
+        run and how many were taken from the cache.
+        """
+        return self.__scan_times
 
     def reg_plugins(self, direct, dbstate=None, uistate=None, 
                     load_on_reg=False):
@@ -108,6 +121,12 @@ class BasePluginManager(object):
         if not os.path.isdir(direct):
             return False # return value is True for error
         
+        start = time.time()
+        if not self.__cache_loaded:
+            self.__pgr.load_cache(PLUGIN_CACHE)
+            self.__cache_loaded = True
+        files_read = self.__pgr.files_read
+        files_cached = self.__pgr.files_cached
         for (dirpath, dirnames, filenames) in os.walk(direct):
             root, subdir = os.path.split(dirpath)
             if subdir.startswith("."): 
@@ -121,6 +140,10 @@ class BasePluginManager(object):
             # registereddir_list list for use on reloading.
             self.__registereddir_set.add(dirpath)
             self.__pgr.scan_dir(dirpath)
+        self.__pgr.save_cache(PLUGIN_CACHE)
+        self.__scan_times.append((direct, time.time() - start,
+                                  self.__pgr.files_read - files_read,
+                                  self.__pgr.files_cached - files_cached))
 
         if load_on_reg:
             # Run plugins that request to be loaded on startup and
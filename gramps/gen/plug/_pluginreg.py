@@ -30,10 +30,12 @@ and a register for the data of all plugins .
 # Standard Python modules
 #
 #-------------------------------------------------------------------------
+from __future__ import with_statement
 import os
 import sys
 import re
 import traceback
+import cPickle as pickle
 
 #-------------------------------------------------------------------------
 #
@@ -1032,6 +1034,36 @@ def make_environment(**kwargs):
     env.update(kwargs)
     return env
 
+#-------------------------------------------------------------------------
+#
+# Cache of the registrations
+#
+#-------------------------------------------------------------------------
+_CACHE_VERSION = 1
+
+# registration files that import modules are always run
+_IMPORT_RE = re.compile(r"^\s*(import|from)\s", re.M)
+
+def _cache_signature():
+    """
+    Return what the cached registrations depend on besides the registration
+    files: the version of Gramps and the language they were translated to.
+    """
+    return (_CACHE_VERSION, GRAMPSVERSION,
+            tuple(os.environ.get(name)
+                  for name in ('LANGUAGE', 'LC_ALL', 'LC_MESSAGES', 'LANG')))
+
+def _file_stamp(filename):
+    """
+    Return the modification time and size of the file filename, or None if
+    it cannot be read.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime, stat.st_size)
+
 #-------------------------------------------------------------------------
 #
 # PluginRegister
@@ -1061,9 +1093,69 @@ class PluginRegister(object):
         if __debug__:
             self.stable_only = False
         self.__plugindata  = []
+        # the pickled registrations of the registration files, by path
+        self.__cache = {}
+        self.__cache_changed = False
+        self.files_read = 0
+        self.files_cached = 0
 
     def add_plugindata(self, plugindata):
         self.__plugindata.append(plugindata)
+
+    def load_cache(self, filename):
+        """
+        Load the registrations saved to filename by save_cache, if they were
+        saved by this version of Gramps in the same language. Return True if
+        they were loaded.
+        """
+        self.__cache = {}
+        self.__cache_changed = False
+        try:
+            with open(filename, 'rb') as cache_file:
+                data = pickle.load(cache_file)
+        except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+            return False
+        if (not isinstance(data, tuple) or len(data) != 2 or
+                data[0] != _cache_signature()):
+            return False
+        self.__cache = data[1]
+        return True
+
+    def save_cache(self, filename):
+        """
+        Save the registrations of the registration files read since
+        load_cache to filename, if there are new ones.
+        """
+        if (not self.__cache_changed or
+                not os.path.isdir(os.path.dirname(filename))):
+            return
+        for path in self.__cache.keys():
+            if not os.path.isfile(path):
+                del self.__cache[path]
+        try:
+            with open(filename, 'wb') as cache_file:
+                pickle.dump((_cache_signature(), self.__cache), cache_file,
+                            pickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError), msg:
+            print _('ERROR: Could not save the plugin registrations to '
+                    '%(filename)s: %(msg)s') % {'filename': filename,
+                                                'msg': msg}
+        self.__cache_changed = False
+
+    def __read_cached(self, full_filename, stamp):
+        """
+        Add the cached registrations of the registration file full_filename,
+        if it did not change since. Return True if they were added.
+        """
+        cached = self.__cache.get(full_filename)
+        if cached is None or cached[0] != stamp:
+            return False
+        try:
+            plugindata = pickle.loads(cached[1])
+        except Exception:
+            return False
+        self.__plugindata.extend(plugindata)
+        return True
         
     def scan_dir(self, dir):
         """
@@ -1086,22 +1178,12 @@ class PluginRegister(object):
                 continue
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(dir, filename)
-            local_gettext = get_addon_translator(full_filename).gettext
-            try:
-                #execfile(full_filename,
-                execfile(full_filename.encode(sys.getfilesystemencoding()),
-                         make_environment(_=local_gettext),
-                         {})
-            except ValueError, msg:
-                print _('ERROR: Failed reading plugin registration %(filename)s') % \
-                            {'filename' : filename}
-                print msg
-                self.__plugindata = self.__plugindata[:lenpd]
-            except:
-                print _('ERROR: Failed reading plugin registration %(filename)s') % \
-                            {'filename' : filename}
-                print "".join(traceback.format_exception(*sys.exc_info()))
-                self.__plugindata = self.__plugindata[:lenpd]
+            stamp = _file_stamp(full_filename)
+            if self.__read_cached(full_filename, stamp):
+                self.files_cached += 1
+            else:
+                self.files_read += 1
+                self.__read_registration(full_filename, filename, stamp)
             #check if: 
             #  1. plugin exists, if not remove, otherwise set module name
             #  2. plugin not stable, if stable_only=True, remove
@@ -1154,6 +1236,44 @@ class PluginRegister(object):
             for ind in rmlist:
                 del self.__plugindata[ind]
 
+    def __read_registration(self, full_filename, filename, stamp):
+        """
+        Run the registration file full_filename, and cache the registrations
+        unless the file imports modules, as what it registers may then
+        depend on what is installed.
+        """
+        lenpd = len(self.__plugindata)
+        local_gettext = get_addon_translator(full_filename).gettext
+        try:
+            with open(full_filename.encode(sys.getfilesystemencoding()),
+                      'rU') as gpr_file:
+                source = gpr_file.read()
+            code = compile(source,
+                           full_filename.encode(sys.getfilesystemencoding()),
+                           'exec')
+            exec code in make_environment(_=local_gettext), {}
+        except ValueError, msg:
+            print _('ERROR: Failed reading plugin registration %(filename)s') % \
+                        {'filename' : filename}
+            print msg
+            self.__plugindata = self.__plugindata[:lenpd]
+            return
+        except:
+            print _('ERROR: Failed reading plugin registration %(filename)s') % \
+                        {'filename' : filename}
+            print "".join(traceback.format_exception(*sys.exc_info()))
+            self.__plugindata = self.__plugindata[:lenpd]
+            return
+        if stamp is None or _IMPORT_RE.search(source):
+            return
+        try:
+            cached = pickle.dumps(self.__plugindata[lenpd:],
+                                  pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError):
+            return
+        self.__cache[full_filename] = (stamp, cached)
+        self.__cache_changed = True
+
     def get_plugin(self, id):
         """Return the PluginData for the plugin with id"""
         matches = [x for x in self.__plugindata if x.id == id]
@@ -38,7 +38,7 @@ from itertools import ifilter
 #-------------------------------------------------------------------------
 from proxybase import ProxyDbBase
 from ..lib import Date, Person, Name, Surname, NameOriginType
-from ..utils.alive import probably_alive
+from ..utils.alive import probably_alive, get_alive_estimator
 from ..config import config
 
 #-------------------------------------------------------------------------
@@ -84,6 +84,7 @@ class LivingProxyDb(ProxyDbBase):
         else:
             self.current_date = None
         self.years_after_death = years_after_death
+        self.use_estimator = True
 
     def get_person_from_handle(self, handle):
         """
@@ -205,6 +206,15 @@ class LivingProxyDb(ProxyDbBase):
         Returns False if the person is not considered living.
         """
         person_handle = person.get_handle()
+        if self.use_estimator:
+            try:
+                estimator = get_alive_estimator(self.db)
+            except NotImplementedError:
+                self.use_estimator = False
+            else:
+                return estimator.probably_alive(person_handle,
+                                                self.current_date,
+                                                self.years_after_death)
         unfil_person = self.get_unfiltered_person(person_handle)
         return probably_alive( unfil_person,
                                self.db,
@@ -558,6 +558,53 @@ class ProxyDbBase(DbReadBase):
         return self.gfilter(self.include_tag,
                             self.db.get_tag_from_handle(handle))
         
+    def _f(method_name):
+        """
+        Closure that returns a bulk accessor for a primary object type.
+
+        Each handle goes through the proxy's own get_<object>_from_handle
+        method, so that derived proxies apply their filtering.
+        """
+        def g(self, handles):
+            get_func = getattr(self, method_name)
+            return (get_func(handle) for handle in handles)
+        return g
+
+    # Use closure to define bulk accessors for each primary object type
+
+    get_people_from_handles        = _f('get_person_from_handle')
+    get_families_from_handles      = _f('get_family_from_handle')
+    get_events_from_handles        = _f('get_event_from_handle')
+    get_places_from_handles        = _f('get_place_from_handle')
+    get_sources_from_handles       = _f('get_source_from_handle')
+    get_citations_from_handles     = _f('get_citation_from_handle')
+    get_media_objects_from_handles = _f('get_object_from_handle')
+    get_repositories_from_handles  = _f('get_repository_from_handle')
+    get_notes_from_handles         = _f('get_note_from_handle')
+    get_tags_from_handles          = _f('get_tag_from_handle')
+    del _f
+
+    def get_raw_data_many(self, table_name, handles):
+        """
+        Return an iterator over the raw data of the objects in table_name
+        with the given handles, in the order of handles. None is yielded for
+        handles that are filtered out or missing.
+        """
+        bulk_func = {
+            'Person': self.get_people_from_handles,
+            'Family': self.get_families_from_handles,
+            'Event': self.get_events_from_handles,
+            'Place': self.get_places_from_handles,
+            'Source': self.get_sources_from_handles,
+            'Citation': self.get_citations_from_handles,
+            'Media': self.get_media_objects_from_handles,
+            'Repository': self.get_repositories_from_handles,
+            'Note': self.get_notes_from_handles,
+            'Tag': self.get_tags_from_handles,
+            }[table_name]
+        for obj in bulk_func(handles):
+            yield obj.serialize() if obj is not None else None
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed GRAMPS ID.
@@ -958,3 +1005,9 @@ class ProxyDbBase(DbReadBase):
         Return the database ID.
         """
         return self.basedb.get_dbid()
+
+    def get_change_stamp(self):
+        """
+        Return the change stamp of the real database.
+        """
+        return self.basedb.get_change_stamp()
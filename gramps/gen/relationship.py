@@ -28,6 +28,7 @@ Classes for relationships.
 #
 #-------------------------------------------------------------------------
 import os
+from collections import OrderedDict
 
 #-------------------------------------------------------------------------
 #
@@ -389,15 +390,16 @@ class RelationshipCalculator(object):
     PARTNER_EX_UNMARRIED   = 6
     PARTNER_EX_CIVIL_UNION = 7
     PARTNER_EX_UNKNOWN_REL = 8
+
+    #number of ancestor maps kept while connected to the database signals
+    MAP_CACHE_SIZE = 100
     
     def __init__(self):
         self.signal_keys = []
         self.state_signal_key = None
         self.storemap = False
-        self.dirtymap = True
-        self.stored_map = None
-        self.map_handle = None
-        self.map_meta = None
+        self.__maps = OrderedDict()
+        self.__change_count = 0
         self.__db_connected = False
         self.depth = 15
         try:
@@ -412,7 +414,6 @@ class RelationshipCalculator(object):
         """
         if not depth == self.depth:
             self.depth = depth
-            self.dirtymap = True
 
     def get_depth(self):
         """ obtain depth of relationship search
@@ -766,6 +767,7 @@ class RelationshipCalculator(object):
         self.__all_dist = all_dist
         self.__only_birth = only_birth
         self.__crosslinks = False    # no crosslinks
+        self.__families_seen = set()
         
         firstRel   = -1
         secondRel  = -1
@@ -776,34 +778,41 @@ class RelationshipCalculator(object):
         secondMap = {}
         rank = 9999999
 
+        if not self.__may_be_related(db, orig_person, other_person):
+            if not self.__all_dist:
+                return (-1, None, '', [], '', []), self.__msg
+            else:
+                return [(-1, None, '', [], '', [])], self.__msg
+
         try:
-            if (self.storemap and self.stored_map is not None 
-                    and self.map_handle == orig_person.handle 
-                    and not self.dirtymap): 
-                firstMap = self.stored_map
+            #the ancestor map of orig_person depends on the search options
+            key = (orig_person.handle, self.__all_families, 
+                   self.__only_birth, self.__max_depth)
+            stored = self.storemap and self.__maps.pop(key, None)
+            if stored:
+                firstMap, meta, handles = stored
+                #keep the map as the most recently used one
+                self.__maps[key] = stored
                 self.__maxDepthReached, self.__loopDetected, \
-                 self.__all_families,\
-                 self.__all_dist, self.__only_birth,\
-                 self.__crosslinks, self.__msg = self.map_meta
+                 self.__crosslinks, self.__msg = meta
                 self.__msg = list(self.__msg)
             else:
+                change_count = self.__change_count
                 self.__apply_filter(db, orig_person, '', [], firstMap)
-                self.map_meta = (self.__maxDepthReached,
-                                 self.__loopDetected, 
-                                 self.__all_families,
-                                 self.__all_dist, self.__only_birth,
-                                 self.__crosslinks, list(self.__msg))
+                if self.storemap and change_count == self.__change_count:
+                    #the people and families the map was made from
+                    handles = self.__families_seen.union(firstMap)
+                    meta = (self.__maxDepthReached, self.__loopDetected, 
+                            self.__crosslinks, list(self.__msg))
+                    self.__maps[key] = (firstMap, meta, handles)
+                    if len(self.__maps) > self.MAP_CACHE_SIZE:
+                        self.__maps.popitem(last=False)
             self.__apply_filter(db, other_person, '', [], secondMap,
                                     stoprecursemap = firstMap)
         except RuntimeError:
             return (-1, None, -1, [], -1, []) , \
                             [_("Relationship loop detected")] + self.__msg
 
-        if self.storemap:
-            self.stored_map = firstMap
-            self.dirtymap = False
-            self.map_handle = orig_person.handle
-            
         for person_handle in secondMap :
             if person_handle in firstMap :
                 com = []
@@ -876,6 +885,27 @@ class RelationshipCalculator(object):
         else :
             return [(-1, None, '', [], '', [])], self.__msg
     
+    def __may_be_related(self, db, orig_person, other_person):
+        """
+        Return False if the pedigree index of the database shows that the
+        two persons have no common ancestor, nor ancestors that are siblings
+        in a family without parents, so the search can be skipped.
+
+        The index covers all parent families and all generations, so this
+        never rules out a relationship the search would find. The ancestors
+        of both persons are searched from both sides until they meet, so 
+        related persons are recognized quickly. Without an index, True is 
+        returned.
+        """
+        if orig_person is None or other_person is None:
+            return True
+        try:
+            pedigree = db.get_pedigree_index()
+        except NotImplementedError:
+            return True
+        return pedigree.have_common_ancestor(orig_person.handle,
+                                             other_person.handle)
+
     def __apply_filter(self, db, person, rel_str, rel_fam, pmap,
                             depth=1, stoprecursemap=None):
         """Typically this method is called recursively in two ways:
@@ -953,6 +983,8 @@ class RelationshipCalculator(object):
             fam = 0
             for family_handle in family_handles :
                 rel_fam_new = rel_fam + [fam]
+                if stoprecursemap is None:
+                    self.__families_seen.add(family_handle)
                 family = db.get_family_from_handle(family_handle)
                 #obtain childref for this person
                 childrel = [(ref.get_mother_relation(), 
@@ -1756,23 +1788,35 @@ class RelationshipCalculator(object):
         dbstate.disconnect(self.state_signal_key)
         map(dbstate.db.disconnect, self.signal_keys)
         self.storemap = False
-        self.stored_map = None
+        self.__maps.clear()
 
     def _dbchange_callback(self, db):
-        """ When database changes, the map can no longer be used. 
+        """ When database changes, the maps can no longer be used. 
             Connects must be remade
         """
-        self.dirtymap = True
+        self.__change_count += 1
+        self.__maps.clear()
         #signals are disconnected on close of old database, connect to new
         self.__connect_db_signals(db)
 
-    def _datachange_callback(self, list=[]):
-        """ When data in database changes, the map can no  longer be used. 
-            As the map might be in use or might be generated at the moment, 
-            this method sets a dirty flag. Before reusing the map, this flag 
-            will be checked
+    def _datachange_callback(self, handles=None):
+        """ When people or families in the database change, the maps that
+            were made from them can no longer be used. These are the 
+            ancestor maps of the changed people and of their descendants.
+            Other maps are kept. Signals without handles, such as rebuilds,
+            drop all maps.
+            As a map might be generated at the moment, the changes are
+            counted, and a map is only stored if no change happened while
+            it was made.
         """
-        self.dirtymap = True
+        self.__change_count += 1
+        if not isinstance(handles, list):
+            self.__maps.clear()
+            return
+        changed = set(handles)
+        for key in [key for (key, (pmap, meta, seen)) in 
+                    self.__maps.iteritems() if not changed.isdisjoint(seen)]:
+            del self.__maps[key]
 
 #-------------------------------------------------------------------------
 #
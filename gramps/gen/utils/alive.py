@@ -33,6 +33,7 @@ privacy in reports and exports.
 #
 #-------------------------------------------------------------------------
 import logging
+import weakref
 LOG = logging.getLogger(".gen.utils.alive")
 
 #-------------------------------------------------------------------------
@@ -439,6 +440,421 @@ class ProbablyAlive(object):
 
         return (None, None, "", None)
 
+#-------------------------------------------------------------------------
+#
+# AliveEstimator class
+#
+#-------------------------------------------------------------------------
+class AliveEstimator(object):
+    """
+    Estimate the birth and death ranges of all people of a database at once.
+
+    The people, families and events are read once. The same evidence as in
+    ProbablyAlive.probably_alive_range is used, but the evidence found for
+    a family, and among the ancestors and descendants of a person, is
+    remembered and reused for every relative, instead of walking the tree
+    again for each person.
+
+    Loops in the family tree do not raise an error: a person who is his or
+    her own ancestor is not looked at again while the walk that leads to
+    him or her is in progress.
+    """
+
+    def __init__(self, 
+                 db,
+                 max_sib_age_diff=None, 
+                 max_age_prob_alive=None, 
+                 avg_generation_gap=None):
+        self.db = db
+        if max_sib_age_diff is None:
+            max_sib_age_diff = _MAX_SIB_AGE_DIFF 
+        if max_age_prob_alive is None:
+            max_age_prob_alive = _MAX_AGE_PROB_ALIVE
+        if avg_generation_gap is None:
+            avg_generation_gap = _AVG_GENERATION_GAP
+        self.MAX_SIB_AGE_DIFF = max_sib_age_diff
+        self.MAX_AGE_PROB_ALIVE = max_age_prob_alive
+        self.AVG_GENERATION_GAP = avg_generation_gap
+
+        self.people = {}
+        self.families = {}
+        self.events = {}
+        for person in db.iter_people():
+            birth_ref = person.get_birth_ref()
+            death_ref = person.get_death_ref()
+            self.people[person.handle] = (
+                birth_ref and birth_ref.ref,
+                bool(birth_ref and birth_ref.get_role().is_primary()),
+                death_ref and death_ref.ref,
+                bool(death_ref and death_ref.get_role().is_primary()),
+                [ref.ref for ref in person.get_primary_event_ref_list()],
+                person.get_parent_family_handle_list(),
+                person.get_main_parents_family_handle(),
+                person.get_family_handle_list())
+        for family in db.iter_families():
+            self.families[family.handle] = (
+                family.get_father_handle(),
+                family.get_mother_handle(),
+                [ref.ref for ref in family.get_child_ref_list()],
+                [ref.ref for ref in family.get_event_ref_list()])
+
+        self.__ranges = {}
+        self.__spouse_ranges = {}
+        self.__sibling_memo = {}
+        self.__descendant_memo = {}
+        self.__ancestor_memo = {}
+        self.__in_progress = set()
+
+    def probably_alive_range(self, handle):
+        """
+        Return (birth_date, death_date, explain_text, related_person) for the
+        person with the given handle, like ProbablyAlive.probably_alive_range.
+        """
+        birth, death, explain, other = self.__range(handle)
+        if other is not None:
+            other = self.db.get_person_from_handle(other)
+        return (birth, death, explain, other)
+
+    def probably_alive(self, handle, current_date=None, limit=0):
+        """
+        Return True if the person with the given handle may be alive on
+        current_date (defaults to today), like probably_alive.
+
+        :param limit:  number of years to check beyond death_date
+        """
+        birth, death = self.__range(handle)[:2]
+        if not birth or not death:
+            # no evidence, must consider alive
+            return True
+        if current_date is None:
+            current_date = Today()
+        if limit:
+            death += limit # add these years to death
+        return (current_date.match(birth, ">=") and 
+                current_date.match(death, "<="))
+
+    def __event(self, handle):
+        """
+        Return the type and date of the event, or None if it does not exist.
+        """
+        try:
+            return self.events[handle]
+        except KeyError:
+            event = self.db.get_event_from_handle(handle)
+            if event is not None:
+                event = (event.get_type(), event.get_date_object())
+            self.events[handle] = event
+            return event
+
+    def __date(self, handle, primary=True):
+        """
+        Return the date of the event if it is not empty, otherwise None.
+        """
+        if handle and primary:
+            event = self.__event(handle)
+            if event and event[1].get_start_date() != Date.EMPTY:
+                return event[1]
+        return None
+
+    def __range(self, handle, check_spouses=True):
+        """
+        Return the range of the person from the evidence of the person and
+        the relatives, and of the spouses if check_spouses is True.
+        """
+        if check_spouses:
+            memo = self.__ranges
+        else:
+            memo = self.__spouse_ranges
+        try:
+            return memo[handle]
+        except KeyError:
+            result = self.__compute_range(handle, check_spouses)
+            memo[handle] = result
+            return result
+
+    def __compute_range(self, handle, check_spouses):
+        info = self.people.get(handle)
+        if info is None:
+            return (None, None, "", None)
+        (birth_ref, birth_primary, death_ref, death_primary, event_refs,
+         parent_families, main_family, families) = info
+        explain = ""
+
+        # the person's own evidence
+        death_date = self.__date(death_ref, death_primary)
+        if not death_date:
+            for ref in event_refs:
+                event = self.__event(ref)
+                if event and event[0].is_death_fallback():
+                    death_date = event[1]
+                    explain = _("death-related evidence")
+        birth_date = self.__date(birth_ref, birth_primary)
+        if not birth_date:
+            for ref in event_refs:
+                event = self.__event(ref)
+                if event and event[0].is_birth_fallback():
+                    birth_date = event[1]
+                    explain = _("birth-related evidence")
+        if not birth_date and death_date:
+            birth_date = death_date.copy_offset_ymd(
+                year=-self.MAX_AGE_PROB_ALIVE)
+            explain = _("death date")
+        if not death_date and birth_date:
+            death_date = birth_date.copy_offset_ymd(
+                year=self.MAX_AGE_PROB_ALIVE)
+            explain = _("birth date")
+        if death_date and birth_date:
+            return (birth_date, death_date, explain, handle)
+
+        # the siblings
+        for family_handle in parent_families:
+            result = self.__siblings(family_handle)
+            if result:
+                return result
+
+        # the spouses and the events of the families
+        if check_spouses:
+            for family_handle in families:
+                family = self.families.get(family_handle)
+                if family is None:
+                    continue
+                father_handle, mother_handle, children, event_refs = family
+                spouse_handle = None
+                if mother_handle == handle and father_handle:
+                    spouse_handle = father_handle
+                elif father_handle == handle and mother_handle:
+                    spouse_handle = mother_handle
+                if spouse_handle:
+                    date1, date2, explain, other = self.__range(
+                        spouse_handle, False)
+                    if date1 and date2:
+                        return (date1, date2, _("a spouse, ") + explain,
+                                other)
+                year = self.__family_year(family_handle)
+                if year:
+                    if spouse_handle and mother_handle == handle:
+                        other = father_handle
+                    elif spouse_handle and father_handle == handle:
+                        other = mother_handle
+                    else:
+                        other = None
+                    return (Date().copy_ymd(year - self.AVG_GENERATION_GAP),
+                            Date().copy_ymd(year - self.AVG_GENERATION_GAP + 
+                                            self.MAX_AGE_PROB_ALIVE),
+                            _("event with spouse"), other)
+
+        # the descendants
+        found = self.__descendants(handle)
+        if found:
+            kind, depth, dobj, explain, other = found
+            years = depth * self.AVG_GENERATION_GAP
+            if kind == 'birth':
+                date1 = Date(dobj)
+                date1.set_year(date1.get_year() - years)
+                return (date1, date1.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                        explain, other)
+            return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP), 
+                    dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + 
+                                         self.MAX_AGE_PROB_ALIVE),
+                    explain, other)
+
+        # the ancestors
+        found = self.__ancestors(handle)
+        if found:
+            kind, depth, dobj, explain, other = found
+            years = depth * self.AVG_GENERATION_GAP
+            if kind == 'birth':
+                return (dobj.copy_offset_ymd(years), 
+                        dobj.copy_offset_ymd(years + self.MAX_AGE_PROB_ALIVE),
+                        explain, other)
+            return (dobj.copy_offset_ymd(years - self.MAX_AGE_PROB_ALIVE), 
+                    dobj.copy_offset_ymd(years),
+                    explain, other)
+
+        # If we can't find any reason to believe that they are dead we
+        # must assume they are alive.
+        return (None, None, "", None)
+
+    def __siblings(self, family_handle):
+        """
+        Return the range given by the first child of the family with a
+        birth or death date, or None.
+        """
+        if family_handle in self.__sibling_memo:
+            return self.__sibling_memo[family_handle]
+        result = None
+        family = self.families.get(family_handle)
+        if family is not None:
+            for child_handle in family[2]:
+                result = self.__sibling_range(child_handle)
+                if result:
+                    break
+        self.__sibling_memo[family_handle] = result
+        return result
+
+    def __sibling_range(self, handle):
+        info = self.people.get(handle)
+        if info is None:
+            return None
+        event_refs = info[4]
+        for fallback in (False, True):
+            for ref in event_refs:
+                event = self.__event(ref)
+                if not event:
+                    continue
+                if fallback:
+                    is_birth = event[0].is_birth_fallback()
+                    is_death = event[0].is_death_fallback()
+                else:
+                    is_birth = event[0].is_birth()
+                    is_death = event[0].is_death()
+                if not is_birth and not is_death:
+                    continue
+                dobj = event[1]
+                if dobj.get_start_date() == Date.EMPTY:
+                    continue
+                year = dobj.get_year()
+                if year == 0:
+                    continue
+                if is_birth:
+                    year -= self.MAX_SIB_AGE_DIFF
+                    if fallback:
+                        explain = _("sibling birth-related date")
+                    else:
+                        explain = _("sibling birth date")
+                else:
+                    year -= self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE
+                    if fallback:
+                        explain = _("sibling death-related date")
+                    else:
+                        explain = _("sibling death date")
+                return (Date().copy_ymd(year),
+                        Date().copy_ymd(year + self.MAX_AGE_PROB_ALIVE),
+                        explain, handle)
+        return None
+
+    def __family_year(self, family_handle):
+        """
+        Return the year of the first event of the family with a year.
+        """
+        for ref in self.families[family_handle][3]:
+            event = self.__event(ref)
+            if event:
+                year = event[1].get_year()
+                if year != 0:
+                    return year
+        return 0
+
+    def __fallback(self, event_refs):
+        """
+        Return the kind and date of the first birth or death fallback event
+        with a date, or None.
+        """
+        for ref in event_refs:
+            event = self.__event(ref)
+            if not event or event[1].get_start_date() == Date.EMPTY:
+                continue
+            if event[0].is_birth_fallback():
+                return ('birth', event[1])
+            elif event[0].is_death_fallback():
+                return ('death', event[1])
+        return None
+
+    def __descendants(self, handle):
+        """
+        Return (kind, generation, date, explain_text, handle) for the first
+        descendant with a birth or death date, or None.
+        """
+        if handle in self.__descendant_memo:
+            return self.__descendant_memo[handle]
+        if handle in self.__in_progress:
+            return None
+        self.__in_progress.add(handle)
+        result = None
+        for family_handle in self.people[handle][7]:
+            family = self.families.get(family_handle)
+            if family is None:
+                continue
+            for child_handle in family[2]:
+                info = self.people.get(child_handle)
+                if info is None:
+                    continue
+                dobj = self.__date(info[0])
+                if dobj:
+                    result = ('birth', 1, dobj, _("descendant birth date"),
+                              child_handle)
+                    break
+                dobj = self.__date(info[2])
+                if dobj:
+                    result = ('death', 1, dobj, _("descendant death date"),
+                              child_handle)
+                    break
+                found = self.__descendants(child_handle)
+                if found:
+                    kind, depth, dobj, explain, other = found
+                    result = (kind, depth + 1, dobj, explain, other)
+                    break
+                found = self.__fallback(info[4])
+                if found:
+                    kind, dobj = found
+                    if kind == 'birth':
+                        explain = _("descendant birth-related date")
+                    else:
+                        explain = _("descendant death-related date")
+                    result = (kind, 1, dobj, explain, child_handle)
+                    break
+            if result:
+                break
+        self.__in_progress.discard(handle)
+        self.__descendant_memo[handle] = result
+        return result
+
+    def __ancestors(self, handle):
+        """
+        Return (kind, generation, date, explain_text, handle) for the first
+        ancestor through the main parents with a birth or death date, or
+        None.
+        """
+        if handle in self.__ancestor_memo:
+            return self.__ancestor_memo[handle]
+        if handle in self.__in_progress:
+            return None
+        self.__in_progress.add(handle)
+        result = None
+        family = self.families.get(self.people[handle][6])
+        if family is not None:
+            for parent_handle in family[:2]:
+                info = self.people.get(parent_handle)
+                if info is None:
+                    continue
+                dobj = self.__date(info[0], info[1])
+                if dobj:
+                    result = ('birth', 1, dobj, _("ancestor birth date"),
+                              parent_handle)
+                    break
+                dobj = self.__date(info[2], info[3])
+                if dobj:
+                    result = ('death', 1, dobj, _("ancestor death date"),
+                              parent_handle)
+                    break
+                found = self.__fallback(info[4])
+                if found:
+                    kind, dobj = found
+                    if kind == 'birth':
+                        explain = _("ancestor birth-related date")
+                    else:
+                        explain = _("ancestor death-related date")
+                    result = (kind, 1, dobj, explain, parent_handle)
+                    break
+                found = self.__ancestors(parent_handle)
+                if found:
+                    kind, depth, dobj, explain, other = found
+                    result = (kind, depth + 1, dobj, explain, other)
+                    break
+        self.__in_progress.discard(handle)
+        self.__ancestor_memo[handle] = result
+        return result
+
 #-------------------------------------------------------------------------
 #
 # probably_alive
@@ -508,6 +924,40 @@ def probably_alive_range(person, db,
                        max_age_prob_alive, avg_generation_gap)
     return pb.probably_alive_range(person)
 
+# the AliveEstimator of each database or proxy database, with its change
+# stamp and parameters
+_ESTIMATORS = weakref.WeakKeyDictionary()
+
+def get_alive_estimator(db, 
+                        max_sib_age_diff=None, 
+                        max_age_prob_alive=None, 
+                        avg_generation_gap=None):
+    """
+    Return an AliveEstimator for db. The estimator is reused until the
+    database changes.
+
+    The estimator only uses what db shows: the private events and the
+    people left out by a proxy database are not used as evidence.
+
+    Raises NotImplementedError if the database has no change stamp.
+    """
+    if max_sib_age_diff is None:
+        max_sib_age_diff = _MAX_SIB_AGE_DIFF 
+    if max_age_prob_alive is None:
+        max_age_prob_alive = _MAX_AGE_PROB_ALIVE
+    if avg_generation_gap is None:
+        avg_generation_gap = _AVG_GENERATION_GAP
+    key = (db.get_change_stamp(), max_sib_age_diff, max_age_prob_alive,
+           avg_generation_gap)
+    cached = _ESTIMATORS.get(db)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    # the estimator must not keep the database alive
+    estimator = AliveEstimator(weakref.proxy(db), max_sib_age_diff, 
+                               max_age_prob_alive, avg_generation_gap)
+    _ESTIMATORS[db] = (key, estimator)
+    return estimator
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
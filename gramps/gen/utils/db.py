@@ -39,6 +39,7 @@ LOG = logging.getLogger(".gui.utils.db")
 from ..lib.nameorigintype import NameOriginType
 from ..lib.surname import Surname
 from ..display.name import displayer as name_displayer
+from ..db.pedigree import get_pedigree
 from ..ggettext import sgettext as _
 
 #-------------------------------------------------------------------------
@@ -459,26 +460,11 @@ def for_each_ancestor(db, start, func, data):
     Exit and return 1, as soon as func returns true.
     Return 0 otherwise.
     """
-    todo = start
-    done_ids = set()
-    while len(todo):
-        p_handle = todo.pop()
-        p = db.get_person_from_handle(p_handle)
-        # Don't process the same handle twice.  This can happen
-        # if there is a cycle in the database, or if the
-        # initial list contains X and some of X's ancestors.
-        if p_handle in done_ids:
-            continue
-        done_ids.add(p_handle)
+    # Each handle is visited once, even if there is a cycle in the
+    # database, or if the initial list contains X and some of X's ancestors.
+    for p_handle in get_pedigree(db).iter_ancestors(start):
         if func(data, p_handle):
             return 1
-        for fam_handle in p.get_parent_family_handle_list():
-            fam = db.get_family_from_handle(fam_handle)
-            if fam:
-                f_handle = fam.get_father_handle()
-                m_handle = fam.get_mother_handle()
-                if f_handle: todo.append(f_handle)
-                if m_handle: todo.append(m_handle)
     return 0
 
 #-------------------------------------------------------------------------
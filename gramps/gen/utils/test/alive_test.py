@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# gen/utils/test/alive_test.py
+# $Id$
+
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ...lib import (Person, Family, Event, EventRef, EventType, ChildRef,
+                    Date)
+from ...proxy import PrivateProxyDb
+from ..alive import ProbablyAlive, AliveEstimator, get_alive_estimator
+
+class Database(object):
+    """
+    The people, families and events of a small family tree.
+    """
+    def __init__(self):
+        self.people = {}
+        self.families = {}
+        self.events = {}
+        # for the proxy databases
+        self.name_formats = []
+        self.bookmarks = self.family_bookmarks = self.event_bookmarks = None
+        self.place_bookmarks = self.source_bookmarks = None
+        self.citation_bookmarks = self.repo_bookmarks = None
+        self.media_bookmarks = self.note_bookmarks = None
+
+    def add_person(self, handle, birth=None, death=None, baptism=None):
+        person = Person()
+        person.set_handle(handle)
+        for (year, event_type, setter) in (
+                (birth, EventType.BIRTH, person.set_birth_ref),
+                (death, EventType.DEATH, person.set_death_ref),
+                (baptism, EventType.BAPTISM, person.add_event_ref)):
+            if year is not None:
+                setter(self.add_event(event_type, year))
+        self.people[handle] = person
+        return person
+
+    def add_event(self, event_type, year):
+        event = Event()
+        event.set_handle('E%d' % len(self.events))
+        event.set_type(event_type)
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        self.events[event.handle] = event
+        ref = EventRef()
+        ref.set_reference_handle(event.handle)
+        return ref
+
+    def add_family(self, handle, father, mother, children, marriage=None):
+        family = Family()
+        family.set_handle(handle)
+        family.set_father_handle(father)
+        family.set_mother_handle(mother)
+        for parent in (father, mother):
+            if parent:
+                self.people[parent].add_family_handle(handle)
+        for child in children:
+            ref = ChildRef()
+            ref.set_reference_handle(child)
+            family.add_child_ref(ref)
+            self.people[child].add_parent_family_handle(handle)
+        if marriage is not None:
+            family.add_event_ref(self.add_event(EventType.MARRIAGE, marriage))
+        self.families[handle] = family
+
+    def iter_people(self):
+        return self.people.itervalues()
+
+    def iter_families(self):
+        return self.families.itervalues()
+
+    def get_person_from_handle(self, handle):
+        return self.people.get(handle)
+
+    def get_family_from_handle(self, handle):
+        return self.families.get(handle)
+
+    def get_event_from_handle(self, handle):
+        return self.events.get(handle)
+
+    def get_change_stamp(self):
+        return 0
+
+def serialize(result):
+    birth, death, explain, other = result
+    return (birth and birth.serialize(), death and death.serialize(),
+            explain, other and other.handle)
+
+class AliveEstimatorTest(unittest.TestCase):
+
+    def setUp(self):
+        db = self.db = Database()
+        # ancestors: only the great-grandfather has a birth date
+        db.add_person('GG', birth=1800)
+        db.add_person('GF')
+        db.add_person('FA')
+        db.add_person('ME')
+        db.add_family('F1', 'GG', None, ['GF'])
+        db.add_family('F2', 'GF', None, ['FA'])
+        db.add_family('F3', 'FA', None, ['ME'])
+        # descendants: only the great-grandchild has a birth date
+        db.add_person('CH')
+        db.add_person('GC')
+        db.add_person('GGC', birth=1990)
+        db.add_family('F4', 'ME', None, ['CH'])
+        db.add_family('F5', 'CH', None, ['GC'])
+        db.add_family('F6', 'GC', None, ['GGC'])
+        # siblings, a spouse, and a family event
+        db.add_person('S1', death=1900)
+        db.add_person('S2')
+        db.add_family('F7', None, None, ['S1', 'S2'])
+        db.add_person('HU')
+        db.add_person('WI', baptism=1950)
+        db.add_family('F8', 'HU', 'WI', [])
+        db.add_person('H2')
+        db.add_person('W2')
+        db.add_family('F9', 'H2', 'W2', [], marriage=1930)
+        db.add_person('NO')
+
+    def test_same_as_probably_alive(self):
+        single = ProbablyAlive(self.db, 20, 110, 20)
+        estimator = AliveEstimator(self.db, 20, 110, 20)
+        for handle, person in self.db.people.iteritems():
+            self.assertEqual(
+                serialize(estimator.probably_alive_range(handle)),
+                serialize(single.probably_alive_range(person)),
+                handle)
+        self.assertTrue(estimator.probably_alive('NO'))
+        self.assertFalse(estimator.probably_alive('GG'))
+        self.assertFalse(estimator.probably_alive('S2'))
+
+    def test_loop(self):
+        # LO is his own grandfather, the estimate must still end
+        db = self.db
+        db.add_person('LO')
+        db.add_person('LC')
+        db.add_family('F10', 'LO', None, ['LC'])
+        db.add_family('F11', 'LC', None, ['LO'])
+        estimator = AliveEstimator(db, 20, 110, 20)
+        self.assertTrue(estimator.probably_alive('LO'))
+        self.assertTrue(estimator.probably_alive('LC'))
+
+    def test_private_proxy(self):
+        # the death of S1 is private: it is not evidence for S1 and S2 in
+        # the private proxy
+        db = self.db
+        db.events[db.people['S1'].get_death_ref().ref].set_privacy(True)
+        estimator = get_alive_estimator(db, 20, 110, 20)
+        self.assertFalse(estimator.probably_alive('S1'))
+        self.assertFalse(estimator.probably_alive('S2'))
+        estimator = get_alive_estimator(PrivateProxyDb(db), 20, 110, 20)
+        self.assertTrue(estimator.probably_alive('S1'))
+        self.assertTrue(estimator.probably_alive('S2'))
+
+if __name__ == "__main__":
+    unittest.main()
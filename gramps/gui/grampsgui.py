@@ -227,6 +227,7 @@ class Gramps(object):
         import viewmanager
         from viewmanager import ViewManager
         from gramps.cli.arghandler import ArgHandler
+        from gramps.cli.grampscli import print_startup_times
         from .tipofday import TipOfDay
 
         register_stock_icons()
@@ -234,6 +235,8 @@ class Gramps(object):
         dbstate = DbState()
         self.vm = ViewManager(dbstate, config.get("interface.view-categories"))
         self.vm.init_interface()
+        if argparser.timing:
+            print_startup_times()
 
         #act based on the given arguments
         ah = ArgHandler(dbstate, argparser, self.vm, self.argerrorfunc,
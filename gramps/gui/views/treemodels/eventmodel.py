@@ -67,6 +67,7 @@ INVALID_DATE_FORMAT = config.get('preferences.invalid-date-format')
 #
 #-------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
+    _OBJECT_TYPE = 'Event'
 
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None,
                  skip=set(), sort_map=None):
@@ -56,6 +56,7 @@ invalid_date_format = config.get('preferences.invalid-date-format')
 #
 #-------------------------------------------------------------------------
 class FamilyModel(FlatBaseModel):
+    _OBJECT_TYPE = 'Family'
 
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None, 
                  skip=set(), sort_map=None):
@@ -57,6 +57,7 @@ from __future__ import with_statement
 import logging
 import bisect
 import time
+import locale
 
 _LOG = logging.getLogger(".gui.basetreemodel")
     
@@ -75,6 +76,7 @@ from gi.repository import Gtk
 #-------------------------------------------------------------------------
 from gramps.gen.filters import SearchFilter, ExactSearchFilter
 from gramps.gen.utils.cast import conv_unicode_tosrtkey, conv_tosrtkey
+from gramps.gen.display.name import displayer as name_displayer
 
 #-------------------------------------------------------------------------
 #
@@ -438,6 +440,9 @@ class FlatBaseModel(GObject.Object, Gtk.TreeModel):
     The base class for all flat treeview models. 
     It keeps a FlatNodeMap, and obtains data from database as needed
     """
+    #inheriting classes set the class name of the objects they show, so that
+    #the sort keys can be kept in a sort key index of the database
+    _OBJECT_TYPE = None
 
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING,
                  tooltip_column=None, search=None, skip=set(),
@@ -567,6 +572,24 @@ class FlatBaseModel(GObject.Object, Gtk.TreeModel):
         This list is sorted ascending, via localized string sort. 
         conv_unicode_tosrtkey which uses strxfrm
         """
+        if self._OBJECT_TYPE is None:
+            return self._build_sort_keys()
+        name = "%s.%s" % (self.__class__.__name__, self.sort_func.__name__)
+        try:
+            index = self.db.get_sort_key_index(name, self._OBJECT_TYPE)
+        except NotImplementedError:
+            return self._build_sort_keys()
+        #the keys depend on the collation and on the name format
+        context = (locale.getlocale(locale.LC_COLLATE),
+                   name_displayer.get_default_format())
+        return index.get_keys(context, self._build_sort_keys,
+                              self._get_sort_key)
+
+    def _build_sort_keys(self):
+        """
+        Return the sorted (sort_key, handle) list of all data, obtained with 
+        a cursor over the database.
+        """
         # use cursor as a context manager
         with self.gen_cursor() as cursor:   
             #loop over database and store the sort field, and the handle, and
@@ -574,6 +597,16 @@ class FlatBaseModel(GObject.Object, Gtk.TreeModel):
             return sorted((map(conv_tosrtkey,
                            self.sort_func(data)), key) for key, data in cursor)
 
+    def _get_sort_key(self, handle):
+        """
+        Return the sort key of the object with handle, or None if it is not 
+        in the database.
+        """
+        data = self.map(handle)
+        if data is None:
+            return None
+        return map(conv_tosrtkey, self.sort_func(data))
+
     def _rebuild_search(self, ignore=None):
         """ function called when view must be build, given a search text
             in the top search bar
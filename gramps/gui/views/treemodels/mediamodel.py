@@ -52,6 +52,7 @@ from .flatbasemodel import FlatBaseModel
 #
 #-------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
+    _OBJECT_TYPE = 'MediaObject'
 
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None,
                  skip=set(), sort_map=None):
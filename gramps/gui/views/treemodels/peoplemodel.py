@@ -466,6 +466,7 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     """
     Listed people model.
     """
+    _OBJECT_TYPE = 'Person'
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None,
                  skip=set(), sort_map=None):
         PeopleBaseModel.__init__(self, db)
@@ -493,7 +494,8 @@ class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
 
         PeopleBaseModel.__init__(self, db)
         TreeBaseModel.__init__(self, db, 12, search=search, skip=skip,
-                                scol=scol, order=order, sort_map=sort_map)
+                                scol=scol, order=order, sort_map=sort_map,
+                                lazy=True)
 
     def destroy(self):
         """
@@ -236,6 +236,7 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     """
     Flat place model.  (Original code in PlaceBaseModel).
     """
+    _OBJECT_TYPE = 'Place'
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None,
                  skip=set(), sort_map=None):
 
@@ -270,7 +271,8 @@ class PlaceTreeModel(PlaceBaseModel, TreeBaseModel):
                                 tooltip_column=15,
                                 search=search, skip=skip, sort_map=sort_map,
                                 nrgroups = 3,
-                                group_can_have_handle = True)
+                                group_can_have_handle = True,
+                                lazy = True)
 
     def destroy(self):
         """
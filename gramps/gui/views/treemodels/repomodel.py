@@ -49,6 +49,7 @@ from .flatbasemodel import FlatBaseModel
 #
 #-------------------------------------------------------------------------
 class RepositoryModel(FlatBaseModel):
+    _OBJECT_TYPE = 'Repository'
 
     def __init__(self, db, scol=0, order=Gtk.SortType.ASCENDING, search=None,
                  skip=set(), sort_map=None):
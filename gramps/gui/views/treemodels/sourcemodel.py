@@ -48,6 +48,7 @@ from .flatbasemodel import FlatBaseModel
 #
 #-------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    _OBJECT_TYPE = 'Source'
 
     def __init__(self,db,scol=0, order=Gtk.SortType.ASCENDING,search=None,
                  skip=set(), sort_map=None):
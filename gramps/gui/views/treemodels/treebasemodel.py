@@ -37,6 +37,7 @@ This module provides the model that is used for all hierarchical treeviews.
 from __future__ import with_statement, print_function
 import time
 import locale
+from itertools import izip
 from gramps.gen.ggettext import gettext as _
 import logging
 
@@ -82,9 +83,11 @@ class Node(object):
 
     children    A list of (sortkey, nodeid) tuples for the children of the node.
                 This list is always kept sorted.
+    pending     The PendingChildren of the node that are not loaded yet, or
+                None.
     """
     __slots__ = ('name', 'sortkey', 'ref', 'handle', 'secondary', 'parent',
-                 'prev', 'next', 'children')#, '__weakref__')
+                 'prev', 'next', 'children', 'pending')#, '__weakref__')
 
     def __init__(self, ref, parent, sortkey, handle, secondary):
         if sortkey:
@@ -106,6 +109,7 @@ class Node(object):
         self.prev = None
         self.next = None
         self.children = []
+        self.pending = None
 
     def set_handle(self, handle, secondary=False):
         """
@@ -176,6 +180,36 @@ class Node(object):
 
         self.children.pop(index)
 
+#-------------------------------------------------------------------------
+#
+# PendingChildren
+#
+#-------------------------------------------------------------------------
+class PendingChildren(object):
+    """
+    The rows of a group node in a lazy model that have not been turned into
+    nodes yet. Only the handle, the unconverted sortkey and whether the row
+    is of the secondary object type are kept, in three lists, until the
+    children of the group are needed.
+    """
+    __slots__ = ('handles', 'sortkeys', 'secondary')
+
+    def __init__(self):
+        self.handles = []
+        self.sortkeys = []
+        self.secondary = []
+
+    def add(self, handle, sortkey, secondary):
+        """
+        Add a row.
+        """
+        self.handles.append(handle)
+        self.sortkeys.append(sortkey)
+        self.secondary.append(secondary)
+
+    def __iter__(self):
+        return izip(self.handles, self.sortkeys, self.secondary)
+
 #-------------------------------------------------------------------------
 #
 # NodeMap
@@ -280,6 +314,10 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
     has_secondary  :  If True, the model contains two Gramps object types.
                       The suffix '2' is appended to variables relating to the
                       secondary object type.
+    lazy           :  If True, the rows below a group are only turned into 
+                      nodes when the children of the group are first asked
+                      for, that is when the group is expanded in the view. 
+                      Only the group nodes are made when the model is built.
     """
 
     # LRU cache size
@@ -290,7 +328,8 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
                     scol=0, order=Gtk.SortType.ASCENDING, sort_map=None,
                     nrgroups = 1,
                     group_can_have_handle = False,
-                    has_secondary=False):
+                    has_secondary=False,
+                    lazy=False):
         cput = time.clock()
         GObject.GObject.__init__(self)
         #We create a stamp to recognize invalid iterators. From the docs:
@@ -309,6 +348,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         self.nrgroups = nrgroups
         self.group_can_have_handle = group_can_have_handle
         self.has_secondary = has_secondary
+        self.lazy = lazy
         self.db = db
         
         self._set_base_data()
@@ -317,6 +357,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         self.tree = {}
         self.nodemap = NodeMap()
         self.handle2node = {}
+        self.handle2group = {}
 
         #GTK3 We leak ref, yes??
         #self.set_property("leak_references", False)
@@ -439,6 +480,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         """
         self.tree.clear()
         self.handle2node.clear()
+        self.handle2group.clear()
         self.stamp += 1
         self.nodemap.clear()
         #start with creating the new iters
@@ -622,17 +664,33 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         add_parent  Bool, if True, check if parent is present, if not add the 
                     parent as a top group with no handle
         """
+        if parent in self.handle2group:
+            #the parent is a row that is not loaded yet
+            self._load_children(self.handle2group[parent])
         if add_parent and not (parent in self.tree):
             #add parent to self.tree as a node with no handle, as the first
             #group level
             self.add_node(None, parent, parent, None, add_parent=False)
+        if child in self.handle2group:
+            self._load_children(self.handle2group[child])
         if child in self.tree:
             #a node is added that is already present,
             child_node = self.tree[child]
             self._add_dup_node(child_node, parent, child, sortkey, handle,
                                secondary)
+        elif (self.lazy and self._in_build and handle and child == handle
+                and self.tree[parent].parent is not None):
+            #keep the row until the children of the group are needed
+            parent_node = self.tree[parent]
+            if parent_node.pending is None:
+                parent_node.pending = PendingChildren()
+            parent_node.pending.add(handle, sortkey, secondary)
+            self.handle2group[handle] = parent_node
+            return
         else:
             parent_node = self.tree[parent]
+            if not self._in_build:
+                self._load_children(parent_node)
             child_node = Node(child, id(parent_node), sortkey, handle,
                               secondary)
             parent_node.add_child(child_node, self.nodemap)
@@ -651,6 +709,37 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         if handle:
             self.handle2node[handle] = child_node
 
+    def _load_children(self, node):
+        """
+        Turn the pending rows of a group node into nodes. No signals are
+        emitted, the rows are new to the view as it has not asked for the
+        children of the group before.
+        """
+        pending = node.pending
+        if pending is None:
+            return
+        node.pending = None
+        nodeid = id(node)
+        children = node.children
+        for handle, sortkey, secondary in pending:
+            del self.handle2group[handle]
+            child_node = Node(handle, nodeid, sortkey, handle, secondary)
+            self.tree[handle] = child_node
+            self.handle2node[handle] = child_node
+            children.append((child_node.sortkey,
+                             self.nodemap.add_node(child_node)))
+        #sort once and link all children again, instead of inserting the
+        #rows one by one
+        children.sort()
+        prev_nodeid = None
+        for sortkey, child_nodeid in children:
+            child_node = self.nodemap.node(child_nodeid)
+            child_node.prev = prev_nodeid
+            child_node.next = None
+            if prev_nodeid is not None:
+                self.nodemap.node(prev_nodeid).next = child_nodeid
+            prev_nodeid = child_nodeid
+
     def _add_dup_node(self, node, parent, child, sortkey, handle, secondary):
         """
         How to handle adding a node a second time
@@ -672,6 +761,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         """
         Remove a node from the map.
         """
+        self._load_children(node)
         if node.children:
             del self.handle2node[node.handle]
             node.set_handle(None)
@@ -772,7 +862,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         
         while parent is not None:
             next_parent = parent.parent and self.nodemap.node(parent.parent)
-            if not parent.children:
+            if not (parent.children or parent.pending):
                 if parent.handle:
                     # emit row_has_child_toggled signal
                     iternode = self.get_iter(parent)
@@ -836,6 +926,8 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         """
         Get the node for a handle.
         """
+        if handle in self.handle2group:
+            self._load_children(self.handle2group[handle])
         return self.handle2node.get(handle)
 
     def handle2path(self, handle):
@@ -927,6 +1019,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         node = self.tree[None]
         pathlist = path.get_indices()
         for index in pathlist:
+            self._load_children(node)
             _index = (-index - 1) if self.__reverse else index
             node = self.nodemap.node(node.children[_index][1])
         return True, self.get_iter(node)
@@ -985,6 +1078,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
             nodeid = id(self.tree[None])
         else:
             nodeparent = self.get_node_from_iter(iterparent)
+            self._load_children(nodeparent)
             if nodeparent.children:
                 nodeid = nodeparent.children[-1 if self.__reverse else 0][1]
             else:
@@ -996,7 +1090,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
         Find if the given node has any children.
         """
         node = self.get_node_from_iter(iter)
-        return True if node.children else False
+        return True if (node.children or node.pending) else False
 
     def do_iter_n_children(self, iter):
         """
@@ -1006,6 +1100,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iter)
+            self._load_children(node)
         return len(node.children)
 
     def do_iter_nth_child(self, iterparent, index):
@@ -1016,6 +1111,7 @@ class TreeBaseModel(GObject.Object, Gtk.TreeModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iterparent)
+            self._load_children(node)
         if node.children:
             if len(node.children) > index:
                 _index = (-index - 1) if self.__reverse else index
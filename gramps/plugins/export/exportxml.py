@@ -39,7 +39,6 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
 from xml.sax.saxutils import escape
 from gramps.gen.ggettext import gettext as _
 
@@ -57,11 +56,13 @@ LOG = logging.getLogger(".WriteXML")
 # load Gramps libraries
 #
 #-------------------------------------------------------------------------
-from gramps.gen.lib import Date, Person
+from gramps.gen.lib import (Date, Person, Family, Event, Place, Source,
+                            Citation, MediaObject, Repository, Note, Tag)
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.gen.const import VERSION
 from gramps.gen.constfunc import win
+from gramps.gen.config import config
 from gramps.gui.plug.export import WriterOptionBox
 import gramps.plugins.lib.libgrampsxml as libgrampsxml
 
@@ -87,6 +88,55 @@ def escxml(d):
                    '>' : '&gt;',
                    }) if d else ""
 
+# methods to read an object of a table from a database without bulk access
+GET_OBJECT_FUNC = {
+    'Person'     : 'get_person_from_handle',
+    'Family'     : 'get_family_from_handle',
+    'Event'      : 'get_event_from_handle',
+    'Place'      : 'get_place_from_handle',
+    'Source'     : 'get_source_from_handle',
+    'Citation'   : 'get_citation_from_handle',
+    'Media'      : 'get_object_from_handle',
+    'Repository' : 'get_repository_from_handle',
+    'Note'       : 'get_note_from_handle',
+    'Tag'        : 'get_tag_from_handle',
+    }
+
+#-------------------------------------------------------------------------
+#
+# BufferedWriter
+#
+#-------------------------------------------------------------------------
+# number of characters collected before they are encoded and written
+BUFFER_SIZE = 1 << 20
+
+class BufferedWriter(object):
+    """
+    Collects the strings written to it and writes them to a file in UTF-8,
+    in large blocks. Encoding and compressing the many short strings of the
+    XML output one at a time is much slower than doing it a block at a time.
+    """
+    def __init__(self, fileobj, size=BUFFER_SIZE):
+        self.fileobj = fileobj
+        self.size = size
+        self.pieces = []
+        self.length = 0
+
+    def write(self, text):
+        self.pieces.append(text)
+        self.length += len(text)
+        if self.length >= self.size:
+            self.flush()
+
+    def flush(self):
+        """
+        Encode and write the collected strings.
+        """
+        if self.pieces:
+            self.fileobj.write(u''.join(self.pieces).encode('utf-8'))
+            self.pieces = []
+            self.length = 0
+
 #-------------------------------------------------------------------------
 #
 #
@@ -98,7 +148,7 @@ class GrampsXmlWriter(UpdateCallback):
     """
 
     def __init__(self, db, strip_photos=0, compress=1, version="unknown",
-                 user=None):
+                 user=None, compress_level=None):
         """
         Initialize, but does not write, an XML file.
 
@@ -108,12 +158,18 @@ class GrampsXmlWriter(UpdateCallback):
         >              1: remove everything expect the filename (eg gpkg)
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
+        compress_level - gzip compression level, from 1 (fastest) to 9
+        >              (smallest), None for the export.compress-level
+        >              preference
         """
         UpdateCallback.__init__(self, user.callback)
         self.user = user
         self.compress = compress
         if not _gzip_ok:
             self.compress = False
+        if compress_level is None:
+            compress_level = config.get('export.compress-level')
+        self.compress_level = compress_level
         self.db = db
         self.strip_photos = strip_photos
         self.version = version
@@ -154,7 +210,7 @@ class GrampsXmlWriter(UpdateCallback):
             try:
                 if self.compress and _gzip_ok:
                     try:
-                        g = gzip.open(filename,"wb")
+                        g = gzip.open(filename, "wb", self.compress_level)
                     except:
                         g = open(filename,"w")
                 else:
@@ -165,9 +221,10 @@ class GrampsXmlWriter(UpdateCallback):
                                         str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
+        self.g = BufferedWriter(g)
 
         self.write_xml_data()
+        self.g.flush()
         if filename != '-':
             g.close()
         return 1
@@ -179,15 +236,17 @@ class GrampsXmlWriter(UpdateCallback):
 
         if self.compress and _gzip_ok:
             try:
-                g = gzip.GzipFile(mode="wb",fileobj=handle)
+                g = gzip.GzipFile(mode="wb", fileobj=handle,
+                                  compresslevel=self.compress_level)
             except:
                 g = handle
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
+        self.g = BufferedWriter(g)
 
         self.write_xml_data()
+        self.g.flush()
         g.close()
         return 1
             
@@ -247,8 +306,8 @@ class GrampsXmlWriter(UpdateCallback):
         # Write table objects
         if tag_len > 0:
             self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
+            for tag in self.iter_objects('Tag', Tag,
+                                         self.db.get_tag_handles()):
                 self.write_tag(tag, 2)
                 self.update()
             self.g.write("  </tags>\n")
@@ -256,8 +315,8 @@ class GrampsXmlWriter(UpdateCallback):
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
+            for event in self.iter_objects('Event', Event,
+                                           self.db.get_event_handles()):
                 self.write_event(event,2)
                 self.update()
             self.g.write("  </events>\n")
@@ -269,65 +328,64 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write('>\n')
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
+            for person in self.iter_objects('Person', Person,
+                                            self.db.get_person_handles()):
                 self.write_person(person, 2)
                 self.update()
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
+            for family in self.iter_objects('Family', Family,
+                                            self.db.iter_family_handles()):
                 self.write_family(family,2)
                 self.update()
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
+            for citation in self.iter_objects('Citation', Citation,
+                                              self.db.get_citation_handles()):
                 self.write_citation(citation,2)
                 self.update()
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
+            for source in self.iter_objects('Source', Source,
+                                            self.db.get_source_handles()):
                 self.write_source(source,2)
                 self.update()
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
+            for place in self.iter_objects('Place', Place,
+                                           self.db.get_place_handles()):
                 self.write_place_obj(place,2)
                 self.update()
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_object_handles()):
-                obj = self.db.get_object_from_handle(handle)
+            for obj in self.iter_objects('Media', MediaObject,
+                                         self.db.get_media_object_handles()):
                 self.write_object(obj,2)
                 self.update()
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
+            for repo in self.iter_objects('Repository', Repository,
+                                          self.db.get_repository_handles()):
                 self.write_repository(repo,2)
                 self.update()
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
+            for note in self.iter_objects('Note', Note,
+                                          self.db.get_note_handles()):
                 self.write_note(note, 2)
                 self.update()
             self.g.write("  </notes>\n")
@@ -341,6 +399,29 @@ class GrampsXmlWriter(UpdateCallback):
 #        self.status.end()
 #        self.status = None
 
+    def iter_objects(self, table_name, class_type, handles):
+        """
+        Iterate over the objects of table_name with the given handles, in
+        order of handle. The raw data is read in bulk, and each object is
+        unserialized directly, without going through the object cache.
+        """
+        handles = sorted(handles)
+        try:
+            raw_list = self.db.get_raw_data_many(table_name, handles)
+        except NotImplementedError:
+            # no bulk access to the raw data, read the objects one by one
+            get_object = getattr(self.db, GET_OBJECT_FUNC[table_name])
+            for handle in handles:
+                obj = get_object(handle)
+                if obj is not None:
+                    yield obj
+            return
+        for data in raw_list:
+            if data is not None:
+                obj = class_type()
+                obj.unserialize(data)
+                yield obj
+
     def write_metadata(self):
         """ Method to write out metadata of the database
         """
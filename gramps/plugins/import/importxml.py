@@ -80,7 +80,15 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# the number of bytes of XML read and parsed at a time
+READ_SIZE = 1 << 16
+
+# the start tag of a person, which the people of a file are counted by
+PERSON_TAG = "<person "
+
+# the number of people from which an import is done without the magic
+# of the database transactions
+NO_MAGIC_PEOPLE = 1000
 
 CHILD_REL_MAP = {
     "Birth"     : ChildRefType(ChildRefType.BIRTH), 
@@ -111,7 +119,7 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 0
+    file_size = 0
     person_cnt = 0
     
     with ImportOpenFileContextManager(filename, user) as xml_file:
@@ -125,15 +133,20 @@ def importData(database, filename, user):
         parser = GrampsParser(database, user, change)
 
         if filename != '-':
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
+            file_size = os.path.getsize(filename)
     
         read_only = database.readonly
         database.readonly = False
         
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            if filename != '-':
+                # it is enough to know whether the file has at least as
+                # many people as the family tree
+                person_cnt = count_people(xml_file,
+                                          max(NO_MAGIC_PEOPLE,
+                                              database.get_number_of_people()))
+                xml_file.seek(0)
+            info = parser.parse(xml_file, file_size, person_cnt)
         except GrampsImportError, err: # version error
             user.notify_error(*err.messages())
             return
@@ -346,46 +359,40 @@ class ImportInfo(object):
         
         return txt
 
-class LineParser(object):
-    def __init__(self, filename):
-
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                f = gzip.open(filename, "r")
-                f.read(1)
-                f.close()
-            except IOError, msg:
-                use_gzip = 0
-            except ValueError, msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                ofile = gzip.open(filename, "rb")
-            else:
-                ofile = open(filename, "r")
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-
-            ofile.close()
-        except:
-            self.count = 0
-            self.person_count = 0
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
+def count_people(xml_file, limit=None):
+    """
+    Count the start tags of the people in the file xml_file, a block at a
+    time, without parsing it. The count stops when it reaches limit.
+    """
+    count = 0
+    # a tag cut in two by the end of a block is found in the next one
+    tail = ""
+    data = xml_file.read(READ_SIZE)
+    while data:
+        data = tail + data
+        count += data.count(PERSON_TAG)
+        if limit is not None and count >= limit:
+            break
+        tail = data[1 - len(PERSON_TAG):]
+        data = xml_file.read(READ_SIZE)
+    return count
+
+def parse_xml(xml_parser, xml_file, update=None):
+    """
+    Parse the file xml_file with the expat parser xml_parser, a block at a
+    time. After each block, update is called with the position in the file
+    on disk, which is compressed for a gzip file.
+    """
+    # the gzip file reads the compressed file in turn
+    raw_file = getattr(xml_file, 'fileobj', xml_file)
+    read = xml_file.read
+    data = read(READ_SIZE)
+    while data:
+        xml_parser.Parse(data, False)
+        if update is not None:
+            update(raw_file.tell())
+        data = read(READ_SIZE)
+    xml_parser.Parse('', True)
 
 #-------------------------------------------------------------------------
 #
@@ -875,19 +882,28 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=0, personcount=0):
+    def parse(self, ifile, filesize=0, personcount=0):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
+        :param filesize: the size of the file on disk, to show the progress
+                         by, or 0 if it is not known
+        :param personcount: the number of people in the file, which may
+                            only be counted up to the number of people in
+                            the family tree
         """
-        if personcount < 1000:
+        if personcount < NO_MAGIC_PEOPLE:
             no_magic = True
         else:
             no_magic = False
+        # rebuilding all indices at the end only pays off if the import is
+        # at least as large as the family tree
+        bulk = (not no_magic and
+                personcount >= self.db.get_number_of_people())
         with DbTxn(_("Gramps XML import"), self.db, batch=True,
-                   no_magic=no_magic) as self.trans:
-            self.set_total(linecount)
+                   no_magic=no_magic, bulk=bulk) as self.trans:
+            self.set_total(filesize)
 
             self.db.disable_signals()
 
@@ -895,7 +911,10 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            # the text of an element is passed in one piece where possible
+            self.p.buffer_text = True
+            self.p.buffer_size = READ_SIZE
+            parse_xml(self.p, ifile, self.update if filesize else None)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1099,7 +1118,6 @@ class GrampsParser(UpdateCallback):
         # GRAMPS LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get('title', '')
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         return self.placeobj
             
     def start_location(self, attrs):
@@ -1183,7 +1201,6 @@ class GrampsParser(UpdateCallback):
             self.info.add('new-object', EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -1359,7 +1376,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1491,7 +1507,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1729,7 +1744,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if 'handle' in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -1925,7 +1939,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs['handle'].replace('_', '')
         is_merge_candidate = (self.replace_import_handle and
@@ -1976,7 +1989,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -2116,7 +2128,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_object(self, *tag):
         self.db.commit_media_object(self.object, self.trans, 
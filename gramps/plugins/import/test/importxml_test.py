@@ -0,0 +1,55 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# plugins/import/test/importxml_test.py
+# $Id$
+
+import unittest
+import importlib
+from cStringIO import StringIO
+
+from test import test_util as tu
+tu.path_append_parent()
+
+importxml = importlib.import_module("gramps.plugins.import.importxml")
+
+PEOPLE = ('<people>' +
+          '<person handle="_a" id="I1"><personref hlink="_b"/></person>' * 5 +
+          '</people>')
+
+class CountPeopleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.read_size = importxml.READ_SIZE
+        # blocks small enough for the tags to be cut in two
+        importxml.READ_SIZE = 5
+
+    def tearDown(self):
+        importxml.READ_SIZE = self.read_size
+
+    def test_count(self):
+        self.assertEqual(importxml.count_people(StringIO(PEOPLE)), 5)
+        self.assertEqual(importxml.count_people(StringIO("<people/>")), 0)
+
+    def test_limit(self):
+        xml_file = StringIO(PEOPLE)
+        self.assertEqual(importxml.count_people(xml_file, 2), 2)
+        self.assertTrue(xml_file.tell() < len(PEOPLE))
+
+if __name__ == "__main__":
+    unittest.main()
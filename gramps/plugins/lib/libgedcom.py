@@ -96,7 +96,6 @@ import codecs
 from gramps.gen.ggettext import gettext as _
 from xml.parsers.expat import ParserCreate
 from collections import defaultdict
-import cStringIO
 from urlparse import urlparse
 
 #------------------------------------------------------------------------
@@ -555,6 +554,13 @@ LDS_STATUS = {
 # Only 09, 0A, 0D are allowed.
 STRIP_DICT = dict.fromkeys(range(9)+range(11, 13)+range(14, 32))
 
+# Number of bytes the readers decode at once, rounded up to the end of a line
+BLOCK_SIZE = 1 << 20
+
+# Splits a block of lines into (level, tag, line_value) tuples. Leading
+# spaces, the spaces after the level and the line terminator are dropped.
+LINE_RE = re.compile(r" *([^ \r\n]*) *([^ \r\n]*) ?([^\n]*?)\r*\n")
+
 #-------------------------------------------------------------------------
 #
 # GEDCOM events to GRAMPS events conversion
@@ -671,6 +677,7 @@ class Lexer(object):
     def __init__(self, ifile):
         self.ifile = ifile
         self.current_list = []
+        self.lines = iter([])
         self.eof = False
         self.cnv = None
         self.cnt = 0
@@ -709,32 +716,41 @@ class Lexer(object):
             new_value = line[2] + data[2]
         self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
 
+    def __read_block(self):
+        """
+        Read the next block of lines from the file and return an iterator
+        over their (level, tag, line_value) tuples, or None at the end of
+        the file.
+        """
+        block = self.ifile.read_block()
+        if not block:
+            return None
+        if block[-1] != '\n':
+            block += '\n'
+        return iter(LINE_RE.findall(block))
+
     def __readahead(self):
         while len(self.current_list) < 5:
-            line = self.ifile.readline()
+            try:
+                (level, tag, line_value) = self.lines.next()
+            except StopIteration:
+                self.lines = self.__read_block()
+                if self.lines is None:
+                    self.lines = iter([])
+                    self.eof = True
+                    return
+                continue
             self.index += 1
-            if not line:
-                self.eof = True
-                return
 
+            # According to the GEDCOM 5.5 standard,
+            # Chapter 1 subsection Grammar
+            #"leading whitespace preceeding a GEDCOM line should be ignored"
+            # LINE_RE drops it, together with the terminator which is any
+            # combination of carriage_return and line_feed, and splits the
+            # line into level+tag+line_value or level+xref_id+rest
             try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar
-                #"leading whitespace preceeding a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(' ').rstrip('\n\r')
-                # split into level+delim+rest
-                line = line.partition(' ')
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                line = line[2].lstrip(' ').partition(' ')
-                tag = line[0]
-                line_value = line[2]
-            except:
+                level = int(level)
+            except ValueError:
                 continue
 
             token = TOKENS.get(tag, TOKEN_UNKNOWN)
@@ -1188,12 +1204,24 @@ class BaseReader(object):
     def reset(self):
         self.ifile.seek(0)
 
-    def readline(self):
-        line = unicode(self.ifile.readline(), 
-                       encoding=self.enc,
-                       errors='replace')
+    def decode(self, data):
+        line = unicode(data, encoding=self.enc, errors='replace')
         return line.translate(STRIP_DICT)
 
+    def readline(self):
+        return self.decode(self.ifile.readline())
+
+    def read_block(self):
+        """
+        Return the next BLOCK_SIZE bytes of the file, completed up to the
+        end of the line, decoded to unicode. Returns an empty string at the
+        end of the file.
+        """
+        data = self.ifile.read(BLOCK_SIZE)
+        if data and data[-1] != '\n':
+            data += self.ifile.readline()
+        return self.decode(data)
+
 class UTF8Reader(BaseReader):
 
     def __init__(self, ifile):
@@ -1206,12 +1234,6 @@ class UTF8Reader(BaseReader):
         if data != "\xef\xbb\xbf":
             self.ifile.seek(0)
 
-    def readline(self):
-        line =  unicode(self.ifile.readline(),
-                       encoding=self.enc,
-                       errors='replace')
-        return line.translate(STRIP_DICT)
-
 class UTF16Reader(BaseReader):
 
     def __init__(self, ifile):
@@ -1226,6 +1248,19 @@ class UTF16Reader(BaseReader):
         else:
             return self.ifile.readline()
 
+    def read_block(self):
+        # the recoded file is read line by line, to keep the handling of
+        # the empty lines above
+        lines = []
+        size = 0
+        while size < BLOCK_SIZE:
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line)
+            size += len(line)
+        return ''.join(lines)
+
 class AnsiReader(BaseReader):
 
     def __init__(self, ifile):
@@ -1443,53 +1478,51 @@ class AnselReader(BaseReader):
          '\xF9\x48' : u'\u1e2a',   '\xF9\x68' : u'\u1e2b',  
        }
 
+    # runs of ASCII bytes are copied in one go, substituting space for
+    # disallowed (control) chars
+    __ascii_run = re.compile(r"[\x00-\x7f]+")
+    __ascii_table = ''.join([c if c in __use_ASCII else ' '
+                             for c in map(chr, range(256))])
+
     @staticmethod
     def __ansel_to_unicode(s):
         """ Convert an ANSEL encoded string to unicode """
-    
-        buff = cStringIO.StringIO()
-        while s:
-            if ord(s[0]) < 128:
-                if s[0] in AnselReader.__use_ASCII:
-                    head = s[0]
-                else:
-                    # substitute space for disallowed (control) chars
-                    head = ' '
-                s = s[1:]
+
+        ans = []
+        pos = 0
+        end = len(s)
+        while pos < end:
+            match = AnselReader.__ascii_run.match(s, pos)
+            if match:
+                ans.append(match.group().translate(AnselReader.__ascii_table))
+                pos = match.end()
+            elif s[pos:pos+2] in AnselReader.__twobyte:
+                ans.append(AnselReader.__twobyte[s[pos:pos+2]])
+                pos += 2
+            elif s[pos] in AnselReader.__onebyte:
+                ans.append(AnselReader.__onebyte[s[pos]])
+                pos += 1
+            elif s[pos] in AnselReader.__acombiners:
+                c = AnselReader.__acombiners[s[pos]]
+                # always consume the combiner
+                pos += 1
+                next = s[pos:pos+1]
+                if next and next in AnselReader.__printable_ascii:
+                    # consume next as well
+                    pos += 1
+                    # unicode: combiner follows base-char
+                    ans.append(next + c)
+                # else just drop the unexpected combiner
             else:
-                if s[0:2] in AnselReader.__twobyte:
-                    head = AnselReader.__twobyte[s[0:2]]
-                    s = s[2:]
-                elif s[0] in AnselReader.__onebyte:
-                    head = AnselReader.__onebyte[s[0]]
-                    s = s[1:]
-                elif s[0] in AnselReader.__acombiners:
-                    c =  AnselReader.__acombiners[s[0]]
-                    # always consume the combiner
-                    s = s[1:]
-                    next = s[0]
-                    if next in AnselReader.__printable_ascii:
-                        # consume next as well
-                        s = s[1:]
-                        # unicode: combiner follows base-char
-                        head = next + c
-                    else:
-                        # just drop the unexpected combiner
-                        continue 
-                else:
-                    head = u'\ufffd' # "Replacement Char"
-                    s = s[1:]
-            # note: cStringIO handles 8-bit strings, only (no unicode)
-            buff.write(head.encode("utf-8"))
-        ans = unicode(buff.getvalue(), "utf-8")
-        buff.close()
-        return ans
+                ans.append(u'\ufffd') # "Replacement Char"
+                pos += 1
+        return u''.join(ans)
 
     def __init__(self, ifile):
         BaseReader.__init__(self, ifile, "")
 
-    def readline(self):
-        return self.__ansel_to_unicode(self.ifile.readline())
+    def decode(self, data):
+        return self.__ansel_to_unicode(data)
     
 #-------------------------------------------------------------------------
 #
@@ -1661,18 +1694,23 @@ class IdFinder(object):
 #-------------------------------------------------------------------------
 class IdMapper(object):
 
-    def __init__(self, trans, find_next, id2user_format):
-        self.trans = trans
+    def __init__(self, dbase, trans_name, find_next, id2user_format):
+        # the gramps_id map is looked up by name each time, as a bulk
+        # transaction replaces it while the file is read
+        self.dbase = dbase
+        self.trans_name = trans_name
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        # the values of swap, to look them up quickly
+        self.used = set()
     
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in self.swap.values():
+            while new_val in self.used:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -1687,16 +1725,18 @@ class IdMapper(object):
                 # have found it. If we had already encountered I0001 and we are
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
-                if self.trans.get(str(formatted_gid)) or \
-                        (formatted_gid in self.swap.values()):
+                trans = getattr(self.dbase, self.trans_name)
+                if trans.get(str(formatted_gid)) or \
+                        (formatted_gid in self.used):
                     new_val = self.find_next()
-                    while new_val in self.swap.values():
+                    while new_val in self.used:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.used.add(new_val)
         return new_val
     
     def clean(self, gid):
@@ -1806,27 +1846,27 @@ class GedcomParser(UpdateCallback):
         self.want_parse_warnings = True
 
         self.pid_map = IdMapper(
-            self.dbase.id_trans, 
+            self.dbase, "id_trans", 
             self.dbase.find_next_person_gramps_id, 
             self.dbase.id2user_format)
         self.fid_map = IdMapper(
-            self.dbase.fid_trans, 
+            self.dbase, "fid_trans", 
             self.dbase.find_next_family_gramps_id, 
             self.dbase.fid2user_format)
         self.sid_map = IdMapper(
-            self.dbase.sid_trans, 
+            self.dbase, "sid_trans", 
             self.dbase.find_next_source_gramps_id, 
             self.dbase.sid2user_format)
         self.oid_map = IdMapper(
-            self.dbase.oid_trans, 
+            self.dbase, "oid_trans", 
             self.dbase.find_next_object_gramps_id, 
             self.dbase.oid2user_format)
         self.rid_map = IdMapper(
-            self.dbase.rid_trans, 
+            self.dbase, "rid_trans", 
             self.dbase.find_next_repository_gramps_id, 
             self.dbase.rid2user_format)
         self.nid_map = IdMapper(
-            self.dbase.nid_trans, 
+            self.dbase, "nid_trans", 
             self.dbase.find_next_note_gramps_id, 
             self.dbase.nid2user_format)
 
@@ -2549,8 +2589,12 @@ class GedcomParser(UpdateCallback):
 
         """
         no_magic = self.maxpeople < 1000
+        # rebuilding all indices at the end only pays off if the import is
+        # at least as large as the family tree
+        bulk = (not no_magic and
+                self.maxpeople >= self.dbase.get_number_of_people())
         with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
-                   no_magic=no_magic) as self.trans:
+                   no_magic=no_magic, bulk=bulk) as self.trans:
 
             self.dbase.disable_signals()
             self.__parse_header_head()
@@ -7357,9 +7401,9 @@ class GedcomStageOne(object):
                 continue
 
             if level == 0 and key[0] == '@':
-                if value == ("FAM", "FAMILY") :
+                if value in ("FAM", "FAMILY") :
                     current_family_id = key.strip()[1:-1]
-                elif value == ("INDI", "INDIVIDUAL"):
+                elif value in ("INDI", "INDIVIDUAL"):
                     self.pcnt += 1
             elif key in ("HUSB", "HUSBAND", "WIFE") and \
                  self.__is_xref_value(value):
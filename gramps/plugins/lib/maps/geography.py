@@ -65,6 +65,7 @@ import constants
 from osmGps import OsmGps
 from selectionlayer import SelectionLayer
 from placeselection import PlaceSelection
+from geoindex import GeoIndex, get_shift
 
 #------------------------------------------------------------------------
 #
@@ -146,6 +147,7 @@ class GeoGraphyView(OsmGps, NavigationView):
         self.without = 0
         self.place_list = []
         self.places_found = []
+        self.marks_index = GeoIndex()
         self.select_fct = None
         self.geo_mainmap = None
         path = os.path.join(ROOT_DIR, "images", "48x48",
@@ -354,47 +356,12 @@ class GeoGraphyView(OsmGps, NavigationView):
         """
         Is there a marker at this position ?
         """
-        found = False
-        mark_selected = []
         self.uistate.set_busy_cursor(True)
-        for mark in self.sort:
-            # as we are not precise with our hand, reduce the precision
-            # depending on the zoom.
-            precision = {
-                          1 : '%3.0f', 2 : '%3.1f', 3 : '%3.1f', 4 : '%3.1f',
-                          5 : '%3.2f', 6 : '%3.2f', 7 : '%3.2f', 8 : '%3.3f',
-                          9 : '%3.3f', 10 : '%3.3f', 11 : '%3.3f', 12 : '%3.3f',
-                         13 : '%3.3f', 14 : '%3.4f', 15 : '%3.4f', 16 : '%3.4f',
-                         17 : '%3.4f', 18 : '%3.4f'
-                         }.get(config.get("geography.zoom"), '%3.1f')
-            shift = {
-                          1 : 5.0, 2 : 5.0, 3 : 3.0,
-                          4 : 1.0, 5 : 0.5, 6 : 0.3, 7 : 0.15,
-                          8 : 0.06, 9 : 0.03, 10 : 0.015,
-                         11 : 0.005, 12 : 0.003, 13 : 0.001,
-                         14 : 0.0005, 15 : 0.0003, 16 : 0.0001,
-                         17 : 0.0001, 18 : 0.0001
-                         }.get(config.get("geography.zoom"), 5.0)
-            latp  = precision % lat
-            lonp  = precision % lon
-            mlatp = precision % float(mark[3])
-            mlonp = precision % float(mark[4])
-            latok = lonok = False
-            _LOG.debug(" compare latitude : %s with %s (precision = %s)"
-                       " place='%s'" % (float(mark[3]), lat, precision,
-                                        mark[0]))
-            _LOG.debug("compare longitude : %s with %s (precision = %s)"
-                       " zoom=%d" % (float(mark[4]), lon, precision,
-                                     config.get("geography.zoom")))
-            if (float(mlatp) >= (float(latp) - shift) ) and \
-               (float(mlatp) <= (float(latp) + shift) ):
-                latok = True
-            if (float(mlonp) >= (float(lonp) - shift) ) and \
-               (float(mlonp) <= (float(lonp) + shift) ):
-                lonok = True
-            if latok and lonok:
-                mark_selected.append(mark)
-                found = True
+        if not self.marks_index.is_index_of(self.sort):
+            self.marks_index.index_list(self.sort, 3, 4)
+        mark_selected = self.marks_index.find(
+                            lat, lon, get_shift(config.get("geography.zoom")))
+        found = len(mark_selected) > 0
         if found:
             self.bubble_message(event, lat, lon, mark_selected)
             # add the first place found to history
@@ -0,0 +1,256 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+A grid index of the markers of the geography views, to find the markers
+near a position and the markers in the visible part of the map.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+from math import floor, ceil, log, tan, pi, degrees, radians
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+# as we are not precise with our hand, the distance in degrees at which a
+# marker is found depends on the zoom.
+ZOOM_SHIFT = {
+               1 : 5.0, 2 : 5.0, 3 : 3.0,
+               4 : 1.0, 5 : 0.5, 6 : 0.3, 7 : 0.15,
+               8 : 0.06, 9 : 0.03, 10 : 0.015,
+              11 : 0.005, 12 : 0.003, 13 : 0.001,
+              14 : 0.0005, 15 : 0.0003, 16 : 0.0001,
+              17 : 0.0001, 18 : 0.0001
+             }
+
+# number of grids kept, one or two are used at each zoom
+_MAX_GRIDS = 4
+
+# the map does not go further north or south
+_MAX_LATITUDE = 85.0511
+
+def get_shift(zoom):
+    """
+    Return the distance in degrees at which a marker is found at zoom.
+    """
+    return ZOOM_SHIFT.get(zoom, 5.0)
+
+def degrees_per_pixel(zoom):
+    """
+    Return the width of a screen pixel in degrees of longitude at zoom. The
+    map is 256 pixels wide at zoom 0. The height of a pixel is the same in
+    the degrees of mercator_y.
+    """
+    return 360.0 / (256 << zoom)
+
+def mercator_y(lat):
+    """
+    Return the latitude lat in degrees projected the way the map is, in
+    degrees of the equator: a distance on the screen is the same number of
+    these degrees up and down as it is degrees of longitude across.
+    """
+    lat = max(-_MAX_LATITUDE, min(float(lat), _MAX_LATITUDE))
+    return degrees(log(tan(pi / 4 + radians(lat) / 2)))
+
+#-------------------------------------------------------------------------
+#
+# GeoIndex
+#
+#-------------------------------------------------------------------------
+class GeoIndex(object):
+    """
+    The items at a latitude and longitude, in grids of square cells.
+
+    A grid is made for each cell size that is asked for, and kept until an
+    item is added. Cell sizes for searches are rounded up to a power of
+    two degrees, so that searches at nearby zooms use the same grid.
+    """
+    def __init__(self):
+        self.points = []
+        self.source = None
+        self.__grids = {}
+        self.__projected = None
+
+    def clear(self):
+        """
+        Remove all items.
+        """
+        self.points = []
+        self.source = None
+        self.__grids = {}
+        self.__projected = None
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, lat, lon, item):
+        """
+        Add an item at the position lat, lon in degrees.
+        """
+        self.points.append((float(lat), float(lon), item))
+        if self.__grids:
+            self.__grids = {}
+        self.__projected = None
+
+    def index_list(self, marks, lat_col, lon_col):
+        """
+        Index the marks of a list of the geography views, of which columns
+        lat_col and lon_col hold the coordinates. The marks are the items.
+        """
+        self.clear()
+        for mark in marks:
+            self.add(mark[lat_col], mark[lon_col], mark)
+        self.source = (marks, len(marks))
+
+    def is_index_of(self, marks):
+        """
+        Return True if the index was made by index_list from marks, and the
+        list did not grow or shrink since.
+        """
+        return (self.source is not None and self.source[0] is marks and
+                self.source[1] == len(marks))
+
+    def __coords(self, projected):
+        """
+        Return the latitude and longitude of the points, with the latitude
+        given by mercator_y if projected is True.
+        """
+        if not projected:
+            return [(lat, lon) for (lat, lon, item) in self.points]
+        if self.__projected is None:
+            self.__projected = [(mercator_y(lat), lon)
+                                for (lat, lon, item) in self.points]
+        return self.__projected
+
+    def __grid(self, cell, projected=False):
+        """
+        Return the grid with the given cell size: a dictionary of cell
+        coordinates to the indexes of the points in the cell, in the order
+        they were added. The cells of a projected grid are square on the
+        screen.
+        """
+        grid = self.__grids.get((cell, projected))
+        if grid is None:
+            if len(self.__grids) >= _MAX_GRIDS:
+                self.__grids = {}
+            grid = self.__grids[(cell, projected)] = {}
+            for index, (lat, lon) in enumerate(self.__coords(projected)):
+                key = (int(floor(lat / cell)), int(floor(lon / cell)))
+                if key in grid:
+                    grid[key].append(index)
+                else:
+                    grid[key] = [index]
+        return grid
+
+    def __cells(self, grid, cell, lat1, lon1, lat2, lon2):
+        """
+        Iterate over the cells of grid that overlap the box with the corners
+        lat1, lon1 and lat2, lon2, where lat1 <= lat2 and lon1 <= lon2.
+        """
+        row1, row2 = int(floor(lat1 / cell)), int(floor(lat2 / cell))
+        col1, col2 = int(floor(lon1 / cell)), int(floor(lon2 / cell))
+        if (row2 - row1 + 1) * (col2 - col1 + 1) > len(grid):
+            # fewer cells are used than the box has
+            for key, indexes in grid.iteritems():
+                if row1 <= key[0] <= row2 and col1 <= key[1] <= col2:
+                    yield indexes
+        else:
+            for row in xrange(row1, row2 + 1):
+                for col in xrange(col1, col2 + 1):
+                    indexes = grid.get((row, col))
+                    if indexes is not None:
+                        yield indexes
+
+    def find(self, lat, lon, shift):
+        """
+        Return the items at most shift degrees of latitude and of longitude
+        away from lat, lon, in the order they were added.
+        """
+        if not self.points:
+            return []
+        cell = 2.0 ** ceil(log(max(shift, 1e-6), 2))
+        grid = self.__grid(cell)
+        found = []
+        points = self.points
+        for indexes in self.__cells(grid, cell, lat - shift, lon - shift,
+                                    lat + shift, lon + shift):
+            for index in indexes:
+                plat, plon, item = points[index]
+                if abs(plat - lat) <= shift and abs(plon - lon) <= shift:
+                    found.append(index)
+        found.sort()
+        return [points[index][2] for index in found]
+
+    def clusters(self, cell, lat1, lon1, lat2, lon2, margin=0.0):
+        """
+        Return the items in the box with the corners lat1, lon1 and
+        lat2, lon2, widened by margin, in clusters of items less than cell
+        apart: a list of lists of (lat, lon, item) tuples.
+
+        The distances and the margin are in degrees of longitude across,
+        and of mercator_y up and down, as they are seen on the map. The
+        first item of a cluster is the first item added that is in no
+        cluster yet, and the others are the items in no cluster yet that are
+        less than cell away from it in both directions.
+        """
+        if lat1 > lat2:
+            lat1, lat2 = lat2, lat1
+        if lon1 > lon2:
+            # the box crosses the date line
+            lon1, lon2 = -180.0, 180.0
+        else:
+            lon1, lon2 = lon1 - margin, lon2 + margin
+        lat1, lat2 = mercator_y(lat1) - margin, mercator_y(lat2) + margin
+        grid = self.__grid(cell, True)
+        coords = self.__coords(True)
+        inside = set()
+        for indexes in self.__cells(grid, cell, lat1, lon1, lat2, lon2):
+            for index in indexes:
+                lat, lon = coords[index]
+                if lat1 <= lat <= lat2 and lon1 <= lon <= lon2:
+                    inside.add(index)
+        # the items near an item are in its cell or in the cells around it,
+        # whichever side of a cell edge they are
+        result = []
+        for index in sorted(inside):
+            if index not in inside:
+                continue
+            lat, lon = coords[index]
+            row, col = int(floor(lat / cell)), int(floor(lon / cell))
+            cluster = []
+            for key in ((row + drow, col + dcol) for drow in (-1, 0, 1)
+                                                 for dcol in (-1, 0, 1)):
+                for other in grid.get(key, ()):
+                    if (other in inside and
+                            abs(coords[other][0] - lat) < cell and
+                            abs(coords[other][1] - lon) < cell):
+                        cluster.append(other)
+            cluster.sort()
+            inside.difference_update(cluster)
+            result.append([self.points[other] for other in cluster])
+        return result
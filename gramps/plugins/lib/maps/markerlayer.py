@@ -52,6 +52,7 @@ import cairo
 # Gramps Modules
 #
 #-------------------------------------------------------------------------
+from geoindex import GeoIndex, degrees_per_pixel
 
 #-------------------------------------------------------------------------
 #
@@ -73,9 +74,15 @@ try:
 except:
     raise
 
+# markers closer than this number of pixels are drawn as one marker
+CLUSTER_SIZE = 16
+
 class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
     """
     This is the layer used to display the markers.
+    Only the markers in the visible part of the map are drawn. Markers that
+    would be drawn on top of each other at the current zoom are drawn as
+    one marker, for the sum of their counts.
     """
     def __init__(self):
         """
@@ -83,6 +90,7 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         """
         GObject.GObject.__init__(self)
         self.markers = []
+        self.index = GeoIndex()
         self.max_references = 0
         self.max_places = 0
         self.nb_ref_by_places = 0
@@ -94,6 +102,7 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         reset the layer attributes.
         """
         self.markers = []
+        self.index.clear()
         self.max_references = 0
         self.max_places = 0
         self.nb_ref_by_places = 0
@@ -108,6 +117,7 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         We calculate that here, to minimize the overhead at markers drawing
         """
         self.markers.append((points, image, count))
+        self.index.add(points[0], points[1], (points, image, count))
         self.max_references += count
         self.max_places += 1
         if count > self.max_value:
@@ -130,11 +140,12 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
             min_interval = 0.01
         _LOG.debug("%s" % time.strftime("start drawing   : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
-        for marker in self.markers:
+        for marker in self.visible_markers(gpsmap):
             ctx.save()
             # the icon size in 48, so the standard icon size is 0.6 * 48 = 28.8
             size = 0.6
-            mark = float(marker[2])
+            # a cluster of markers is not drawn larger than the largest marker
+            mark = float(min(marker[2], self.max_value))
             if mark > self.nb_ref_by_places:
                 # at maximum, we'll have an icon size = (0.6 + 0.3) * 48 = 43.2
                 size += (0.3 * ((mark - self.nb_ref_by_places)
@@ -162,6 +173,32 @@ class MarkerLayer(GObject.GObject, osmgpsmap.MapLayer):
         _LOG.debug("%s" % time.strftime("end drawing     : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
 
+    def visible_markers(self, gpsmap):
+        """
+        Return the markers to draw: the markers in the visible part of the
+        map, with some margin for the icons, clustered at the zoom of the map.
+        A cluster is drawn with the position and the image of its marker with
+        the highest count.
+        """
+        if not self.index:
+            return []
+        step = degrees_per_pixel(gpsmap.props.zoom)
+        margin = 48 * step
+        top_left, bottom_right = gpsmap.get_bbox()
+        lat1, lon1 = top_left.get_degrees()
+        lat2, lon2 = bottom_right.get_degrees()
+        markers = []
+        for cluster in self.index.clusters(CLUSTER_SIZE * step,
+                                           lat1, lon1, lat2, lon2, margin):
+            if len(cluster) == 1:
+                markers.append(cluster[0][2])
+            else:
+                points, image, count = max(cluster,
+                                           key=lambda point: point[2][2])[2]
+                markers.append((points, image,
+                                sum(point[2][2] for point in cluster)))
+        return markers
+
     def do_render(self, gpsmap):
         """
         render the layer
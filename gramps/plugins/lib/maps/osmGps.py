@@ -60,6 +60,7 @@ from lifewaylayer import LifeWayLayer
 from markerlayer import MarkerLayer
 from datelayer import DateLayer
 from messagelayer import MessageLayer
+from geoindex import GeoIndex, get_shift
 from gramps.gen.ggettext import sgettext as _
 from gramps.gen.config import config
 from gramps.gui.dialog import ErrorDialog
@@ -95,6 +96,7 @@ class OsmGps():
         self.end_selection = None
         self.current_map = None
         self.places_found = None
+        self.places_index = GeoIndex()
 
     def build_widget(self):
         """
@@ -335,40 +337,13 @@ class OsmGps():
         oldplace = ""
         _LOG.debug("%s" % time.strftime("start is_there_a_place_here : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
-        for mark in self.places_found:
-            # as we are not precise with our hand, reduce the precision
-            # depending on the zoom.
+        if not self.places_index.is_index_of(self.places_found):
+            self.places_index.index_list(self.places_found, 1, 2)
+        shift = get_shift(config.get("geography.zoom"))
+        for mark in self.places_index.find(lat, lon, shift):
             if mark[0] != oldplace:
                 oldplace = mark[0]
-                precision = {
-                              1 : '%3.0f', 2 : '%3.1f', 3 : '%3.1f',
-                              4 : '%3.1f', 5 : '%3.2f', 6 : '%3.2f',
-                              7 : '%3.2f', 8 : '%3.3f', 9 : '%3.3f',
-                             10 : '%3.3f', 11 : '%3.3f', 12 : '%3.3f',
-                             13 : '%3.3f', 14 : '%3.4f', 15 : '%3.4f',
-                             16 : '%3.4f', 17 : '%3.4f', 18 : '%3.4f'
-                             }.get(config.get("geography.zoom"), '%3.1f')
-                shift = {
-                          1 : 5.0, 2 : 5.0, 3 : 3.0,
-                          4 : 1.0, 5 : 0.5, 6 : 0.3, 7 : 0.15,
-                          8 : 0.06, 9 : 0.03, 10 : 0.015,
-                         11 : 0.005, 12 : 0.003, 13 : 0.001,
-                         14 : 0.0005, 15 : 0.0003, 16 : 0.0001,
-                         17 : 0.0001, 18 : 0.0001
-                         }.get(config.get("geography.zoom"), 5.0)
-                latp  = precision % lat
-                lonp  = precision % lon
-                mlatp = precision % float(mark[1])
-                mlonp = precision % float(mark[2])
-                latok = lonok = False
-                if (float(mlatp) >= (float(latp) - shift) ) and \
-                   (float(mlatp) <= (float(latp) + shift) ):
-                    latok = True
-                if (float(mlonp) >= (float(lonp) - shift) ) and \
-                   (float(mlonp) <= (float(lonp) + shift) ):
-                    lonok = True
-                if latok and lonok:
-                    mark_selected.append(mark)
+                mark_selected.append(mark)
         _LOG.debug("%s" % time.strftime("  end is_there_a_place_here : "
                    "%a %d %b %Y %H:%M:%S", time.gmtime()))
         return mark_selected
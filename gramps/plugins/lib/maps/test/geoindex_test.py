@@ -0,0 +1,104 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# plugins/lib/maps/test/geoindex_test.py
+# $Id$
+
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from ..geoindex import GeoIndex, mercator_y, degrees_per_pixel
+
+def items(clusters):
+    return sorted([item for (lat, lon, item) in cluster]
+                  for cluster in clusters)
+
+class GeoIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GeoIndex()
+
+    def test_find(self):
+        for (lat, lon, item) in [(10.0, 20.0, "a"), (10.4, 19.7, "b"),
+                                 (10.6, 20.0, "c"), (-10.0, 20.0, "d"),
+                                 (10.0, 20.0, "e")]:
+            self.index.add(lat, lon, item)
+        self.assertEqual(self.index.find(10.0, 20.0, 0.5), ["a", "b", "e"])
+        self.assertEqual(self.index.find(10.0, 20.0, 0.001), ["a", "e"])
+        self.assertEqual(self.index.find(0.0, 0.0, 1.0), [])
+        self.assertEqual(GeoIndex().find(0.0, 0.0, 1.0), [])
+
+    def test_index_list(self):
+        marks = [["a", "1.5", "2.5"], ["b", "3.0", "4.0"]]
+        self.index.index_list(marks, 1, 2)
+        self.assertTrue(self.index.is_index_of(marks))
+        self.assertEqual(self.index.find(1.5, 2.5, 0.1), [marks[0]])
+        marks.append(["c", "0", "0"])
+        self.assertFalse(self.index.is_index_of(marks))
+        self.assertFalse(self.index.is_index_of(list(marks)))
+
+    def test_mercator_y(self):
+        self.assertAlmostEqual(mercator_y(0.0), 0.0)
+        self.assertAlmostEqual(mercator_y(85.0511), 180.0, 2)
+        self.assertEqual(mercator_y(90.0), mercator_y(85.0511))
+        # a pixel at latitude 60 is half as high in degrees of latitude
+        step = degrees_per_pixel(10)
+        self.assertAlmostEqual((mercator_y(60.0 + step / 2) -
+                                mercator_y(60.0)) / step, 1.0, 3)
+
+    def test_clusters_across_cells(self):
+        # the cells of size 1.0 have an edge at longitude 1.0
+        self.index.add(0.5, 0.999, "a")
+        self.index.add(0.5, 1.001, "b")
+        self.index.add(0.5, 2.5, "c")
+        self.assertEqual(items(self.index.clusters(1.0, -10, -10, 10, 10)),
+                         [["a", "b"], ["c"]])
+
+    def test_clusters_latitude(self):
+        # 0.7 degrees of latitude are 1.4 degrees of mercator_y at 60
+        self.index.add(0.0, 0.0, "a")
+        self.index.add(0.7, 0.0, "b")
+        self.index.add(60.0, 0.0, "c")
+        self.index.add(60.7, 0.0, "d")
+        self.assertEqual(items(self.index.clusters(1.0, -80, -10, 80, 10)),
+                         [["a", "b"], ["c"], ["d"]])
+
+    def test_clusters_chain(self):
+        # a cluster is not chained on from item to item
+        for lon in (0.0, 0.8, 1.6, 2.4):
+            self.index.add(0.0, lon, lon)
+        self.assertEqual(items(self.index.clusters(1.0, -10, -10, 10, 10)),
+                         [[0.0, 0.8], [1.6, 2.4]])
+
+    def test_clusters_box(self):
+        self.index.add(0.0, 0.0, "a")
+        self.index.add(0.0, 5.0, "b")
+        self.index.add(0.0, 179.5, "c")
+        self.index.add(0.0, -179.5, "d")
+        self.assertEqual(items(self.index.clusters(0.1, -1, -1, 1, 1)),
+                         [["a"]])
+        self.assertEqual(items(self.index.clusters(0.1, -1, -1, 1, 1, 4.5)),
+                         [["a"], ["b"]])
+        # the box crosses the date line
+        self.assertEqual(items(self.index.clusters(0.1, 1, 179, -1, -179)),
+                         [["a"], ["b"], ["c"], ["d"]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# plugins/lib/test/libgedcom_test.py
+# $Id$
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from test import test_util as tu
+tu.path_append_parent()
+
+from gramps.gen.db import DbBsddb, DbTxn
+from gramps.gen.lib import Person
+from gramps.cli.user import User
+from ..libgedcom import GedcomParser, GedcomStageOne
+
+# enough people for the import to be done in a bulk transaction
+PEOPLE = 1000
+
+def make_gedcom(fname, people):
+    """
+    Write a GEDCOM file of people people, in families of a father, a
+    mother and a child.
+    """
+    ofile = open(fname, "w")
+    ofile.write("0 HEAD\n1 SOUR test\n1 GEDC\n2 VERS 5.5\n"
+                "2 FORM LINEAGE-LINKED\n1 CHAR UTF-8\n")
+    for index in xrange(1, people + 1):
+        ofile.write("0 @I%d@ INDI\n1 NAME Given%d /Surname%d/\n" %
+                    (index, index, index / 3))
+    for index in xrange(1, people - 1, 3):
+        ofile.write("0 @F%d@ FAM\n1 HUSB @I%d@\n1 WIFE @I%d@\n"
+                    "1 CHIL @I%d@\n" % (index, index, index + 1, index + 2))
+    ofile.write("0 TRLR\n")
+    ofile.close()
+
+class QuietUser(User):
+    def __init__(self):
+        User.__init__(self, callback=lambda *args: None)
+    def begin_progress(self, title, message, steps):
+        pass
+    def step_progress(self):
+        pass
+    def end_progress(self):
+        pass
+    def info(self, msg1, infotext, parent=None, monospaced=False):
+        self.infotext = infotext
+
+class GedcomStageOneTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.fname = os.path.join(self.path, "stage_one.ged")
+        make_gedcom(self.fname, 30)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_counts(self):
+        # the number of people decides whether the import is a bulk one
+        ifile = open(self.fname, "rU")
+        try:
+            stage_one = GedcomStageOne(ifile)
+            stage_one.parse()
+        finally:
+            ifile.close()
+        self.assertEqual(stage_one.get_person_count(), 30)
+        self.assertEqual(stage_one.get_fams_map()["I1"], ["F1"])
+        self.assertEqual(stage_one.get_fams_map()["I2"], ["F1"])
+        self.assertEqual(stage_one.get_famc_map()["I30"], ["F28"])
+
+class GedcomImportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.fname = os.path.join(self.path, "bulk.ged")
+        make_gedcom(self.fname, PEOPLE)
+        self.db = DbBsddb()
+        self.db.load(os.path.join(self.path, "tree"), None)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.path)
+
+    def import_gedcom(self):
+        ifile = open(self.fname, "rU")
+        try:
+            stage_one = GedcomStageOne(ifile)
+            stage_one.parse()
+            ifile.seek(0)
+            parser = GedcomParser(self.db, ifile, self.fname, QuietUser(),
+                                  stage_one, False)
+            parser.parse_gedcom_file(False)
+        finally:
+            ifile.close()
+
+    def check_family(self, father_id, mother_id, child_id):
+        father = self.db.get_person_from_gramps_id(father_id)
+        mother = self.db.get_person_from_gramps_id(mother_id)
+        child = self.db.get_person_from_gramps_id(child_id)
+        family = self.db.get_family_from_handle(
+            father.get_family_handle_list()[0])
+        self.assertEqual(family.get_mother_handle(), mother.get_handle())
+        self.assertEqual([ref.ref for ref in family.get_child_ref_list()],
+                         [child.get_handle()])
+
+    def test_bulk_import_empty_tree(self):
+        self.import_gedcom()
+        self.assertEqual(self.db.get_number_of_people(), PEOPLE)
+        self.assertEqual(self.db.get_number_of_families(), PEOPLE / 3)
+        self.check_family("I0001", "I0002", "I0003")
+        self.check_family("I0997", "I0998", "I0999")
+        person = self.db.get_person_from_gramps_id("I1000")
+        self.assertEqual(person.get_primary_name().get_first_name(),
+                         "Given1000")
+
+    def test_bulk_import_ids_in_use(self):
+        # I0001 and I0002 are taken, the people of the file with these ids
+        # get new ones
+        with DbTxn("add people", self.db) as trans:
+            for gramps_id in ["I0001", "I0002"]:
+                person = Person()
+                person.set_gramps_id(gramps_id)
+                self.db.add_person(person, trans)
+        self.import_gedcom()
+        self.assertEqual(self.db.get_number_of_people(), PEOPLE + 2)
+        self.assertEqual(self.db.get_number_of_families(), PEOPLE / 3)
+        self.check_family("I0004", "I0005", "I0006")
+        person = self.db.get_person_from_gramps_id("I0001")
+        self.assertEqual(person.get_family_handle_list(), [])
+
+if __name__ == "__main__":
+    unittest.main()
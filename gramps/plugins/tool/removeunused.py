@@ -273,9 +273,9 @@ class RemoveUnused(tool.Tool, ManagedWindow, UpdateCallback):
 
             with cursor_func() as cursor:
                 self.set_total(total_func())
-                fbh = db.find_backlink_handles
+                count = db.get_backlink_count
                 for handle, data in cursor:
-                    if not any(h for h in fbh(handle)):
+                    if not count(handle):
                         self.add_results((the_type, handle, data))
                     self.update()
             self.reset()
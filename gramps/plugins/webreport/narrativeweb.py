@@ -56,6 +56,10 @@ import shutil
 import codecs
 import tarfile
 import tempfile
+import multiprocessing
+import cPickle as pickle
+import json
+from itertools import izip
 from cStringIO import StringIO
 from textwrap import TextWrapper
 from unicodedata import normalize
@@ -81,7 +85,8 @@ from gramps.gen.lib import (ChildRefType, Date, EventType, FamilyRelType, Name,
                             NameType, Person, UrlType, NoteType,
                             EventRoleType)
 from gramps.gen.lib.date import Today, get_start_day
-from gramps.gen.const import PROGRAM_NAME, URL_HOMEPAGE, USER_HOME, VERSION
+from gramps.gen.const import (PROGRAM_NAME, URL_HOMEPAGE, USER_HOME, VERSION,
+                               HOME_DIR)
 from gramps.gen.sort import Sort
 from gramps.gen.plug.menu import PersonOption, NumberOption, StringOption, \
                           BooleanOption, EnumeratedListOption, FilterOption, \
@@ -90,6 +95,7 @@ from gramps.gen.plug.report import ( Report, Bibliography)
 from gramps.gen.plug.report import utils as ReportUtils
 from gramps.gen.plug.report import MenuReportOptions
                         
+from gramps.gen.config import config
 from gramps.gen.utils.config import get_researcher
 from gramps.gen.utils.string import confidence
 from gramps.gen.utils.file import media_path_full
@@ -101,6 +107,9 @@ from gramps.gen.mime import get_description
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.datehandler import displayer as _dd
 from gramps.gen.proxy import PrivateProxyDb, LivingProxyDb
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.gen.db import DbBsddb, DbBsddbSnapshot
+from gramps.gen.user import User
 from gramps.plugins.lib.libhtmlconst import _CHARACTER_SETS, _CC, _COPY_OPTIONS
 
 # import HTML Class from src/plugins/lib/libhtml.py
@@ -502,11 +511,11 @@ def copy_thumbnail(report, handle, photo, region=None):
         )
     
     if photo.get_mime_type():
-        from_path = get_thumbnail_path(media_path_full(
-                                                  report.database,
-                                                  photo.get_path()),
-                                                  photo.get_mime_type(),
-                                                  region)
+        full_path = media_path_full(report.database, photo.get_path())
+        # the cached thumbnail is made again when the media file changes
+        report.inputs.add_file(full_path)
+        from_path = get_thumbnail_path(full_path, photo.get_mime_type(),
+                                       region)
         if not os.path.isfile(from_path):
             from_path = CSS["Document"]["filename"]
     else:
@@ -4148,9 +4157,9 @@ class MediaPage(BasePage):
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
                 if not os.path.isdir(to_dir):
-                    os.makedirs(to_dir)
-                shutil.copyfile(fullpath,
-                                os.path.join(self.html_dir, newpath))
+                    _make_dirs(to_dir)
+                self.report.inputs.add_file(fullpath)
+                self.report.update_file(fullpath, newpath)
             return newpath
         except (IOError, OSError), msg:
             error = _("Missing media object:") +                               \
@@ -6848,6 +6857,326 @@ class AddressBookPage(BasePage):
         # and close the file
         self.XHTMLWriter(addressbookpage, of, sio)
 
+#-------------------------------------------------------------------------
+#
+# Writing pages in helper processes
+#
+#-------------------------------------------------------------------------
+_PAGE_CHUNK_SIZE = 100  # Number of pages written by a helper in one go
+_MIN_PAGES = 500        # Fewer pages are not worth starting helpers for
+
+# Report of a helper process, set by _init_page_writer
+_REPORT = None
+
+def _make_dirs(path):
+    """
+    Create the directory path and its parents, which helper processes
+    writing pages may be creating at the same time.
+    """
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+class _LinkList(list):
+    """
+    The links of the pages that refer to an object, which logs the links
+    appended to it.
+    """
+    def __init__(self, log, handle, links):
+        list.__init__(self, links)
+        self.__log = log
+        self.__handle = handle
+
+    def append(self, lnk):
+        list.append(self, lnk)
+        self.__log.append((self.__handle, lnk))
+
+class _LinkMap(dict):
+    """
+    A map of object handles to the links of the pages that refer to the
+    objects, such as the place_list, source_list and photo_list of the
+    report, which logs the links added to it, in order.
+    """
+    def __init__(self, links):
+        dict.__init__(self, links)
+        self.log = []
+
+    def __getitem__(self, handle):
+        links = dict.__getitem__(self, handle)
+        if not isinstance(links, _LinkList):
+            links = _LinkList(self.log, handle, links)
+            dict.__setitem__(self, handle, links)
+        return links
+
+    def __setitem__(self, handle, links):
+        dict.__setitem__(self, handle, _LinkList(self.log, handle, links))
+        self.log.extend((handle, lnk) for lnk in links)
+
+def _add_links(links, log):
+    """
+    Add the links logged by a _LinkMap to the map links, the way the pages
+    add them.
+    """
+    for handle, lnk in log:
+        if handle in links:
+            if lnk not in links[handle]:
+                links[handle].append(lnk)
+        else:
+            links[handle] = [lnk]
+
+class _HelperUser(User):
+    """
+    The user of a helper process, which cannot show dialogs. Warnings are
+    logged instead.
+    """
+    def warn(self, title, warning=""):
+        log.warning("%s %s" % (title, warning))
+
+def _init_page_writer(report, path):
+    global _REPORT
+    database = DbBsddbSnapshot()
+    database.load(path)
+    report.database = report.proxy_database(database)
+    report.user = _HelperUser()
+    _REPORT = report
+
+def _write_page_chunk(args):
+    method, chunk = args
+    return [_REPORT.write_page(method, item) for item in chunk]
+
+#-------------------------------------------------------------------------
+#
+# Writing only the pages that changed
+#
+#-------------------------------------------------------------------------
+_MANIFEST_DIR = os.path.join(HOME_DIR, "narrativeweb")
+_MANIFEST_VERSION = 2   # Version of the saved manifest
+
+def _manifest_path(dir_name):
+    """
+    Return the file of the manifest of the report written to the directory
+    dir_name. It is kept out of the directory, which is published.
+    """
+    path = os.path.realpath(dir_name)
+    if isinstance(path, unicode):
+        path = path.encode('utf-8')
+    return os.path.join(_MANIFEST_DIR, md5(path).hexdigest() + ".json")
+
+def _input_value(value):
+    """
+    Return the value of an input of a page that the manifest keeps: a
+    digest of the serialized objects, which changes with their contents and
+    change stamps, and tuples for lists.
+    """
+    if hasattr(value, 'serialize'):
+        return md5(pickle.dumps(value.serialize(), 2)).hexdigest()
+    elif isinstance(value, list):
+        return tuple(value)
+    return value
+
+def _tuples(value):
+    """
+    Return value with its lists, as read from a JSON file, made tuples again.
+    """
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+def _file_stamp(path):
+    """
+    Return the size and modification time of the file path, or None if
+    there is no such file.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime)
+
+def _copy_if_changed(from_fname, dest):
+    """
+    Copy the file from_fname to dest, unless dest is a copy of it made
+    after it last changed.
+    """
+    from_stamp = _file_stamp(from_fname)
+    dest_stamp = _file_stamp(dest)
+    if (from_stamp is None or dest_stamp is None or
+            dest_stamp[0] != from_stamp[0] or dest_stamp[1] < from_stamp[1]):
+        shutil.copyfile(from_fname, dest)
+
+class _PageInputs(object):
+    """
+    The inputs of the page being written, by key: the objects it reads, the
+    backlinks it finds, the report lists it looks handles up in, the links
+    of the pages that refer to it, and the media files it copies.
+    """
+    def __init__(self):
+        self.values = None
+
+    def start(self):
+        """
+        Start recording the inputs of a page.
+        """
+        self.values = {}
+
+    def stop(self):
+        """
+        Stop recording, and return the inputs recorded since start.
+        """
+        values, self.values = self.values, None
+        return values
+
+    def add(self, key, value):
+        if self.values is not None and key not in self.values:
+            self.values[key] = _input_value(value)
+
+    def add_file(self, path):
+        key = ('file', path)
+        if self.values is not None and key not in self.values:
+            self.values[key] = _file_stamp(path)
+
+class _InputRecorderDb(ProxyDbBase):
+    """
+    A proxy that adds the objects read through it and the backlinks found
+    to the inputs of the page being written.
+    """
+    def __init__(self, dbase, inputs):
+        ProxyDbBase.__init__(self, dbase)
+        self.inputs = inputs
+
+    def _f(method_name):
+        """
+        Closure that returns an accessor that records what it returns.
+        """
+        def g(self, *args):
+            value = getattr(self.db, method_name)(*args)
+            self.inputs.add(('db', method_name, args), value)
+            return value
+        return g
+
+    get_person_from_handle       = _f('get_person_from_handle')
+    get_family_from_handle       = _f('get_family_from_handle')
+    get_event_from_handle        = _f('get_event_from_handle')
+    get_place_from_handle        = _f('get_place_from_handle')
+    get_source_from_handle       = _f('get_source_from_handle')
+    get_citation_from_handle     = _f('get_citation_from_handle')
+    get_object_from_handle       = _f('get_object_from_handle')
+    get_repository_from_handle   = _f('get_repository_from_handle')
+    get_note_from_handle         = _f('get_note_from_handle')
+    get_tag_from_handle          = _f('get_tag_from_handle')
+    get_person_from_gramps_id    = _f('get_person_from_gramps_id')
+    get_family_from_gramps_id    = _f('get_family_from_gramps_id')
+    get_event_from_gramps_id     = _f('get_event_from_gramps_id')
+    get_place_from_gramps_id     = _f('get_place_from_gramps_id')
+    get_source_from_gramps_id    = _f('get_source_from_gramps_id')
+    get_citation_from_gramps_id  = _f('get_citation_from_gramps_id')
+    get_object_from_gramps_id    = _f('get_object_from_gramps_id')
+    get_repository_from_gramps_id = _f('get_repository_from_gramps_id')
+    get_note_from_gramps_id      = _f('get_note_from_gramps_id')
+    get_name_group_mapping       = _f('get_name_group_mapping')
+    del _f
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        if include_classes is not None:
+            include_classes = tuple(include_classes)
+        backlinks = list(self.db.find_backlink_handles(handle,
+                                                       include_classes))
+        self.inputs.add(('db', 'find_backlink_handles',
+                         (handle, include_classes)), backlinks)
+        return iter(backlinks)
+
+class _MemberList(list):
+    """
+    A list of handles of the report, such as the people of the report,
+    which adds the handles looked up in it to the inputs of the page being
+    written.
+    """
+    def __init__(self, name, handles, inputs):
+        list.__init__(self, handles)
+        self.name = name
+        self.inputs = inputs
+
+    def __contains__(self, handle):
+        found = list.__contains__(self, handle)
+        self.inputs.add(('in', self.name, handle), found)
+        return found
+
+class _MemberDict(dict):
+    """
+    A dictionary of handles of the report, which adds the handles looked up
+    in it to the inputs of the page being written.
+    """
+    def __init__(self, name, handles, inputs):
+        dict.__init__(self, handles)
+        self.name = name
+        self.inputs = inputs
+
+    def __contains__(self, handle):
+        found = dict.__contains__(self, handle)
+        self.inputs.add(('in', self.name, handle), found)
+        return found
+
+class _Manifest(object):
+    """
+    The files that a report wrote to its directory, and for each page of an
+    object, its inputs, its files, and the links it added to the place,
+    source and media lists of the report.
+
+    The pages are only kept when the report is written again with the same
+    signature, which covers the options of the report.
+    """
+    def __init__(self):
+        self.pages = {}
+        self.files = set()
+
+    def load(self, filename, signature):
+        """
+        Load the manifest saved in filename. The pages are dropped if they
+        were saved with another signature. Return True if the pages were
+        loaded.
+        """
+        self.pages = {}
+        self.files = set()
+        try:
+            with open(filename, 'rb') as manifest_file:
+                data = json.load(manifest_file)
+            if data["version"] != _MANIFEST_VERSION:
+                return False
+            files = set(data["files"])
+            if data["signature"] != signature:
+                self.files = files
+                return False
+            pages = {}
+            for key, (inputs, page_files, logs) in data["pages"]:
+                if inputs is not None:
+                    inputs = dict((_tuples(input_key), _tuples(value))
+                                  for (input_key, value) in inputs)
+                pages[_tuples(key)] = (inputs, page_files,
+                                       [_tuples(log) for log in logs])
+        except (IOError, ValueError, TypeError, KeyError):
+            return False
+        self.files = files
+        self.pages = pages
+        return True
+
+    def save(self, filename, signature):
+        """
+        Save the manifest to filename, with the signature of the report.
+        """
+        pages = []
+        for key, (inputs, page_files, logs) in self.pages.iteritems():
+            if inputs is not None:
+                inputs = inputs.items()
+            pages.append((key, (inputs, page_files, logs)))
+        _make_dirs(os.path.dirname(filename))
+        with open(filename, 'wb') as manifest_file:
+            json.dump({"version": _MANIFEST_VERSION,
+                       "signature": signature,
+                       "pages": pages,
+                       "files": sorted(self.files)}, manifest_file)
+
 class NavWebReport(Report):
     
     def __init__(self, database, options, user):
@@ -6870,19 +7199,17 @@ class NavWebReport(Report):
             menuopt = menu.get_option_by_name(optname)
             self.options[optname] = menuopt.get_value()
 
-        if not self.options['incpriv']:
-            self.database = PrivateProxyDb(database)
-        else:
-            self.database = database
+        # the inputs of the page being written, and the pages and files of
+        # the last report written to the directory
+        self.inputs = _PageInputs()
+        self.manifest = _Manifest()
+        self.incremental = False
+        self.pages = {}
+        self.written_files = []
+        self.member_lists = {}
 
-        livinginfo = self.options['living']
-        yearsafterdeath = self.options['yearsafterdeath']
-
-        if livinginfo != _INCLUDE_LIVING_VALUE:
-            self.database = LivingProxyDb(self.database,
-                                          livinginfo,
-                                          None,
-                                          yearsafterdeath)
+        self.real_database = database
+        self.database = self.proxy_database(database)
 
         filters_option = menu.get_option_by_name('filter')
         self.filter = filters_option.get_filter()
@@ -6972,6 +7299,181 @@ class NavWebReport(Report):
             self.html_dir = self.target_path
         self.warn_dir = True        # Only give warning once.
         self.photo_list = {}
+        self.place_list = {}
+        self.source_list = {}
+
+    def proxy_database(self, database):
+        """
+        Return the database with the proxies the options ask for.
+        """
+        if not self.options['incpriv']:
+            database = PrivateProxyDb(database)
+
+        livinginfo = self.options['living']
+        yearsafterdeath = self.options['yearsafterdeath']
+
+        if livinginfo != _INCLUDE_LIVING_VALUE:
+            database = LivingProxyDb(database,
+                                     livinginfo,
+                                     None,
+                                     yearsafterdeath)
+        return _InputRecorderDb(database, self.inputs)
+
+    def write_pages(self, method, items):
+        """
+        Write a page for each item of the list items with the method of the
+        given name, and step the progress after each page.
+
+        The pages are written by a pool of helper processes when the
+        behavior.report-processes preference is set, the report is written
+        to a directory, and the database is a BSDDB family tree. The links
+        that the pages add to the place, source and media lists are added
+        in the order of items, so the output is the same as when the pages
+        are written in turn.
+        """
+        if not self.write_pages_parallel(method, items):
+            for item in items:
+                self.pages[(method, item)] = self.write_page(method, item)
+                self.user.step_progress()
+
+    def write_pages_parallel(self, method, items):
+        """
+        Write the pages of write_pages in helper processes. Return False if
+        they must be written in this process.
+        """
+        processes = config.get('behavior.report-processes')
+        if (processes < 2 or win() or self.archive or
+                not isinstance(self.real_database, DbBsddb) or
+                len(items) < _MIN_PAGES or
+                not self.real_database.checkpoint()):
+            return False
+
+        chunks = [(method, items[index:index + _PAGE_CHUNK_SIZE])
+                  for index in xrange(0, len(items), _PAGE_CHUNK_SIZE)]
+        log.debug("writing %d pages in %d chunks with %d processes" %
+                  (len(items), len(chunks), processes))
+
+        pool = multiprocessing.Pool(processes, _init_page_writer,
+                            (self, self.real_database.get_save_path()))
+        try:
+            for (method, chunk), entries in izip(chunks,
+                                    pool.imap(_write_page_chunk, chunks)):
+                for item, entry in izip(chunk, entries):
+                    inputs, files, logs = entry
+                    _add_links(self.place_list, logs[0])
+                    _add_links(self.source_list, logs[1])
+                    _add_links(self.photo_list, logs[2])
+                    self.written_files.extend(files)
+                    self.pages[(method, item)] = entry
+                    self.user.step_progress()
+        except:
+            pool.terminate()
+            pool.join()
+            raise
+        pool.close()
+        pool.join()
+        return True
+
+    def write_page(self, method, item):
+        """
+        Write the page of item with the method of the given name, unless the
+        report written before to the directory wrote it with the same
+        inputs, and its files are still there.
+
+        Return the entry of the page for the manifest: its inputs, the files
+        it wrote, and the logs of the links it added to the place, source
+        and media lists.
+        """
+        lists = (self.place_list, self.source_list, self.photo_list)
+        for links in lists:
+            del links.log[:]
+        entry = self.manifest.pages.get((method, item))
+        if entry is not None and self.is_current(entry):
+            inputs, files, logs = entry
+            for links, log in izip(lists, logs):
+                _add_links(links, log)
+            self.written_files.extend(files)
+        else:
+            start = len(self.written_files)
+            if self.incremental:
+                self.inputs.start()
+            try:
+                getattr(self, method)(item)
+            finally:
+                inputs = self.inputs.stop()
+            entry = (inputs, self.written_files[start:],
+                     [links.log[:] for links in lists])
+        for links in lists:
+            del links.log[:]
+        return entry
+
+    def is_current(self, entry):
+        """
+        Return True if the page of the manifest entry is up to date.
+        """
+        inputs, files, logs = entry
+        if inputs is None:
+            return False
+        for fname in files:
+            if not os.path.isfile(os.path.join(self.html_dir, fname)):
+                return False
+        for key, value in inputs.iteritems():
+            if self.get_input(key) != value:
+                return False
+        return True
+
+    def get_input(self, key):
+        """
+        Return the current value of an input of a page.
+        """
+        kind = key[0]
+        if kind == 'db':
+            method, args = key[1:]
+            value = getattr(self.database.db, method)(*args)
+            if method == 'find_backlink_handles':
+                value = list(value)
+        elif kind == 'in':
+            name, handle = key[1:]
+            value = handle in self.member_lists[name]
+        elif kind == 'links':
+            name, handle = key[1:]
+            value = getattr(self, name).get(handle, [])
+        elif kind == 'file':
+            return _file_stamp(key[1])
+        else:
+            raise KeyError(key)
+        return _input_value(value)
+
+    def member_list(self, name, handles):
+        """
+        Return the list or dictionary handles of the report, which records
+        the handles that pages look up in it.
+        """
+        if isinstance(handles, dict):
+            members = _MemberDict(name, handles, self.inputs)
+        else:
+            members = _MemberList(name, handles, self.inputs)
+        self.member_lists[name] = members
+        return members
+
+    def get_signature(self):
+        """
+        Return the signature of the manifest: a digest of what all the
+        pages depend on, such as the options of the report.
+        """
+        researcher = get_researcher()
+        return md5(repr((VERSION, sorted(self.options.iteritems()),
+                         researcher.serialize(), _nd.get_default_format(),
+                         locale.getlocale(locale.LC_COLLATE),
+                         # the dates are written by _dd, and the text is
+                         # translated in the language of the environment
+                         _dd.__class__.__name__, _dd.format, xml_lang(),
+                         [os.environ.get(var) for var in ("LANGUAGE",
+                                                          "LC_ALL",
+                                                          "LC_MESSAGES",
+                                                          "LANG")],
+                         # whether people are alive depends on the date
+                         time.localtime()[0]))).hexdigest()
 
     def write_report(self):
 
@@ -7030,22 +7532,36 @@ class NavWebReport(Report):
                             str(value))
                 return
 
+            # the pages of objects whose inputs did not change since the
+            # last report are not written again
+            self.incremental = True
+            manifest_path = _manifest_path(dir_name)
+            self.manifest.load(manifest_path, self.get_signature())
+            # the manifest is saved again when the report is complete
+            try:
+                os.remove(manifest_path)
+            except OSError:
+                pass
+
         # copy all of the neccessary files for NarrativeWeb report...
         self.copy_narrated_files()
 
         # Build the person list
-        ind_list = self.build_person_list()
+        ind_list = self.ind_list = self.member_list('ind_list',
+                                                    self.build_person_list())
 
         # initialize place_lat_long variable for use in Family Map Pages
         place_lat_long = []
 
-        place_list = {}
-        source_list = {}
+        # the pages add links to themselves to these lists
+        place_list = self.place_list = _LinkMap({})
+        source_list = self.source_list = _LinkMap({})
+        self.photo_list = _LinkMap({})
 
         self.base_pages()
 
         # for use with discovering biological, half, and step siblings for use in display_ind_parents()...
-        rel_class = get_relationship_calculator()
+        rel_class = self.rel_class = get_relationship_calculator()
 
         # build classes IndividualListPage and IndividualPage
         self.person_pages(ind_list, place_list, source_list, place_lat_long, rel_class)
@@ -7087,8 +7603,13 @@ class NavWebReport(Report):
             self.addressbook_pages(ind_list)
 
         # for use in class SourcePage's Citations Referents section...
-        database_handles_list = (db_family_handles, db_event_handles, db_place_handles,
-                db_repository_handles, db_media_handles)
+        database_handles_list = (
+                self.member_list('db_family_handles', db_family_handles),
+                self.member_list('db_event_handles', db_event_handles),
+                self.member_list('db_place_handles', db_place_handles),
+                self.member_list('db_repository_handles', db_repository_handles),
+                self.member_list('db_media_handles', db_media_handles))
+        self.database_handles_list = database_handles_list
 
         # build classes SourceListPage and SourcePage
         # has been moved so that all Sources can be found before processing...
@@ -7097,6 +7618,8 @@ class NavWebReport(Report):
         # if an archive is being used, close it?
         if self.archive:
             self.archive.close()
+        else:
+            self.save_manifest(dir_name)
         
         if len(_WRONGMEDIAPATH) > 0:
             error = '\n'.join([_('ID=%(grampsid)s, path=%(dir)s') % {
@@ -7123,8 +7646,35 @@ class NavWebReport(Report):
         self.user.end_progress()
         for handle in ind_list:
             self.person_handles[handle] = True
+        self.person_handles = self.member_list('person_handles',
+                                               self.person_handles)
         return ind_list
 
+    def save_manifest(self, dir_name):
+        """
+        Remove the files of the last report to the directory dir_name that
+        this one did not write, and save the manifest of this report.
+        """
+        written_files = set(os.path.normpath(fname)
+                            for fname in self.written_files)
+        root = os.path.join(os.path.realpath(dir_name), '')
+        for fname in self.manifest.files - written_files:
+            path = os.path.realpath(os.path.join(dir_name, fname))
+            # only the files of the report are removed
+            if not path.startswith(root):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.manifest.pages = self.pages
+        self.manifest.files = written_files
+        try:
+            self.manifest.save(_manifest_path(dir_name),
+                               self.get_signature())
+        except (IOError, OSError), msg:
+            log.warning("could not save the manifest: %s" % msg)
+
     def copy_narrated_files(self):
         """
         Copy all of the CSS, image, and javascript files for Narrated Web
@@ -7212,15 +7762,8 @@ class NavWebReport(Report):
                                   _('Creating individual pages'), 
                                   len(ind_list) + 1)
         IndividualListPage(self, self.title, ind_list)
-        for person_handle in ind_list:
-
-            # clear other's places
-            place_lat_long = []
-
-            self.user.step_progress()
-            person = self.database.get_person_from_handle(person_handle)
-
-            IndividualPage(self, self.title, person, ind_list, place_list, source_list, place_lat_long, rel_class)
+        self.user.step_progress()
+        self.write_pages('write_individual_page', list(ind_list))
         self.user.end_progress()
 
         if self.inc_gendex:
@@ -7238,6 +7781,18 @@ class NavWebReport(Report):
             self.close_file(fp_gendex, gendex_io)
             self.user.end_progress()
 
+    def write_individual_page(self, person_handle):
+        """
+        creates the IndividualPage of a person
+        """
+        person = self.database.get_person_from_handle(person_handle)
+
+        # each person has its own places for the family map
+        place_lat_long = []
+
+        IndividualPage(self, self.title, person, self.ind_list, self.place_list,
+                       self.source_list, place_lat_long, self.rel_class)
+
     def write_gendex(self, fp, person):
         """
         Reference|SURNAME|given name /SURNAME/|date of birth|place of birth|date of death|
@@ -7294,13 +7849,21 @@ class NavWebReport(Report):
                                   _("Creating family pages..."), 
                                   len(db_family_handles))
 
-        for family_handle in db_family_handles:
-            FamilyPage(self, self.title, family_handle, place_list, ppl_handle_list, place_lat_long)
-            self.user.step_progress()
+        self.write_pages('write_family_page', db_family_handles)
         self.user.end_progress()
 
         return db_family_handles
 
+    def write_family_page(self, family_handle):
+        """
+        creates the FamilyPage of a family
+        """
+        # the places of a family page are not shown on a map
+        place_lat_long = []
+
+        FamilyPage(self, self.title, family_handle, self.place_list,
+                   self.ind_list, place_lat_long)
+
     def place_pages(self, place_list, source_list):
         """
         creates PlaceListPage and PlacePage
@@ -7310,13 +7873,20 @@ class NavWebReport(Report):
 
         PlaceListPage(self, self.title, place_list)
 
-        for place in place_list:
-            PlacePage(self, self.title, place, source_list, place_list)
-            self.user.step_progress()
+        self.write_pages('write_place_page', list(place_list))
         self.user.end_progress()
 
         return place_list
 
+    def write_place_page(self, place_handle):
+        """
+        creates the PlacePage of a place
+        """
+        self.inputs.add(('links', 'place_list', place_handle),
+                        self.place_list[place_handle])
+        PlacePage(self, self.title, place_handle, self.source_list,
+                  self.place_list)
+
     def event_pages(self, ind_list):
         """
         a dump of all the events sorted by event type, date, and surname
@@ -7330,14 +7900,17 @@ class NavWebReport(Report):
                                   len(event_handle_list))
         EventListPage(self, self.title, event_types, event_handle_list, ind_list)
 
-        for event_handle in event_handle_list:
-            EventPage(self, self.title, event_handle, ind_list)
-
-            self.user.step_progress()
+        self.write_pages('write_event_page', list(event_handle_list))
         self.user.end_progress()
 
         return event_handle_list
 
+    def write_event_page(self, event_handle):
+        """
+        creates the EventPage of an event
+        """
+        EventPage(self, self.title, event_handle, self.ind_list)
+
     def media_pages(self, source_list):
         """
         creates MediaListPage and MediaPage
@@ -7354,19 +7927,29 @@ class NavWebReport(Report):
         photo_keys = sorted(self.photo_list, key =sort.by_media_title_key)
 
         index = 1
+        pages = []
         for photo_handle in photo_keys:
-            gc.collect() # Reduce memory usage when there are many images.
             next = None if index == total else photo_keys[index]
-            # Notice. Here self.photo_list[photo_handle] is used not self.photo_list
-            MediaPage(self, self.title, photo_handle, source_list, self.photo_list[photo_handle],
-                      (prev, next, index, total))
-            self.user.step_progress()
+            pages.append((photo_handle, (prev, next, index, total)))
             prev = photo_handle
             index += 1
+        self.write_pages('write_media_page', pages)
         self.user.end_progress()
 
         return photo_keys
 
+    def write_media_page(self, page):
+        """
+        creates the MediaPage of a media object
+        """
+        photo_handle, info = page
+        self.inputs.add(('links', 'photo_list', photo_handle),
+                        self.photo_list[photo_handle])
+        gc.collect() # Reduce memory usage when there are many images.
+        # Notice. Here self.photo_list[photo_handle] is used not self.photo_list
+        MediaPage(self, self.title, photo_handle, self.source_list,
+                  self.photo_list[photo_handle], info)
+
     def thumbnail_preview_page(self):
         """
         creates the thumbnail preview page
@@ -7462,12 +8045,18 @@ class NavWebReport(Report):
                                  len(source_list))
         SourceListPage(self, self.title, source_list.keys())
 
-        for source_handle in source_list:
-            SourcePage(self, self.title, source_handle, source_list, ind_list, database_handles_list)
-
-            self.user.step_progress()
+        self.write_pages('write_source_page', list(source_list))
         self.user.end_progress()
 
+    def write_source_page(self, source_handle):
+        """
+        creates the SourcePage of a source
+        """
+        self.inputs.add(('links', 'source_list', source_handle),
+                        self.source_list[source_handle])
+        SourcePage(self, self.title, source_handle, self.source_list,
+                   self.ind_list, self.database_handles_list)
+
     def base_pages(self):
         """
         creates HomePage, ContactPage, DownloadPage, and IntroductionPage
@@ -7617,6 +8206,7 @@ class NavWebReport(Report):
             self.cur_fname = os.path.join(subdir, fname) + ext
         else:
             self.cur_fname = fname + ext
+        self.written_files.append(self.cur_fname)
         if self.archive:
             string_io = StringIO()
             of = codecs.EncodedFile(string_io, 'utf-8',
@@ -7626,7 +8216,7 @@ class NavWebReport(Report):
             if subdir:
                 subdir = os.path.join(self.html_dir, subdir)
                 if not os.path.isdir(subdir):
-                    os.makedirs(subdir)
+                    _make_dirs(subdir)
             fname = os.path.join(self.html_dir, self.cur_fname)
             of = codecs.EncodedFile(open(fname, "w"), 'utf-8',
                                     self.encoding, 'xmlcharrefreplace')
@@ -7695,11 +8285,11 @@ class NavWebReport(Report):
 
             destdir = os.path.dirname(dest)
             if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+                _make_dirs(destdir)
 
             if from_fname != dest:
                 try:
-                    shutil.copyfile(from_fname, dest)
+                    self.update_file(from_fname, os.path.join(to_dir, to_fname))
                 except:
                     print("Copying error: %s" % sys.exc_info()[1])
                     print("Continuing...")
@@ -7714,6 +8304,14 @@ class NavWebReport(Report):
                       "web pages."))
                 self.warn_dir = False
 
+    def update_file(self, from_fname, to_fname):
+        """
+        Copy a file from a source to to_fname in the destination directory,
+        unless the copy made by an earlier report is up to date.
+        """
+        self.written_files.append(to_fname)
+        _copy_if_changed(from_fname, os.path.join(self.html_dir, to_fname))
+
 #################################################
 #
 #    Creates the NarrativeWeb Report Menu Options
@@ -48,21 +48,36 @@ from webapp.libdjango import DjangoInterface
 from django.db import transaction
 
 class Cursor(object):
-    def __init__(self, model, func):
+    """
+    Iterate over the (handle, raw data) pairs of a primary object table.
+    The rows are read page_size rows at a time, and func returns the raw
+    data of a row.
+    """
+    def __init__(self, model, func, page_size):
         self.model = model
         self.func = func
+        self.page_size = page_size
     def __enter__(self):
         return self
     def __iter__(self):
         return self.__next__()
     def __next__(self):
-        for item in self.model.all():
-            yield (item.handle, self.func(item.handle))
+        last_id = None
+        while True:
+            page = self.model.all()
+            if last_id is not None:
+                page = page.filter(id__gt=last_id)
+            page = list(page.order_by("id")[:self.page_size])
+            for item in page:
+                yield (item.handle, self.func(item))
+            if len(page) < self.page_size:
+                break
+            last_id = page[-1].id
     def __exit__(self, *args, **kwargs):
         pass
     def iter(self):
-        for item in self.model.all():
-            yield (item.handle, self.func(item.handle))
+        for pair in self.__next__():
+            yield pair
         yield None
 
 class Bookmarks:
@@ -97,6 +112,8 @@ class DbDjango(DbWriteBase, DbReadBase):
     """
     A Gramps Database Backend. This replicates the grampsdb functions.
     """
+    # Number of rows fetched per query by the bulk accessors and cursors
+    BATCH_SIZE = 500
 
     def __init__(self):
         DbReadBase.__init__(self)
@@ -176,6 +193,14 @@ class DbDjango(DbWriteBase, DbReadBase):
         self.use_import_cache = True
         self.import_cache = {}
 
+    def abort_import(self):
+        """
+        Drops the items queued up by an import that failed, so that the
+        next import starts from an empty cache.
+        """
+        self.use_import_cache = False
+        self.import_cache = {}
+
     @transaction.commit_on_success
     def commit_import(self):
         """
@@ -614,53 +639,65 @@ class DbDjango(DbWriteBase, DbReadBase):
             return None
         return self.make_tag(tag)
 
+    def __row_data(self, item, pack_func):
+        """
+        Return the raw data of the row item of a primary object table: its
+        cache column if it is filled in, or else what pack_func builds from
+        the rows that hold the parts of the object.
+        """
+        if self.use_db_cache and item.cache:
+            return cPickle.loads(base64.decodestring(item.cache))
+        return pack_func(item)
+
+    def __get_raw_data(self, model, pack_func, handle):
+        """
+        Return the raw data of the object of model with the given handle,
+        or None if there is none.
+        """
+        try:
+            return self.__row_data(model.get(handle=handle), pack_func)
+        except:
+            if handle in self.import_cache:
+                return self.import_cache[handle].serialize()
+            else:
+                return None
+
+    def __cursor(self, model, pack_func):
+        """
+        Return a cursor over the raw data of the objects of model.
+        """
+        if not self.use_db_cache:
+            # the packers follow the foreign keys of the rows
+            model = model.select_related()
+        return Cursor(model, lambda item: self.__row_data(item, pack_func),
+                      self.BATCH_SIZE).iter()
+
     def make_repository(self, repository):
-        if self.use_db_cache and repository.cache:
-            data = cPickle.loads(base64.decodestring(repository.cache))
-        else:
-            data = self.dji.get_repository(repository)
+        data = self.__row_data(repository, self.dji.get_repository)
         return Repository.create(data)
 
     def make_citation(self, citation):
-        if self.use_db_cache and citation.cache:
-            data = cPickle.loads(base64.decodestring(citation.cache))
-        else:
-            data = self.dji.get_citation(citation)
+        data = self.__row_data(citation, self.dji.get_citation)
         return Citation.create(data)
 
     def make_source(self, source):
-        if self.use_db_cache and source.cache:
-            data = cPickle.loads(base64.decodestring(source.cache))
-        else:
-            data = self.dji.get_source(source)
+        data = self.__row_data(source, self.dji.get_source)
         return Source.create(data)
 
     def make_family(self, family):
-        if self.use_db_cache and family.cache:
-            data = cPickle.loads(base64.decodestring(family.cache))
-        else:
-            data = self.dji.get_family(family)
+        data = self.__row_data(family, self.dji.get_family)
         return Family.create(data)
 
     def make_person(self, person):
-        if self.use_db_cache and person.cache:
-            data = cPickle.loads(base64.decodestring(person.cache))
-        else:
-            data = self.dji.get_person(person)
+        data = self.__row_data(person, self.dji.get_person)
         return Person.create(data)
 
     def make_event(self, event):
-        if self.use_db_cache and event.cache:
-            data = cPickle.loads(base64.decodestring(event.cache))
-        else:
-            data = self.dji.get_event(event)
+        data = self.__row_data(event, self.dji.get_event)
         return Event.create(data)
 
     def make_note(self, note):
-        if self.use_db_cache and note.cache:
-            data = cPickle.loads(base64.decodestring(note.cache))
-        else:
-            data = self.dji.get_note(note)
+        data = self.__row_data(note, self.dji.get_note)
         return Note.create(data)
 
     def make_tag(self, tag):
@@ -668,17 +705,11 @@ class DbDjango(DbWriteBase, DbReadBase):
         return Tag.create(data)
 
     def make_place(self, place):
-        if self.use_db_cache and place.cache:
-            data = cPickle.loads(base64.decodestring(place.cache))
-        else:
-            data = self.dji.get_place(place)
+        data = self.__row_data(place, self.dji.get_place)
         return Place.create(data)
 
     def make_media(self, media):
-        if self.use_db_cache and media.cache:
-            data = cPickle.loads(base64.decodestring(media.cache))
-        else:
-            data = self.dji.get_media(media)
+        data = self.__row_data(media, self.dji.get_media)
         return MediaObject.create(data)
 
     def get_place_from_handle(self, handle):
@@ -726,18 +757,91 @@ class DbDjango(DbWriteBase, DbReadBase):
             return None
         return self.make_media(media)
 
+    def __get_many(self, model, make_func, handles):
+        """
+        Helper for the bulk accessors. Fetch the rows for the handles in
+        batches of at most BATCH_SIZE handles with one query per batch, and
+        yield the results of make_func in the order of handles. None is
+        yielded for missing handles.
+        """
+        handles = list(handles)
+        for start in range(0, len(handles), self.BATCH_SIZE):
+            chunk = handles[start:start + self.BATCH_SIZE]
+            wanted = [handle for handle in chunk
+                      if handle not in self.import_cache]
+            rows = dict((item.handle, item)
+                        for item in model.filter(handle__in=wanted))
+            for handle in chunk:
+                if handle in self.import_cache:
+                    yield self.import_cache[handle]
+                elif handle in rows:
+                    yield make_func(rows[handle])
+                else:
+                    yield None
+
+    def get_people_from_handles(self, handles):
+        return self.__get_many(self.dji.Person, self.make_person, handles)
+
+    def get_families_from_handles(self, handles):
+        return self.__get_many(self.dji.Family, self.make_family, handles)
+
+    def get_events_from_handles(self, handles):
+        return self.__get_many(self.dji.Event, self.make_event, handles)
+
+    def get_places_from_handles(self, handles):
+        return self.__get_many(self.dji.Place, self.make_place, handles)
+
+    def get_sources_from_handles(self, handles):
+        return self.__get_many(self.dji.Source, self.make_source, handles)
+
+    def get_citations_from_handles(self, handles):
+        return self.__get_many(self.dji.Citation, self.make_citation, handles)
+
+    def get_media_objects_from_handles(self, handles):
+        return self.__get_many(self.dji.Media, self.make_media, handles)
+
+    def get_repositories_from_handles(self, handles):
+        return self.__get_many(self.dji.Repository, self.make_repository,
+                               handles)
+
+    def get_notes_from_handles(self, handles):
+        return self.__get_many(self.dji.Note, self.make_note, handles)
+
+    def get_tags_from_handles(self, handles):
+        return self.__get_many(self.dji.Tag, self.make_tag, handles)
+
+    def get_raw_data_many(self, table_name, handles):
+        bulk_func = {
+            'Person': self.get_people_from_handles,
+            'Family': self.get_families_from_handles,
+            'Event': self.get_events_from_handles,
+            'Place': self.get_places_from_handles,
+            'Source': self.get_sources_from_handles,
+            'Citation': self.get_citations_from_handles,
+            'Media': self.get_media_objects_from_handles,
+            'Repository': self.get_repositories_from_handles,
+            'Note': self.get_notes_from_handles,
+            'Tag': self.get_tags_from_handles,
+            }[table_name]
+        for obj in bulk_func(handles):
+            yield obj.serialize() if obj is not None else None
+
     def get_default_person(self):
         return None
 
     def iter_people(self):
-        return (self.get_person_from_handle(person.handle) 
+        return (self.import_cache[person.handle]
+                if person.handle in self.import_cache
+                else self.make_person(person)
                 for person in self.dji.Person.all())
 
     def iter_person_handles(self):
         return (person.handle for person in self.dji.Person.all())
 
     def iter_families(self):
-        return (self.get_family_from_handle(family.handle) 
+        return (self.import_cache[family.handle]
+                if family.handle in self.import_cache
+                else self.make_family(family)
                 for family in self.dji.Family.all())
 
     def iter_family_handles(self):
@@ -792,22 +896,22 @@ class DbDjango(DbWriteBase, DbReadBase):
         return self.dji.Repository.count()
 
     def get_place_cursor(self):
-        return Cursor(self.dji.Place, self.get_raw_place_data).iter()
+        return self.__cursor(self.dji.Place, self.dji.get_place)
 
     def get_person_cursor(self):
-        return Cursor(self.dji.Person, self.get_raw_person_data).iter()
+        return self.__cursor(self.dji.Person, self.dji.get_person)
 
     def get_family_cursor(self):
-        return Cursor(self.dji.Family, self.get_raw_family_data).iter()
+        return self.__cursor(self.dji.Family, self.dji.get_family)
 
     def get_events_cursor(self):
-        return Cursor(self.dji.Event, self.get_raw_event_data).iter()
+        return self.__cursor(self.dji.Event, self.dji.get_event)
 
     def get_citation_cursor(self):
-        return Cursor(self.dji.Citation, self.get_raw_citation_data).iter()
+        return self.__cursor(self.dji.Citation, self.dji.get_citation)
 
     def get_source_cursor(self):
-        return Cursor(self.dji.Source, self.get_raw_source_data).iter()
+        return self.__cursor(self.dji.Source, self.dji.get_source)
 
     def has_gramps_id(self, obj_key, gramps_id):
         key2table = {
@@ -889,76 +993,31 @@ class DbDjango(DbWriteBase, DbReadBase):
         pass
 
     def get_raw_person_data(self, handle):
-        try:
-            return self.dji.get_person(self.dji.Person.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Person, self.dji.get_person, handle)
 
     def get_raw_family_data(self, handle):
-        try:
-            return self.dji.get_family(self.dji.Family.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Family, self.dji.get_family, handle)
 
     def get_raw_citation_data(self, handle):
-        try:
-            return self.dji.get_citation(self.dji.Citation.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Citation, self.dji.get_citation, handle)
 
     def get_raw_source_data(self, handle):
-        try:
-            return self.dji.get_source(self.dji.Source.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Source, self.dji.get_source, handle)
 
     def get_raw_repository_data(self, handle):
-        try:
-            return self.dji.get_repository(self.dji.Repository.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Repository, self.dji.get_repository, handle)
 
     def get_raw_note_data(self, handle):
-        try:
-            return self.dji.get_note(self.dji.Note.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Note, self.dji.get_note, handle)
 
     def get_raw_place_data(self, handle):
-        try:
-            return self.dji.get_place(self.dji.Place.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Place, self.dji.get_place, handle)
 
     def get_raw_object_data(self, handle):
-        try:
-            return self.dji.get_media(self.dji.Media.get(handle=handle))
-        except:
-            if handle in self.import_cache:
-                return self.import_cache[handle].serialize()
-            else:
-                return None
+        return self.__get_raw_data(self.dji.Media, self.dji.get_media, handle)
+
+    def get_raw_event_data(self, handle):
+        return self.__get_raw_data(self.dji.Event, self.dji.get_event, handle)
 
     def add_person(self, person, trans, set_gid=True):
         if not person.handle:
@@ -1332,7 +1332,13 @@ CREATE TABLE "grampsdb_result" (
     "filename" text,
     "run_on" datetime NOT NULL,
     "run_by" text,
-    "status" text
+    "status" text,
+    "handle" text,
+    "report_type" text,
+    "options" text,
+    "progress" integer NOT NULL,
+    "message" text,
+    "mimetype" text
 );
 CREATE INDEX grampsdb_noteref_object_id_object_type_id 
        ON grampsdb_noteref (object_id, object_type_id);
@@ -1000,11 +1000,21 @@ class Report(models.Model):
         return str(self.name)
 
 class Result(models.Model):
+    """
+    A run of a report, export or import, done by the job runner
+    (webapp/jobs.py). The status is queued, running, done or failed.
+    """
     name = models.TextField(blank=True, null=True)
     filename = models.TextField(blank=True, null=True)
     run_on = models.DateTimeField('run on', auto_now=True)
     run_by = models.TextField('run by', blank=True, null=True)
     status = models.TextField(blank=True, null=True)
+    handle = models.TextField(blank=True, null=True) # report_id
+    report_type = models.TextField(blank=True, null=True)
+    options = models.TextField(blank=True, null=True)
+    progress = models.IntegerField(default=0) # percent
+    message = models.TextField(blank=True, null=True)
+    mimetype = models.TextField(blank=True, null=True)
 
     def __unicode__(self):
         return str(self.name)
@@ -182,12 +182,9 @@ def send_file(request, filename, mimetype):
 
 def process_report_run(request, handle):
     """
-    Run a report or export.
+    Queue a report, export or import for the job runner.
     """
-    from webapp.reports import import_file, export_file, download
-    from gramps.cli.plug import run_report
-    import traceback
-    db = DbDjango()
+    from webapp import jobs
     if request.user.is_authenticated():
         profile = request.user.get_profile()
         report = Report.objects.get(handle=handle)
@@ -208,52 +205,72 @@ def process_report_run(request, handle):
                         key, value = [x.strip() for x in pair.split("=", 1)]
                         if key and value:
                             args[key] = value
-        #############################################################################
-        if report.report_type == "report":
-            filename = "/tmp/%s-%s.%s" % (str(profile.user.username), str(handle), args["off"])
-            run_report(db, handle, of=filename, **args)
-            mimetype = 'application/%s' % args["off"]
-        elif report.report_type == "export":
-            filename = "/tmp/%s-%s.%s" % (str(profile.user.username), str(handle), args["off"])
-            export_file(db, filename, User()) # callback
-            mimetype = 'text/plain'
-        elif report.report_type == "import":
-            filename = download(args["i"], "/tmp/%s-%s.%s" % (str(profile.user.username), 
-                                                              str(handle),
-                                                              args["iff"]))
-            if filename is not None:
-                if True: # run in background, with error handling
-                    import threading
-                    def background():
-                        try:
-                            import_file(db, filename, User()) # callback
-                        except:
-                            make_message(request, "import_file failed: " + traceback.format_exc())
-                    threading.Thread(target=background).start()
-                    make_message(request, "Your data is now being imported...")
-                    return redirect("/report/")
-                else:
-                    success = import_file(db, filename, User()) # callback
-                    if not success:
-                        make_message(request, "Failed to load imported.")
-                    return redirect("/report/")
-            else:
-                make_message(request, "No filename was provided or found.")
-                return redirect("/report/")
-        else:
-            make_message(request, "Invalid report type '%s'" % report.report_type)
-            return redirect("/report/")
-        if os.path.exists(filename):
-            return send_file(request, filename, mimetype)
-        else:
-            context = RequestContext(request)
-            make_message(request, "Failed: '%s' is not found" % filename)
-            return redirect("/report/")
+        result = jobs.submit(report, args, str(profile.user.username))
+        make_message(request, "Your %s '%s' is now queued." % 
+                     (report.report_type, report.name))
+        return redirect("/job/%s/" % result.id)
     # If failure, just fail for now:
     context = RequestContext(request)
     context["message"] = "You need to be logged in."
     return render_to_response("process_action.html", context)
 
+def get_job(request, job_id):
+    """
+    Return the job job_id of the logged in user.
+    """
+    if not request.user.is_authenticated():
+        raise Http404(_("Requested page is not accessible."))
+    result = get_object_or_404(Result, id=job_id)
+    if (result.run_by != request.user.username and 
+        not request.user.is_superuser):
+        raise Http404(_("Requested page is not accessible."))
+    return result
+
+def job_page(request, job_id):
+    """
+    Show the status of a job; the page is reloaded until the job ends.
+    """
+    from webapp import jobs
+    result = get_job(request, job_id)
+    context = RequestContext(request)
+    context["view"] = 'report'
+    context["tview"] = _('Report')
+    context["result"] = result
+    context["running"] = result.status in [jobs.QUEUED, jobs.RUNNING]
+    context["has_file"] = (result.status == jobs.DONE and 
+                           bool(result.filename))
+    return render_to_response("view_job.html", context)
+
+def job_status(request, job_id):
+    """
+    Return the status of a job as Json.
+    """
+    from webapp import jobs
+    result = get_job(request, job_id)
+    response_data = {"id": result.id,
+                     "status": result.status,
+                     "progress": result.progress,
+                     "message": result.message or "",
+                     "result": None}
+    if result.status == jobs.DONE and result.filename:
+        response_data["result"] = "/job/%s/result" % result.id
+    return HttpResponse(simplejson.dumps(response_data), 
+                        mimetype="application/json")
+
+def job_result(request, job_id):
+    """
+    Send the file made by a job.
+    """
+    from webapp import jobs
+    result = get_job(request, job_id)
+    if (result.status == jobs.DONE and result.filename and 
+        os.path.exists(result.filename)):
+        return send_file(request, result.filename, 
+                         result.mimetype or "application/octet-stream")
+    make_message(request, "Failed: the result of '%s' is not found" % 
+                 result.name)
+    return redirect("/job/%s/" % result.id)
+
 def view_list(request, view):
     """
     Borwse each of the primary tables.
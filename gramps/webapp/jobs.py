@@ -0,0 +1,249 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# webapp/jobs.py
+# $Id$
+
+"""
+The job runner of the web app. The reports, exports and imports asked for
+on the web pages are queued as Result rows, and run by worker processes
+that keep the plugins registered and the database open between jobs. The
+files made by a job are kept in JOB_DIR/<job id>/.
+
+Start the workers with something like:
+   $ PYTHONPATH=..:../plugins/lib python jobs.py [workers]
+"""
+
+#------------------------------------------------------------------------
+#
+# Python Modules
+#
+#------------------------------------------------------------------------
+import os
+import sys
+import time
+import traceback
+import multiprocessing
+
+#------------------------------------------------------------------------
+#
+# Django and Gramps Modules
+#
+#------------------------------------------------------------------------
+if __name__ == "__main__":
+    from django.conf import settings
+    import webapp.settings as default_settings
+    try:
+        settings.configure(default_settings)
+    except RuntimeError:
+        # already configured; ignore
+        pass
+
+from django.conf import settings
+from django.db import connection, reset_queries
+
+from webapp.grampsdb.models import Result
+from gramps.cli.user import User
+
+#------------------------------------------------------------------------
+#
+# Constants
+#
+#------------------------------------------------------------------------
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# seconds between the progress updates written to the job table
+_PROGRESS_DELAY = 1.0
+
+#------------------------------------------------------------------------
+#
+# Queue
+#
+#------------------------------------------------------------------------
+def submit(report, args, username):
+    """
+    Queue a run of report (a Report) with the options args, for the user
+    username. Return the Result of the job.
+    """
+    options = "\n".join("%s=%s" % (key, value)
+                        for (key, value) in sorted(args.items()))
+    return Result.objects.create(name=report.name, handle=report.handle,
+                                 report_type=report.report_type,
+                                 options=options, run_by=username,
+                                 status=QUEUED, progress=0)
+
+def get_options(result):
+    """
+    Return the options of a job as a dictionary.
+    """
+    args = {}
+    for pair in (result.options or "").split("\n"):
+        if "=" in pair:
+            key, value = [x.strip() for x in pair.split("=", 1)]
+            if key and value:
+                args[key] = value
+    return args
+
+def get_job_dir(result):
+    """
+    Return the directory of the files of a job.
+    """
+    return os.path.join(settings.JOB_DIR, str(result.id))
+
+def take_job():
+    """
+    Mark the oldest queued job as running, and return it; return None if
+    no job is queued. A job is only taken by one worker.
+    """
+    for result in Result.objects.filter(status=QUEUED).order_by("id")[:10]:
+        if Result.objects.filter(id=result.id,
+                                 status=QUEUED).update(status=RUNNING) == 1:
+            result.status = RUNNING
+            return result
+    return None
+
+#------------------------------------------------------------------------
+#
+# JobUser
+#
+#------------------------------------------------------------------------
+class JobUser(User):
+    """
+    A User that records the progress of a job in its Result row, at most
+    once every _PROGRESS_DELAY seconds.
+    """
+    def __init__(self, result):
+        User.__init__(self)
+        self.result = result
+        self.last_write = 0
+
+    def __write(self, percent, text=None, force=False):
+        now = time.time()
+        if not force and now - self.last_write < _PROGRESS_DELAY:
+            return
+        self.last_write = now
+        fields = {"progress": max(0, min(int(percent), 100))}
+        if text:
+            fields["message"] = text
+        Result.objects.filter(id=self.result.id).update(**fields)
+
+    def begin_progress(self, title, message, steps):
+        self.steps = steps
+        self.current_step = 0
+        self.__write(0, message, True)
+
+    def step_progress(self):
+        self.current_step += 1
+        if self.steps:
+            self.__write(self.current_step * 100 / self.steps)
+
+    def callback(self, percentage, text=None):
+        self.__write(percentage, text)
+
+    def end_progress(self):
+        pass
+
+#------------------------------------------------------------------------
+#
+# Workers
+#
+#------------------------------------------------------------------------
+def run_job(db, result):
+    """
+    Run the job result on the database db, and record how it ended.
+    """
+    from webapp.reports import import_file, export_file, download
+    from gramps.cli.plug import run_report
+    args = get_options(result)
+    args.setdefault("off", "pdf")
+    args.setdefault("iff", "ged")
+    job_dir = get_job_dir(result)
+    user = JobUser(result)
+    try:
+        if not os.path.isdir(job_dir):
+            os.makedirs(job_dir)
+        if result.report_type == "report":
+            filename = os.path.join(job_dir,
+                                    "%s.%s" % (result.handle, args["off"]))
+            args["of"] = filename
+            run_report(db, result.handle, user, **args)
+            mimetype = "application/%s" % args["off"]
+        elif result.report_type == "export":
+            filename = os.path.join(job_dir,
+                                    "%s.%s" % (result.handle, args["off"]))
+            export_file(db, filename, user)
+            mimetype = "text/plain"
+        elif result.report_type == "import":
+            if "i" not in args:
+                raise ValueError("No filename was provided or found.")
+            filename = download(args["i"],
+                                os.path.join(job_dir, "%s.%s" %
+                                             (result.handle, args["iff"])))
+            import_file(db, filename, user)
+            filename, mimetype = None, None
+        else:
+            raise ValueError("Invalid report type '%s'" % result.report_type)
+        if filename is not None and not os.path.exists(filename):
+            raise IOError("'%s' was not written" % os.path.basename(filename))
+        Result.objects.filter(id=result.id).update(status=DONE, progress=100,
+                                                   filename=filename,
+                                                   mimetype=mimetype,
+                                                   message="")
+    except Exception:
+        Result.objects.filter(id=result.id).update(
+            status=FAILED, message=traceback.format_exc())
+
+def work(poll=1.0):
+    """
+    Run the queued jobs, one at a time, looking for new ones every poll
+    seconds. The plugins are registered and the database opened once.
+    """
+    from webapp.reports import register_plugins
+    from webapp.dbdjango import DbDjango
+    register_plugins()
+    db = DbDjango()
+    while True:
+        result = take_job()
+        if result is None:
+            time.sleep(poll)
+        else:
+            run_job(db, result)
+        # DEBUG keeps all the queries otherwise
+        reset_queries()
+
+def main(workers=1):
+    """
+    Start the worker processes and wait for them. The jobs left running by
+    workers that were stopped are marked as failed.
+    """
+    Result.objects.filter(status=RUNNING).update(
+        status=FAILED, message="The job runner was stopped.")
+    # each process opens its own connection
+    connection.close()
+    processes = [multiprocessing.Process(target=work)
+                 for dummy in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
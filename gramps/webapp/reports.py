@@ -41,14 +41,23 @@ import os
 # db = dbdjango.DbDjango()
 # run_report(db, "ancestor_report", off="txt", of="ar.txt", pid="I0363")
 
+def register_plugins():
+    """
+    Register the plugins, the first time only, and return the plugin
+    manager.
+    """
+    pmgr = BasePluginManager.get_instance()
+    if not pmgr.get_reg_reports():
+        dbstate = DbState()
+        climanager = CLIManager(dbstate, False) # do not load db_loader
+        climanager.do_reg_plugins(dbstate, None)
+    return pmgr
+
 def get_plugin_options(db, pid):
     """
     Get the default options and help for this plugin.
     """
-    dbstate = DbState()
-    climanager = CLIManager(dbstate, False) # do not load db_loader
-    climanager.do_reg_plugins(dbstate, None)
-    pmgr = BasePluginManager.get_instance()
+    pmgr = register_plugins()
     pdata = pmgr.get_plugin(pid)
     if hasattr(pdata, "optionclass") and pdata.optionclass:
         mod = pmgr.load_plugin(pdata)
@@ -66,10 +75,7 @@ def import_file(db, filename, user):
     >>> import_file(DbDjango(), "/home/user/Untitled_1.ged", User())
     """
     from grampsdb.models import Person
-    dbstate = DbState()
-    climanager = CLIManager(dbstate, False) # do not load db_loader
-    climanager.do_reg_plugins(dbstate, None)
-    pmgr = BasePluginManager.get_instance()
+    pmgr = register_plugins()
     (name, ext) = os.path.splitext(os.path.basename(filename))
     format = ext[1:].lower()
     import_list = pmgr.get_reg_importers()
@@ -85,8 +91,13 @@ def import_file(db, filename, user):
                 return False
             import_function = getattr(mod, pdata.import_function)
             db.prepare_import()
-            retval = import_function(db, filename, user)
-            db.commit_import()
+            try:
+                retval = import_function(db, filename, user)
+                db.commit_import()
+            except:
+                # the worker keeps db for the next jobs
+                db.abort_import()
+                raise
             # FIXME: need to call probably_alive
             for person in Person.objects.all():
                 person.probably_alive = not bool(person.death)
@@ -126,10 +137,7 @@ def export_file(db, filename, user):
 
     >>> export_file(DbDjango(), "/home/user/Untitled_1.ged", User())
     """
-    dbstate = DbState()
-    climanager = CLIManager(dbstate, False) # do not load db_loader
-    climanager.do_reg_plugins(dbstate, None)
-    pmgr = BasePluginManager.get_instance()
+    pmgr = register_plugins()
     (name, ext) = os.path.splitext(os.path.basename(filename))
     format = ext[1:].lower()
     export_list = pmgr.get_reg_exporters()
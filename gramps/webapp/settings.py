@@ -55,6 +55,8 @@ SITE_ID = 1
 USE_I18N = True
 MEDIA_ROOT = ''
 MEDIA_URL = ''
+# where the job runner (jobs.py) keeps the files made by each job
+JOB_DIR = os.path.join(WEB_DIR, 'jobs')
 ADMIN_MEDIA_PREFIX = '/gramps-media/'
 SECRET_KEY = 'zd@%vslj5sqhx94_8)0hsx*rk9tj3^ly$x+^*tq4bggr&uh$ac'
 
@@ -0,0 +1,98 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# webapp/test/jobs_test.py
+# $Id$
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from django.conf import settings
+import webapp.settings as default_settings
+try:
+    settings.configure(default_settings)
+except RuntimeError:
+    # already configured; ignore
+    pass
+
+from webapp import jobs
+import gramps.cli.plug
+
+class Result(object):
+    def __init__(self, id):
+        self.id = id
+        self.handle = "report"
+        self.report_type = "report"
+        self.options = "off=txt"
+
+class Objects(object):
+    """
+    Records the fields written to the rows of the job table.
+    """
+    def __init__(self):
+        self.updates = []
+    def filter(self, **kwargs):
+        return self
+    def update(self, **fields):
+        self.updates.append(fields)
+        return 1
+
+class ResultTable(object):
+    objects = None
+
+def fake_report(db, name, user=None, **options):
+    """
+    A report of four steps, that writes its file at the end.
+    """
+    user.begin_progress("Report", "Writing", 4)
+    for step in range(4):
+        user.step_progress()
+    user.end_progress()
+    open(options["of"], "w").close()
+
+class RunJobTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.objects = Objects()
+        self.saved = (jobs.Result, jobs._PROGRESS_DELAY,
+                      jobs.get_job_dir, gramps.cli.plug.run_report)
+        jobs.Result = ResultTable()
+        jobs.Result.objects = self.objects
+        jobs._PROGRESS_DELAY = 0
+        jobs.get_job_dir = lambda result: self.path
+        gramps.cli.plug.run_report = fake_report
+
+    def tearDown(self):
+        (jobs.Result, jobs._PROGRESS_DELAY,
+         jobs.get_job_dir, gramps.cli.plug.run_report) = self.saved
+        shutil.rmtree(self.path)
+
+    def test_report_progress(self):
+        jobs.run_job(None, Result(1))
+        progress = [fields["progress"] for fields in self.objects.updates
+                    if "progress" in fields]
+        self.assertEqual(progress, [0, 25, 50, 75, 100, 100])
+        self.assertEqual(self.objects.updates[-1]["status"], jobs.DONE)
+        self.assertTrue(os.path.exists(os.path.join(self.path,
+                                                    "report.txt")))
+
+if __name__ == "__main__":
+    unittest.main()
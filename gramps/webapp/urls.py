@@ -69,6 +69,9 @@ urlpatterns += patterns('',
     (r'^browse/$', browse_page),
     (r'^login/$', 'django.contrib.auth.views.login'),
     (r'^logout/$', logout_page),
+    (r'^job/(?P<job_id>\d+)/$', job_page),
+    (r'^job/(?P<job_id>\d+)/status$', job_status),
+    (r'^job/(?P<job_id>\d+)/result$', job_result),
     (r'^(?P<view>(\w+))/$', 
      view_list),                    # /view/
     (r'^(?P<view>(\w+))/add$', 
@@ -0,0 +1,109 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Time the date parsers of all the languages.
+
+Usage: python test/date_parser_benchmark.py [copies [gedcom files]]
+
+The dates of the GEDCOM files (example/gedcom/sample.ged by default) are
+read with the GEDCOM date parser, and displayed by the date displayer of
+each language. The displayed dates, copies times over (20 by default), are
+then parsed by the date parser of the language without remembering the
+dates already parsed, as the parsers used to do, and with parse. The
+dates found both ways are checked to be the same.
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gramps.gen.lib import Date
+from gramps.gen.datehandler import LANG_TO_PARSER, LANG_TO_DISPLAY
+from gramps.plugins.lib.libgedcom import GedcomDateParser
+
+EXAMPLE = os.path.join(ROOT, "example", "gedcom", "sample.ged")
+
+def read_dates(fnames):
+    """
+    Return the dates of the DATE lines of the GEDCOM files.
+    """
+    parser = GedcomDateParser()
+    dates = []
+    for fname in fnames:
+        ifile = open(fname, "rU")
+        for line in ifile:
+            line = line.strip().split(None, 2)
+            if len(line) == 3 and line[1] == "DATE":
+                dates.append(parser.parse(line[2]))
+        ifile.close()
+    return dates
+
+def parse_uncached(parser, texts):
+    result = []
+    for text in texts:
+        date = Date()
+        try:
+            parser._set_date(date, text)
+        except Exception:
+            date.set_as_text(text)
+        result.append(date.serialize())
+    return result
+
+def parse_cached(parser, texts):
+    return [parser.parse(text).serialize() for text in texts]
+
+def timed(func, parser, texts):
+    start = time.time()
+    result = func(parser, texts)
+    return time.time() - start, result
+
+def main(copies=20, *fnames):
+    dates = read_dates(fnames or [EXAMPLE])
+    print "%d dates, %d different" % (len(dates),
+                                      len(set(date.serialize()
+                                              for date in dates)))
+    print "%-14s %-18s %10s %10s" % ("language", "parser", "uncached",
+                                      "parse")
+    done = set()
+    total_uncached = total_cached = 0
+    for lang in sorted(LANG_TO_PARSER):
+        parser_class = LANG_TO_PARSER[lang]
+        display_class = LANG_TO_DISPLAY.get(lang)
+        if display_class is None or (parser_class, display_class) in done:
+            continue
+        done.add((parser_class, display_class))
+        displayer = display_class()
+        texts = [displayer.display(date) for date in dates] * copies
+        uncached, expected = timed(parse_uncached, parser_class(), texts)
+        cached, result = timed(parse_cached, parser_class(), texts)
+        if result != expected:
+            print "%s: the dates parsed differ" % lang
+        total_uncached += uncached
+        total_cached += cached
+        print "%-14s %-18s %8.3f s %8.3f s" % (lang, parser_class.__name__,
+                                                uncached, cached)
+    print "%-33s %8.3f s %8.3f s" % ("total", total_uncached, total_cached)
+
+if __name__ == "__main__":
+    main(*([int(arg) for arg in sys.argv[1:2]] + sys.argv[2:]))
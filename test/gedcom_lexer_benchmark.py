@@ -0,0 +1,122 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Time the GEDCOM lexer on a generated file.
+
+Usage: python test/gedcom_lexer_benchmark.py [megabytes]
+
+A GEDCOM file of about megabytes MB (300 by default) is written to a
+temporary directory. It is then tokenized one line at a time, as the lexer
+used to do, and with the block reading Lexer of libgedcom, once read as
+UTF-8 and once as ANSEL.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gramps.plugins.lib.libgedcom import (Lexer, GedLine, UTF8Reader,
+                                          AnselReader, TOKENS, TOKEN_UNKNOWN)
+
+PERSON = """0 @I%(id)d@ INDI
+1 NAME Jan\xe2e /Sm\xf0\xe2th%(id)d/
+2 GIVN Jane
+2 SURN Smith%(id)d
+1 SEX F
+1 BIRT
+2 DATE ABT 12 MAR 18%(year)02d
+2 PLAC Hamburg, Germany
+1 FAMC @F%(id)d@
+1 NOTE This is a rather long note about person %(id)d, which is
+2 CONC  split over a few lines
+2 CONT and continued on a new one.
+"""
+
+def write_gedcom(fname, megabytes):
+    ofile = open(fname, "wb")
+    ofile.write("0 HEAD\n1 CHAR ANSEL\n")
+    size = 0
+    index = 0
+    while size < megabytes << 20:
+        record = PERSON % {'id' : index, 'year' : index % 100}
+        ofile.write(record)
+        size += len(record)
+        index += 1
+    ofile.write("0 TRLR\n")
+    ofile.close()
+
+def read_lines(reader):
+    """
+    Tokenize the file one line at a time, as the lexer used to do.
+    """
+    count = 0
+    line = reader.readline()
+    while line:
+        line = line.lstrip(' ').rstrip('\n\r').partition(' ')
+        try:
+            level = int(line[0])
+        except ValueError:
+            line = reader.readline()
+            continue
+        line = line[2].lstrip(' ').partition(' ')
+        count += 1
+        GedLine((level, TOKENS.get(line[0], TOKEN_UNKNOWN), line[2], line[0],
+                 count))
+        line = reader.readline()
+    return count
+
+def read_tokens(reader):
+    """
+    Tokenize the file with the Lexer.
+    """
+    lexer = Lexer(reader)
+    count = 0
+    while lexer.readline() is not None:
+        count += 1
+    return count
+
+def timed(label, func, fname, reader_class):
+    ifile = open(fname, "rU")
+    start = time.time()
+    func(reader_class(ifile))
+    print "%-24s %8.2f s" % (label, time.time() - start)
+    ifile.close()
+
+def main(megabytes=300):
+    fname = os.path.join(tempfile.mkdtemp(), "benchmark.ged")
+    try:
+        write_gedcom(fname, megabytes)
+        print "%d MB GEDCOM file" % (os.path.getsize(fname) >> 20)
+        for (name, reader_class) in (("UTF-8", UTF8Reader),
+                                     ("ANSEL", AnselReader)):
+            timed("%s, line by line" % name, read_lines, fname,
+                  reader_class)
+            timed("%s, Lexer" % name, read_tokens, fname, reader_class)
+    finally:
+        os.remove(fname)
+        os.rmdir(os.path.dirname(fname))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
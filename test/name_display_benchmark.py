@@ -0,0 +1,108 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Time the name displayer.
+
+Usage: python test/name_display_benchmark.py [names [different names]]
+
+A list of names (30000 by default) is made of a number of different
+names (3000 by default). The names are displayed and sorted with each of
+the standard name formats, by calling the format functions themselves, as
+NameDisplay used to do, and with display_name, sorted_name,
+raw_display_name and raw_sorted_name, which remember the names formatted.
+The names found both ways are checked to be the same.
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gramps.gen.lib import Name, Surname
+from gramps.gen.display.name import (NameDisplay, _F_FN, _F_RAWFN, _SORT,
+                                     _DISPLAY)
+
+def make_names(count, different):
+    names = []
+    for index in xrange(count):
+        index %= different
+        name = Name()
+        name.set_first_name("Given%d" % (index % 97))
+        name.set_suffix("Jr" if index % 5 == 0 else "")
+        surname = Surname()
+        surname.set_prefix("van" if index % 7 == 0 else "")
+        surname.set_surname("Surname%d" % index)
+        name.set_surname_list([surname])
+        names.append(name)
+    return names
+
+def format_uncached(displayer, names, raw, attr):
+    result = []
+    for name in names:
+        if raw:
+            num = displayer._is_format_valid(name[attr])
+            result.append(displayer.name_formats[num][_F_RAWFN](name))
+        else:
+            num = displayer._is_format_valid(getattr(name, attr))
+            result.append(displayer.name_formats[num][_F_FN](name))
+    return result
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+def main(count=30000, different=3000):
+    names = make_names(count, different)
+    raw_names = [name.serialize() for name in names]
+    displayer = NameDisplay()
+    print "%d names, %d different" % (count, different)
+    print "%-44s %10s %10s" % ("format", "uncached", "cached")
+    total_uncached = total_cached = 0
+    for (num, title, fmt_str, act) in NameDisplay.STANDARD_FORMATS:
+        if not act or num == Name.DEF:
+            continue
+        displayer.set_default_format(num)
+        for (label, func, data, raw, attr) in (
+                ("display_name", displayer.display_name, names, False,
+                 "display_as"),
+                ("sorted_name", displayer.sorted_name, names, False,
+                 "sort_as"),
+                ("raw_display_name", displayer.raw_display_name, raw_names,
+                 True, _DISPLAY),
+                ("raw_sorted_name", displayer.raw_sorted_name, raw_names,
+                 True, _SORT)):
+            uncached, expected = timed(format_uncached, displayer, data, raw,
+                                       attr)
+            displayer.clear_cache()
+            cached, result = timed(map, func, data)
+            if result != expected:
+                print "%s, %s: the names differ" % (fmt_str, label)
+            total_uncached += uncached
+            total_cached += cached
+            print "%-44s %8.3f s %8.3f s" % ("%s, %s" % (fmt_str, label),
+                                             uncached, cached)
+    print "%-44s %8.3f s %8.3f s" % ("total", total_uncached, total_cached)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,117 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Time the rebuild of the reference map on a scaled up example tree.
+
+Usage: python test/refmap_benchmark.py [copies] [processes]
+
+The example tree example/gramps/data.gramps is imported copies times (10 by
+default) into a new family tree in a temporary directory. The reference map
+is then rebuilt object by object, as reindex_reference_map used to do, and
+with reindex_reference_map in one and in processes (4 by default) processes.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import importlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gramps.gen.db import DbBsddb, DbTxn, BSDDBTxn
+from gramps.gen.lib import (Person, Family, Event, Place, Source, Citation,
+                            MediaObject, Repository, Note, Tag)
+from gramps.cli.user import User
+
+importxml = importlib.import_module("gramps.plugins.import.importxml")
+
+EXAMPLE = os.path.join(ROOT, "example", "gramps", "data.gramps")
+
+def clear_reference_map(database):
+    keys = database.reference_map.keys()
+    with BSDDBTxn(database.env, database.reference_map) as txn:
+        for key in keys:
+            txn.delete(key)
+
+def legacy_reindex(database):
+    """
+    Rebuild the reference map one object at a time.
+    """
+    primary_table = (
+        (database.get_person_cursor, Person),
+        (database.get_family_cursor, Family),
+        (database.get_event_cursor, Event),
+        (database.get_place_cursor, Place),
+        (database.get_source_cursor, Source),
+        (database.get_citation_cursor, Citation),
+        (database.get_media_cursor, MediaObject),
+        (database.get_repository_cursor, Repository),
+        (database.get_note_cursor, Note),
+        (database.get_tag_cursor, Tag),
+        )
+    with DbTxn("Legacy rebuild", database, batch=True,
+               no_magic=True) as transaction:
+        for cursor_func, class_func in primary_table:
+            with cursor_func() as cursor:
+                for handle, data in cursor:
+                    obj = class_func()
+                    obj.unserialize(data)
+                    with BSDDBTxn(database.env) as txn:
+                        database.update_reference_map(obj, transaction,
+                                                      txn.txn)
+
+def timed(label, func, *args):
+    start = time.time()
+    func(*args)
+    print "%-32s %8.2f s" % (label, time.time() - start)
+
+def main(copies=10, processes=4):
+    path = tempfile.mkdtemp()
+    try:
+        database = DbBsddb()
+        database.load(path, None)
+        user = User()
+        for dummy in xrange(copies):
+            importxml.importData(database, EXAMPLE, user)
+        print "%d people, %d references" % (
+            database.get_number_of_people(), len(database.reference_map))
+
+        clear_reference_map(database)
+        timed("object by object", legacy_reindex, database)
+        rows = len(database.reference_map)
+
+        timed("reindex_reference_map, 1 process",
+              database.reindex_reference_map, lambda step: None, 1)
+        assert len(database.reference_map) == rows
+
+        timed("reindex_reference_map, %d processes" % processes,
+              database.reindex_reference_map, lambda step: None, processes)
+        assert len(database.reference_map) == rows
+
+        database.close()
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,174 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#
+
+# $Id$
+
+"""
+Time the import of a Gramps XML file.
+
+Usage: python test/xml_import_benchmark.py [copies]
+
+The example tree example/gramps/example.gramps is compressed to a temporary
+directory. The file is then read copies times (5 by default) in each of
+these ways:
+
+- with the line counting pre-scan that the importer used to run first;
+- with the count of the person tags that the importer runs first, to
+  decide how to import the file;
+- parsed in one go by expat, as the importer used to do;
+- parsed a block at a time with parse_xml, as the importer does now.
+
+Last, it is imported copies times into a new family tree. The time and the
+peak memory of the import are printed.
+"""
+
+import os
+import re
+import sys
+import time
+import gzip
+import shutil
+import tempfile
+import resource
+import importlib
+from xml.parsers.expat import ParserCreate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from gramps.gen.db import DbBsddb
+from gramps.cli.user import User
+
+importxml = importlib.import_module("gramps.plugins.import.importxml")
+
+EXAMPLE = os.path.join(ROOT, "example", "gramps", "example.gramps")
+
+PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+
+def prescan(fname):
+    """
+    Count the lines and people of the file, as the importer used to do.
+    """
+    count = person_count = 0
+    ofile = gzip.open(fname, "rb")
+    for line in ofile:
+        count += 1
+        if PERSON_RE.match(line):
+            person_count += 1
+    ofile.close()
+    return count, person_count
+
+def count_tags(fname):
+    """
+    Count the people of the file, as the importer does now.
+    """
+    ofile = gzip.open(fname, "rb")
+    count = importxml.count_people(ofile)
+    ofile.close()
+    return count
+
+class Handler(object):
+    """
+    Collect the text of the elements, as GrampsParser does.
+    """
+    def __init__(self, xml_parser):
+        self.tlist = []
+        xml_parser.StartElementHandler = self.start
+        xml_parser.EndElementHandler = self.end
+        xml_parser.CharacterDataHandler = self.characters
+
+    def start(self, tag, attrs):
+        self.tlist = []
+
+    def end(self, tag):
+        ''.join(self.tlist)
+
+    def characters(self, data):
+        self.tlist.append(data)
+
+def parse_file(fname):
+    xml_parser = ParserCreate()
+    Handler(xml_parser)
+    ofile = gzip.open(fname, "rb")
+    xml_parser.ParseFile(ofile)
+    ofile.close()
+
+def parse_blocks(fname):
+    xml_parser = ParserCreate()
+    Handler(xml_parser)
+    xml_parser.buffer_text = True
+    xml_parser.buffer_size = importxml.READ_SIZE
+    ofile = gzip.open(fname, "rb")
+    importxml.parse_xml(xml_parser, ofile, lambda offset: None)
+    ofile.close()
+
+def timed(label, copies, func, *args):
+    start = time.time()
+    for dummy in xrange(copies):
+        func(*args)
+    print "%-32s %8.2f s" % (label, time.time() - start)
+
+def import_file(fname, copies):
+    """
+    Import the file copies times into a new family tree, in a child process
+    so that its peak memory is measured alone.
+    """
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+    path = tempfile.mkdtemp()
+    try:
+        database = DbBsddb()
+        database.load(path, None)
+        user = User()
+        start = time.time()
+        for dummy in xrange(copies):
+            importxml.importData(database, fname, user)
+        print "%-32s %8.2f s" % ("import, %d people" %
+                                 database.get_number_of_people(),
+                                 time.time() - start)
+        print "%-32s %8d MB" % ("peak memory",
+                    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss >> 10)
+        database.close()
+    finally:
+        shutil.rmtree(path)
+        os._exit(0)
+
+def main(copies=5):
+    path = tempfile.mkdtemp()
+    try:
+        fname = os.path.join(path, "example.gramps")
+        ifile = open(EXAMPLE, "rb")
+        ofile = gzip.open(fname, "wb")
+        shutil.copyfileobj(ifile, ofile)
+        ofile.close()
+        ifile.close()
+        print "%d kB compressed, %d people" % (os.path.getsize(fname) >> 10,
+                                               prescan(fname)[1])
+
+        timed("line count pre-scan", copies, prescan, fname)
+        timed("person tag count", copies, count_tags, fname)
+        timed("expat, whole file", copies, parse_file, fname)
+        timed("expat, parse_xml", copies, parse_blocks, fname)
+        import_file(fname, copies)
+    finally:
+        shutil.rmtree(path)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])